@@ -26,14 +26,14 @@ from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-import pyarrow.parquet as pq
 
 # Add project root to path so we can import local modules
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from config import PARQUET_FILE, DATA_DIR, log
+from config import RFP_DATASET_DIR, DATA_DIR, log
 from keywords import STOP_WORDS
 from filters import KEYWORDS as DEDUCTIVE_KEYWORDS
+from storage import dataset_exists, read_rfps
 
 # ---------------------------------------------------------------------------
 # Config
@@ -57,13 +57,12 @@ TFIDF_STOP = list(STOP_WORDS)
 
 def _load_rfps() -> pd.DataFrame:
     """Load all RFPs from Parquet into a DataFrame."""
-    if not PARQUET_FILE.exists():
-        log.error(f"Parquet file not found: {PARQUET_FILE}")
+    if not dataset_exists():
+        log.error(f"RFP dataset not found: {RFP_DATASET_DIR}")
         return pd.DataFrame()
 
-    table = pq.read_table(PARQUET_FILE)
-    df = table.to_pandas()
-    log.info(f"Loaded {len(df)} RFPs from {PARQUET_FILE.name}")
+    df = read_rfps().to_pandas()
+    log.info(f"Loaded {len(df)} RFPs from {RFP_DATASET_DIR.name}/")
     return df
 
 
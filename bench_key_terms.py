@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for keywords.extract_key_terms().
+
+Times key-term extraction on long, SAM.gov-style descriptions, against the
+previous implementation that checked every unigram against every bigram by
+substring (quadratic in description length).  Uses SAM.gov rows from the
+dataset when there are any, otherwise synthetic descriptions built from the
+keyword list.
+
+Usage:
+    python bench_key_terms.py [--records 200] [--words 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path so we can import local modules
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import keywords
+from filters import KEYWORDS
+from storage import dataset_exists, read_rfps
+
+_FILLER = (
+    "the contractor shall provide all personnel equipment and materials to "
+    "perform program evaluation data collection and reporting for the agency "
+    "including quarterly performance measurement and stakeholder engagement"
+).split()
+
+
+def _legacy_key_terms(rfp: dict) -> list[str]:
+    """extract_key_terms() with the old any(term in b ...) suppression."""
+    title = rfp.get("title", "") or ""
+    desc = rfp.get("description", "") or ""
+    agency = rfp.get("agency", "") or ""
+    if desc.strip().lower() == title.strip().lower():
+        desc = ""
+    tokens = keywords._tokenize(f"{title} {desc} {agency}".strip())
+    if not tokens:
+        return []
+    freq: dict[str, int] = {}
+    for tok in tokens:
+        freq[tok] = freq.get(tok, 0) + 1
+    bi_freq: dict[str, int] = {}
+    for b in keywords._bigrams(tokens):
+        bi_freq[b] = bi_freq.get(b, 0) + 1
+    scored = [(term, count * 2.0) for term, count in bi_freq.items()]
+    scored += [(term, count * 1.0) for term, count in freq.items()
+               if not any(term in b for b in bi_freq)]
+    scored.sort(key=lambda x: (-x[1], x[0]))
+    return list(dict.fromkeys(term for term, _ in scored))[:keywords.MAX_KEY_TERMS]
+
+
+def _sample(records: int, words: int) -> list[dict]:
+    """SAM.gov rows from the dataset, or synthetic ones of `words` words."""
+    if dataset_exists():
+        table = read_rfps(columns=["source", "title", "description", "agency"])
+        rows = [r for r in table.to_pylist() if r["source"] == "SAM.gov"]
+        rows.sort(key=lambda r: -len(r["description"] or ""))
+        if rows:
+            return rows[:records]
+
+    rng = random.Random(0)
+    vocab = " ".join(KEYWORDS).lower().split() + _FILLER
+    return [{
+        "title": " ".join(rng.choices(vocab, k=8)),
+        "description": " ".join(rng.choices(vocab, k=words)),
+        "agency": "Department of Example",
+    } for _ in range(records)]
+
+
+def _time(fn, rfps: list[dict]) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [fn(rfp) for rfp in rfps]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark key-term extraction")
+    parser.add_argument("--records", type=int, default=200, help="descriptions to time")
+    parser.add_argument("--words", type=int, default=2000,
+                        help="words per synthetic description")
+    args = parser.parse_args()
+
+    rfps = _sample(args.records, args.words)
+    avg_words = sum(len((r["description"] or "").split()) for r in rfps) / max(1, len(rfps))
+    print(f"{len(rfps)} descriptions, {avg_words:.0f} words on average")
+
+    legacy_secs, legacy = _time(_legacy_key_terms, rfps)
+    current_secs, current = _time(keywords.extract_key_terms, rfps)
+    for name, secs in (("substring scan", legacy_secs), ("token set", current_secs)):
+        print(f"  {name:15s} {secs:8.3f} s  {len(rfps) / secs:10.1f} records/s")
+    print(f"  speedup {legacy_secs / current_secs:.1f}x, "
+          f"identical results: {legacy == current}")
+
+
+if __name__ == "__main__":
+    main()
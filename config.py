@@ -20,8 +20,15 @@ LOG_DIR = SCRIPT_DIR / "logs"
 DATA_DIR.mkdir(exist_ok=True)
 LOG_DIR.mkdir(exist_ok=True)
 
-PARQUET_FILE = DATA_DIR / "rfps.parquet"
-SEEN_FILE = DATA_DIR / "seen_hashes.json"
+RFP_DATASET_DIR = DATA_DIR / "rfps"           # Hive-partitioned by scrape_month
+PARQUET_FILE = DATA_DIR / "rfps.parquet"      # legacy single file, migrated on first use
+SEEN_DB = DATA_DIR / "seen_hashes.db"         # SQLite dedup store
+SEEN_FILE = DATA_DIR / "seen_hashes.json"     # legacy JSON, migrated on first use
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"     # resumable progress of interrupted scrapes
+WATERMARK_FILE = DATA_DIR / "watermarks.json"  # per-source "since last run" marks
+SOCRATA_SCHEMA_CACHE = DATA_DIR / "socrata_schemas.json"  # discovered dataset columns
+HTTP_CACHE_DB = DATA_DIR / "http_cache.db"    # ETag/Last-Modified page cache
+PORTAL_RENDER_CACHE = DATA_DIR / "portal_render_modes.json"  # state portals needing a browser
 
 # ---------------------------------------------------------------------------
 # Environment — try local .env, fall back to sibling scraper's .env
@@ -54,23 +61,94 @@ HISTORICAL_MODE = os.getenv("HISTORICAL_MODE", "").lower() == "true"
 
 SAM_LOOKBACK_DAYS = 3650 if HISTORICAL_MODE else 30       # 10 years vs 30 days
 SAM_CHUNK_DAYS = 90                                        # chunk size for historical
+SAM_CHUNK_WORKERS = int(os.getenv("SAM_CHUNK_WORKERS") or 4)  # chunks fetched at once
 GRANTS_ROWS_PER_QUERY = 1000 if HISTORICAL_MODE else 100
+GRANTS_DETAILS = os.getenv("GRANTS_DETAILS", "").lower() == "true"  # fetch synopses of new opportunities
 SOCRATA_LOOKBACK_DAYS = 0 if HISTORICAL_MODE else 30       # 0 = no date filter
+SOCRATA_WORKERS = 4                                        # datasets fetched at once
+SOCRATA_SCHEMA_TTL_DAYS = 7                                # re-probe dataset columns after this
+SOCRATA_CSV = HISTORICAL_MODE and os.getenv("SOCRATA_CSV", "").lower() != "false"  # CSV pages for backfills
 SBIR_MAX_PAGES = 10                                    # 500 max solicitations
-NSF_LOOKBACK_DAYS = 30
+NSF_LOOKBACK_DAYS = 30                                      # start dates are published weeks late
 FED_REGISTER_LOOKBACK_DAYS = 14
-USASPENDING_LOOKBACK_DAYS = 14
+USASPENDING_LOOKBACK_DAYS = 14                              # action dates are reported weeks late
+INCREMENTAL = os.getenv("INCREMENTAL", "").lower() != "false"  # narrow lookbacks to since last run
+WATERMARK_OVERLAP_DAYS = 2                                  # re-fetch margin before the watermark
 NY_NYSCR_MAX_PAGES = 3
 ESBD_MAX_PAGES = 20
+SEEN_PAGES_STOP = int(os.getenv("SEEN_PAGES_STOP") or 2)  # all-known pages in a row before stopping, 0 = never
 BIDNET_MAX_PAGES_PER_STATE = 8  # increased from 5 to capture more local listings
 NC_EVP_MAX_PAGES = 30
 REQUEST_TIMEOUT = 30
-POLITE_DELAY = 1  # seconds between paginated requests
+HTTP_POOL_SIZE = 16       # keep-alive connections per host (and hosts pooled)
+HTTP_MAX_RETRIES = 4      # retries on 429/5xx/connection errors
+HTTP_BACKOFF = 1.0        # base seconds for exponential backoff (+ jitter)
+HTTP_MAX_WAIT = 60        # cap in seconds on any one retry wait, Retry-After included
+HTTP_CACHE = os.getenv("HTTP_CACHE", "").lower() != "false"  # conditional GETs for listing pages
+HTTP_CACHE_TTL_DAYS = 30  # drop cached pages not revalidated for this long
+RATE_LIMIT_PER_SEC = float(os.getenv("RATE_LIMIT_PER_SEC") or 1.0)  # per host, 0 = unpaced
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST") or 3)          # back-to-back requests per host
 PLAYWRIGHT_TIMEOUT = 60000  # ms
+BROWSER_WORKERS = int(os.getenv("BROWSER_WORKERS") or 4)  # shared Chromium instances
+PAGE_SETTLE_TIMEOUT = 5000   # ms to wait for network idle once results appear
+PAGE_CHANGE_TIMEOUT = 15000  # ms to wait for the results to change after paging
+BROWSER_SLOT_TIMEOUT = 3600  # seconds a pool task may wait for a free browser
+BROWSER_TASK_TIMEOUT = 1800  # seconds a pool task may run before its waiter gives up
+
+# Requests aborted in every browser context (BLOCK_RESOURCES=false to disable)
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "").lower() != "false"
+BLOCK_RESOURCE_TYPES = ("image", "media", "font")
+BLOCK_TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms",
+    "nr-data.net", "js-agent.newrelic.com", "segment.io", "cdn.segment.com",
+    "quantserve.com", "scorecardresearch.com", "bat.bing.com",
+    "px.ads.linkedin.com", "static.ads-twitter.com", "addthis.com",
+    "sharethis.com", "siteimproveanalytics.com", "crazyegg.com",
+)
 
 # Local aggregator limits
 DEMANDSTAR_MAX_PAGES = 5
 
+# State portals — static HTML is tried first; detected render modes are cached
+PORTAL_FETCH_WORKERS = 8       # static portal fetches at once
+PORTAL_RENDER_TTL_DAYS = 30    # re-detect cached render modes after this long
+
+# ---------------------------------------------------------------------------
+# Async federal APIs — set ASYNC_FEDERAL=true (needs httpx) to fetch SAM.gov,
+# Grants.gov, NIH and NSF queries/pages concurrently
+# ---------------------------------------------------------------------------
+
+ASYNC_FEDERAL = os.getenv("ASYNC_FEDERAL", "").lower() == "true"
+ASYNC_HOST_CONCURRENCY = 4  # requests in flight per host
+
+# ---------------------------------------------------------------------------
+# Source scheduling — sources run concurrently in a thread pool
+# ---------------------------------------------------------------------------
+
+SOURCE_WORKERS = int(os.getenv("SOURCE_WORKERS") or 6)       # 1 = serial
+SOURCE_TIMEOUT = int(os.getenv("SOURCE_TIMEOUT")
+                     or (0 if HISTORICAL_MODE else 7200))  # seconds, 0 = none
+SOURCE_QUEUE_CHUNKS = 20    # 500-record chunks a source may run ahead (~10k rows)
+
+# ---------------------------------------------------------------------------
+# Classification — "aho" (Aho-Corasick, word-start matches) or "regex"
+# (the original alternation, matches anywhere)
+# ---------------------------------------------------------------------------
+
+KEYWORD_ENGINE = (os.getenv("KEYWORD_ENGINE") or "aho").lower()
+CLASSIFY_BATCH_ROWS = 500   # records classified per classify_batch() call
+CLASSIFY_WORKERS = int(os.getenv("CLASSIFY_WORKERS") or 1)  # processes, 1 = in-process
+RECLASSIFY_WORKERS = int(os.getenv("RECLASSIFY_WORKERS") or 4)  # processes for --reclassify
+
+# ---------------------------------------------------------------------------
+# Storage — new rows are buffered and written in row groups of this size
+# ---------------------------------------------------------------------------
+
+WRITE_BATCH_ROWS = 5000
+STALE_FRAGMENT_HOURS = 24  # unpublished fragments untouched this long are from a dead writer
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -6,19 +6,18 @@ Sends two types of email:
   - Team digest: past 7 days of matches, filtered per team member → individual emails
 """
 
-import re
 import smtplib
 from collections import defaultdict
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-import pyarrow.parquet as pq
-
 from config import (
-    PARQUET_FILE, SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS,
+    SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS,
     EMAIL_FROM, EMAIL_TO, log,
 )
+from matcher import compile_keywords
+from storage import dataset_exists, read_rfps
 
 # Render order for state grouping in email tables
 _GROUP_ORDER = [
@@ -176,22 +175,20 @@ def _summary_counts(rfps: list[dict]) -> str:
 
 def _read_today_matches() -> list[dict]:
     """Read today's keyword-matched RFPs from Parquet."""
-    if not PARQUET_FILE.exists():
+    if not dataset_exists():
         return []
-    table = pq.read_table(PARQUET_FILE)
-    df = table.to_pandas()
     today = datetime.now().strftime("%Y-%m-%d")
+    df = read_rfps(since=today).to_pandas()
     matched = df[(df["scrape_date"] == today) & (df["keyword_match"] == True)]
     return matched.to_dict("records")
 
 
 def _read_week_matches() -> list[dict]:
     """Read past 7 days of keyword-matched RFPs from Parquet."""
-    if not PARQUET_FILE.exists():
+    if not dataset_exists():
         return []
-    table = pq.read_table(PARQUET_FILE)
-    df = table.to_pandas()
     cutoff = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+    df = read_rfps(since=cutoff).to_pandas()
     matched = df[(df["scrape_date"] >= cutoff) & (df["keyword_match"] == True)]
     return matched.to_dict("records")
 
@@ -295,12 +292,9 @@ def send_team_digest():
     log.info(f"Sending team digest to {len(TEAM_MEMBERS)} members ({len(all_rfps)} matched RFPs)...")
 
     for member in TEAM_MEMBERS:
-        # Compile member's keyword pattern (with form-submitted overrides)
+        # Compile member's keyword matcher (with form-submitted overrides)
         patterns = _get_patterns(member) if _get_patterns else member["patterns"]
-        pattern = re.compile(
-            "|".join(re.escape(p) for p in patterns),
-            re.IGNORECASE,
-        )
+        matcher = compile_keywords(patterns)
 
         # Filter RFPs to this person's interests
         personal_rfps = []
@@ -310,7 +304,7 @@ def send_team_digest():
                 rfp.get("description", ""),
                 rfp.get("agency", ""),
             ])
-            if pattern.search(text):
+            if matcher.search(text):
                 personal_rfps.append(rfp)
 
         if not personal_rfps:
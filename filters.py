@@ -3,10 +3,22 @@ Keyword matching and exclusion patterns for RFP classification.
 
 Unlike the team scraper, these are used to *tag* RFPs (keyword_match column),
 not to drop them.  Every scraped RFP is stored regardless of match status.
+
+classify_rfp() tags one record; classify_batch() tags a whole table at once,
+building the search text and applying the exclusion pattern with Arrow
+compute kernels, so the Python loop is left with only keyword matching.
 """
 
+import hashlib
+import json
 import re
 
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import KEYWORD_ENGINE
+from matcher import compile_keywords
+
 # ---------------------------------------------------------------------------
 # Keywords — aligned with Texas State team research interests
 # ---------------------------------------------------------------------------
@@ -225,9 +237,7 @@ KEYWORDS = [
     "financial condition", "financial well-being",
 ]
 
-KEYWORD_PATTERN = re.compile(
-    "|".join(re.escape(kw) for kw in KEYWORDS), re.IGNORECASE
-)
+KEYWORD_MATCHER = compile_keywords(KEYWORDS)  # engine per KEYWORD_ENGINE
 
 # ---------------------------------------------------------------------------
 # Exclusion pattern — irrelevant RFPs
@@ -248,25 +258,76 @@ EXCLUDE_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# ---------------------------------------------------------------------------
+# Fingerprint — stored with every row (keyword_fingerprint) so rows
+# classified under an older KEYWORDS / EXCLUDE_PATTERN can be found and
+# re-tagged (main.py --reclassify)
+# ---------------------------------------------------------------------------
+
+
+def _fingerprint() -> str:
+    raw = json.dumps([KEYWORD_ENGINE, KEYWORDS, EXCLUDE_PATTERN.pattern])
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+KEYWORD_FINGERPRINT = _fingerprint()
+
 # ---------------------------------------------------------------------------
 # Classification
 # ---------------------------------------------------------------------------
 
 
+_TEXT_FIELDS = ("title", "description", "agency")
+
+
 def classify_rfp(rfp: dict) -> tuple[bool, list[str]]:
     """Classify an RFP against research keywords.
 
     Returns (matches, matched_keywords).  Excluded RFPs get (False, []).
     """
-    text = " ".join([
-        rfp.get("title", ""),
-        rfp.get("description", ""),
-        rfp.get("agency", ""),
-    ])
+    text = " ".join(rfp.get(field) or "" for field in _TEXT_FIELDS)
 
     if EXCLUDE_PATTERN.search(text):
         return False, []
 
-    found = KEYWORD_PATTERN.findall(text)
-    unique = list(dict.fromkeys(kw.lower() for kw in found))
+    unique = KEYWORD_MATCHER.findall(text)
     return bool(unique), unique
+
+
+def _text_column(data, name: str, num_rows: int) -> pa.Array:
+    """Column `name` of `data` as a null-free string array ("" if absent)."""
+    names = data.column_names if hasattr(data, "column_names") else data.columns
+    if name not in names:
+        return pa.array([""] * num_rows, pa.string())
+    col = data[name]
+    if isinstance(col, pa.ChunkedArray):
+        col = col.combine_chunks()
+    elif not isinstance(col, pa.Array):
+        col = pa.array(col, from_pandas=True)  # pandas Series
+    return pc.fill_null(pc.cast(col, pa.string()), "")
+
+
+def classify_batch(data) -> pa.Table:
+    """Classify every row of a table of RFPs.
+
+    `data` is a pyarrow Table or RecordBatch, or a pandas DataFrame, with
+    title/description/agency columns (missing columns and nulls count as
+    "").  Returns a table of keyword_match and matched_keywords (comma
+    separated, as stored in the dataset), row-aligned with `data` and with
+    the same results as classify_rfp() on each row.
+    """
+    num_rows = data.num_rows if hasattr(data, "num_rows") else len(data)
+    text = pc.binary_join_element_wise(
+        *(_text_column(data, name, num_rows) for name in _TEXT_FIELDS), " "
+    )
+    excluded = pc.match_substring_regex(text, EXCLUDE_PATTERN.pattern, ignore_case=True)
+
+    matches, keywords = [], []
+    for row_text, skip in zip(text.to_pylist(), excluded.to_pylist()):
+        found = [] if skip else KEYWORD_MATCHER.findall(row_text)
+        matches.append(bool(found))
+        keywords.append(", ".join(found))
+    return pa.table({
+        "keyword_match": pa.array(matches, pa.bool_()),
+        "matched_keywords": pa.array(keywords, pa.string()),
+    })
@@ -14,9 +14,9 @@ from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
-import pyarrow.parquet as pq
 
-from config import PARQUET_FILE, DATA_DIR, SCRIPT_DIR, log
+from config import DATA_DIR, SCRIPT_DIR, log
+from storage import dataset_exists, read_rfps
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -50,8 +50,7 @@ STATE_POPULATIONS = {
 
 def build_summary_data() -> dict:
     """Extract all summary statistics from the Parquet dataset."""
-    table = pq.read_table(PARQUET_FILE)
-    df = table.to_pandas()
+    df = read_rfps().to_pandas()
 
     now = datetime.now()
     summary = {}
@@ -1023,7 +1022,7 @@ function initFullDatabase(allRows) {{
 
 def generate_site() -> str:
     """Generate the local dashboard. Returns a log-friendly summary."""
-    if not PARQUET_FILE.exists():
+    if not dataset_exists():
         return "Site generation skipped -- no Parquet data."
 
     summary = build_summary_data()
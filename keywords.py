@@ -114,13 +114,17 @@ def extract_key_terms(rfp: dict) -> list[str]:
     for b in bi:
         bi_freq[b] = bi_freq.get(b, 0) + 1
 
+    # Tokens that are one half of some bigram (a whole-token match, so
+    # "age" is not covered by "manage plan")
+    covered = {part for b in bi_freq for part in b.split(" ")}
+
     # Merge: bigrams get a 2x boost (multi-word phrases are more specific)
     scored: list[tuple[str, float]] = []
     for term, count in bi_freq.items():
         scored.append((term, count * 2.0))
     for term, count in freq.items():
         # Skip unigrams that are fully covered by a bigram
-        if any(term in b for b in bi_freq):
+        if term in covered:
             continue
         scored.append((term, count * 1.0))
 
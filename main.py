@@ -11,6 +11,8 @@ Modes:
   main.py                 — scrape + dashboard + git push  (schedule: 12:01 AM)
   main.py --daily-email   — send daily digest email        (schedule: 6:00 AM)
   main.py --team-digest   — send weekly team emails        (schedule: Mon 6:00 AM)
+  main.py --compact       — merge dataset fragments        (as needed)
+  main.py --reclassify    — re-tag rows after keyword edits (as needed)
 
 Author: Dr. W. Scott Langford / Lookout Analytics
 """
@@ -21,12 +23,12 @@ from datetime import datetime
 from pathlib import Path
 
 from config import log
-from filters import classify_rfp
-from keywords import extract_key_terms
-from storage import rfp_hash, load_seen, save_seen, prune_seen, append_rfps
+from storage import SeenStore, RfpWriter, migrate_legacy_file, compact_dataset
+from pipeline import run_pipeline
 from analyze_keywords import run_analysis
 from generate_site import generate_site
-from sources import ALL_SOURCES
+from scheduler import iter_sources
+from sources import ALL_SOURCES, checkpoint, pagination, watermark
 
 
 def scrape():
@@ -35,73 +37,42 @@ def scrape():
     log.info("Research scraper starting")
     log.info("=" * 60)
 
-    # --- Scrape all sources ---
-    all_rfps: list[dict] = []
-    for scrape_fn in ALL_SOURCES:
-        try:
-            results = scrape_fn()
-            all_rfps.extend(results)
-        except Exception as e:
-            log.error(f"{scrape_fn.__name__} failed: {e}")
-
-    log.info(f"Total raw RFPs scraped: {len(all_rfps)}")
-
-    if not all_rfps:
-        log.info("No RFPs scraped. Exiting.")
-        return
-
-    # --- Deduplicate ---
-    seen = load_seen()
-    new_rfps: list[dict] = []
+    # --- Scrape → dedup → classify → write, streamed record by record ---
+    migrate_legacy_file()
     now = datetime.now()
     scrape_date = now.strftime("%Y-%m-%d")
 
-    for rfp in all_rfps:
-        h = rfp_hash(rfp)
-        if h in seen:
-            continue
-
-        seen[h] = {
-            "first_seen": now.isoformat(),
-            "title": rfp.get("title", ""),
-            "state": rfp.get("state", ""),
-        }
-
-        # --- Classify (deductive) ---
-        match, keywords = classify_rfp(rfp)
-
-        # --- Extract key terms (inductive) ---
-        key_terms = extract_key_terms(rfp)
-
-        new_rfps.append({
-            "rfp_id": rfp.get("id", ""),
-            "hash": h,
-            "source": rfp.get("source", ""),
-            "state": rfp.get("state", ""),
-            "title": rfp.get("title", ""),
-            "agency": rfp.get("agency", ""),
-            "status": rfp.get("status", ""),
-            "posted_date": rfp.get("posted_date", ""),
-            "close_date": rfp.get("close_date", ""),
-            "url": rfp.get("url", ""),
-            "description": rfp.get("description", ""),
-            "amount": rfp.get("amount", ""),
-            "recipient": rfp.get("recipient", ""),
-            "recipient_state": rfp.get("recipient_state", ""),
-            "pi_name": rfp.get("pi_name", ""),
-            "keyword_match": match,
-            "matched_keywords": ", ".join(keywords),
-            "key_terms": ", ".join(key_terms),
-            "scrape_date": scrape_date,
-            "scrape_timestamp": now,
-        })
-
-    # --- Persist ---
-    seen = prune_seen(seen)
-    save_seen(seen)
-    written = append_rfps(new_rfps)
-
-    matched = sum(1 for r in new_rfps if r["keyword_match"])
+    # Progress is checkpointed per source; a rerun the same day after a
+    # crash replays finished sources and resumes partial ones.  Date-filtered
+    # sources only query back to their last successful run (see watermark).
+    checkpoint.prune_stale(now)
+
+    with SeenStore() as seen:
+        # Newest-first listings stop paging once they reach known records
+        pagination.use_seen(seen)
+        try:
+            records = iter_sources(ALL_SOURCES, checkpoint_dir=checkpoint.run_dir(now))
+            with RfpWriter() as writer:
+                stats = run_pipeline(records, seen, writer, now)
+        finally:
+            # Abandoned source threads can outlive the run; keep them (and
+            # later callers) away from the store before it closes
+            pagination.use_seen(None)
+
+        log.info(f"Total raw RFPs scraped: {stats['raw']}")
+
+        if not stats["raw"]:
+            log.info("No RFPs scraped. Exiting.")
+            return
+
+        # --- Commit seen hashes only now that the rows are on disk ---
+        seen.prune()
+        seen.commit()
+        watermark.commit()
+        checkpoint.clear()
+    written = writer.rows_written
+
+    matched = stats["matched"]
     log.info(f"New RFPs: {written} ({matched} keyword matches, "
              f"{written - matched} unmatched)")
 
@@ -162,9 +133,23 @@ def main():
         "--team-digest", action="store_true",
         help="Send personalized weekly digest to each team member",
     )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="Merge each month's Parquet fragments into a single file",
+    )
+    parser.add_argument(
+        "--reclassify", action="store_true",
+        help="Re-tag stored RFPs classified under older keywords or exclusions",
+    )
     args = parser.parse_args()
 
-    if args.daily_email or args.team_digest:
+    if args.compact:
+        log.info("Compacting RFP dataset...")
+        compact_dataset()
+    elif args.reclassify:
+        from reclassify import reclassify_dataset
+        reclassify_dataset()
+    elif args.daily_email or args.team_digest:
         from email_digest import send_daily_email, send_team_digest
 
         if args.daily_email:
@@ -0,0 +1,122 @@
+"""
+Multi-keyword matchers for RFP classification and the team digest.
+
+compile_keywords() builds the matcher behind filters.classify_rfp() and
+each member's digest filter.  The default engine (KEYWORD_ENGINE=aho) is
+an Aho-Corasick automaton: every phrase is found in one pass over the
+lowercased text, however many phrases there are, and overlapping phrases
+("opioid" inside "opioid use disorder") are all reported.  A phrase only
+matches at the start of a word, so "pension" does not fire on "suspension";
+it may end mid-word, so "epidemiolog" still matches "epidemiology".
+
+KEYWORD_ENGINE=regex keeps the original single-alternation regex, which
+matches anywhere (no word boundary) and reports only the first phrase that
+matches at each position.
+"""
+
+import re
+from collections import deque
+
+from config import KEYWORD_ENGINE, log
+
+
+def _word_start(text: str, start: int) -> bool:
+    return start == 0 or not (text[start - 1].isalnum() or text[start - 1] == "_")
+
+
+class AhoCorasickMatcher:
+    """Case-insensitive Aho-Corasick automaton over a list of phrases.
+
+    The automaton is compiled to a full transition table (one dict per
+    state, failure links folded in), so the scan does a single dict lookup
+    per character.
+    """
+
+    def __init__(self, phrases: list[str]):
+        self.phrases = list(dict.fromkeys(p.lower() for p in phrases if p))
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[int]] = [[]]
+        for idx, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(idx)
+
+        # Breadth-first: a state's failure target is always shallower, so its
+        # transitions and outputs are complete by the time they're inherited.
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            out[state] = out[state] + out[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                pending.append(nxt)
+
+        self._delta = delta
+        # (phrase index, phrase length) per state, longest phrase first
+        self._out = [
+            tuple(sorted(((i, len(self.phrases[i])) for i in hits), key=lambda h: -h[1]))
+            for hits in out
+        ]
+
+    def _scan(self, text: str):
+        """Yield (end index, phrase index) for every word-start match."""
+        text = text.lower()
+        delta, out = self._delta, self._out
+        state = 0
+        for end, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for idx, length in out[state]:
+                if _word_start(text, end - length + 1):
+                    yield end, idx
+
+    def findall(self, text: str) -> list[str]:
+        """Distinct matched phrases (lowercased), in order of appearance."""
+        found = dict.fromkeys(self.phrases[idx] for _, idx in self._scan(text))
+        return list(found)
+
+    def search(self, text: str) -> bool:
+        """True if any phrase matches."""
+        return next(self._scan(text), None) is not None
+
+
+class RegexMatcher:
+    """The original matcher: one case-insensitive alternation of all phrases."""
+
+    def __init__(self, phrases: list[str]):
+        self.phrases = list(dict.fromkeys(p for p in phrases if p))
+        self.pattern = re.compile(
+            "|".join(re.escape(p) for p in self.phrases), re.IGNORECASE
+        )
+
+    def findall(self, text: str) -> list[str]:
+        """Distinct matched phrases (lowercased), in order of appearance."""
+        if not self.phrases:
+            return []
+        return list(dict.fromkeys(m.lower() for m in self.pattern.findall(text)))
+
+    def search(self, text: str) -> bool:
+        """True if any phrase matches."""
+        return bool(self.phrases) and self.pattern.search(text) is not None
+
+
+_ENGINES = {"aho": AhoCorasickMatcher, "regex": RegexMatcher}
+
+
+def compile_keywords(phrases: list[str], engine: str = KEYWORD_ENGINE):
+    """Matcher for `phrases` using `engine` ("aho" or "regex")."""
+    cls = _ENGINES.get(engine)
+    if cls is None:
+        log.warning(f"Unknown KEYWORD_ENGINE {engine!r}, using 'aho'")
+        cls = AhoCorasickMatcher
+    return cls(phrases)
@@ -0,0 +1,142 @@
+"""
+Streaming scrape pipeline: dedup → classify → write.
+
+Each stage is a generator that pulls one record at a time from the stage
+before it, so records flow from the sources straight into the buffered
+Parquet writer and are never all held in memory at once.  Classification
+takes records in batches and can run on CLASSIFY_WORKERS processes.
+"""
+
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+
+import pyarrow as pa
+
+from config import CLASSIFY_BATCH_ROWS, CLASSIFY_WORKERS
+from filters import KEYWORD_FINGERPRINT, classify_batch
+from keywords import extract_key_terms
+from storage import rfp_hash, RfpWriter, SeenStore
+
+
+def dedup_stage(records: Iterable[dict], seen: SeenStore, now: datetime,
+                stats: dict) -> Iterator[tuple[str, dict]]:
+    """Yield (hash, rfp) for records not already in `seen`, marking them seen."""
+    first_seen = now.isoformat()
+    for rfp in records:
+        stats["raw"] += 1
+        h = rfp_hash(rfp)
+        if h in seen:
+            continue
+
+        seen.add(h, first_seen, rfp.get("title", ""), rfp.get("state", ""))
+        yield h, rfp
+
+
+def build_row(h: str, rfp: dict, match: bool, keywords: str,
+              key_terms: list[str], now: datetime) -> dict:
+    """Build one Parquet row (see storage.RFP_SCHEMA) from a scraped record."""
+    return {
+        "rfp_id": rfp.get("id", ""),
+        "hash": h,
+        "source": rfp.get("source", ""),
+        "state": rfp.get("state", ""),
+        "title": rfp.get("title", ""),
+        "agency": rfp.get("agency", ""),
+        "status": rfp.get("status", ""),
+        "posted_date": rfp.get("posted_date", ""),
+        "close_date": rfp.get("close_date", ""),
+        "url": rfp.get("url", ""),
+        "description": rfp.get("description", ""),
+        "amount": rfp.get("amount", ""),
+        "recipient": rfp.get("recipient", ""),
+        "recipient_state": rfp.get("recipient_state", ""),
+        "pi_name": rfp.get("pi_name", ""),
+        "keyword_match": match,
+        "matched_keywords": keywords,
+        "keyword_fingerprint": KEYWORD_FINGERPRINT,
+        "key_terms": ", ".join(key_terms),
+        "scrape_date": now.strftime("%Y-%m-%d"),
+        "scrape_timestamp": now,
+    }
+
+
+def classify_rows(batch: list[tuple[str, dict]], now: datetime) -> list[dict]:
+    """Classify (deductive) and extract key terms (inductive) for a batch.
+
+    Pure CPU work on picklable inputs, so classify_stage() can run it in
+    worker processes.
+    """
+    texts = pa.table({
+        field: pa.array([rfp.get(field) for _, rfp in batch], pa.string())
+        for field in ("title", "description", "agency")
+    })
+    labels = classify_batch(texts)
+    return [
+        build_row(h, rfp, match, keywords, extract_key_terms(rfp), now)
+        for (h, rfp), match, keywords in zip(batch,
+                                             labels["keyword_match"].to_pylist(),
+                                             labels["matched_keywords"].to_pylist())
+    ]
+
+
+def _ordered_map(fn, batches: Iterator[list], now: datetime,
+                 workers: int) -> Iterator[list[dict]]:
+    """fn(batch, now) on a process pool, yielding results in input order.
+
+    At most 2 * `workers` batches are in flight, so a fast producer can't
+    queue the whole scrape in memory.
+    """
+    # Spawned, not forked: the scrape process already runs source, browser
+    # and HTTP threads that may hold locks (logging, sqlite) mid-fork.
+    pool = ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"))
+    pending: deque[Future] = deque()
+    try:
+        for batch in batches:
+            pending.append(pool.submit(fn, batch, now))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def classify_stage(items: Iterable[tuple[str, dict]], now: datetime, stats: dict,
+                   batch_rows: int = CLASSIFY_BATCH_ROWS,
+                   workers: int = CLASSIFY_WORKERS) -> Iterator[dict]:
+    """Build classified rows, `batch_rows` records at a time, in input order.
+
+    With `workers` > 1 the batches are spread over that many processes;
+    with 1 they run in this process.
+    """
+    items = iter(items)
+    batches = iter(lambda: list(islice(items, batch_rows)), [])
+    if workers > 1:
+        results = _ordered_map(classify_rows, batches, now, workers)
+    else:
+        results = (classify_rows(batch, now) for batch in batches)
+
+    for rows in results:
+        for row in rows:
+            stats["new"] += 1
+            stats["matched"] += int(row["keyword_match"])
+            yield row
+
+
+def run_pipeline(records: Iterable[dict], seen: SeenStore, writer: RfpWriter,
+                 now: datetime | None = None) -> dict:
+    """Push scraped records through every stage into `writer`.
+
+    Returns counts: raw (scraped), new (after dedup), matched (keyword hits).
+    """
+    now = now or datetime.now()
+    stats = {"raw": 0, "new": 0, "matched": 0}
+    rows = classify_stage(dedup_stage(records, seen, now, stats), now, stats)
+    for row in rows:
+        writer.write(row)
+    return stats
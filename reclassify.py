@@ -0,0 +1,92 @@
+"""
+Re-tag stored RFPs after KEYWORDS, EXCLUDE_PATTERN or KEYWORD_ENGINE change.
+
+keyword_match and matched_keywords are computed at scrape time, and every
+row records the classifier it was tagged with (keyword_fingerprint).  This
+job finds fragments holding rows with another fingerprint and rewrites just
+those files, re-running classify_batch() on the stale rows only.  Each
+fragment is checked by reading its fingerprint column alone, and stale
+fragments are rewritten in parallel, RECLASSIFY_WORKERS processes at a time.
+
+Run with `main.py --reclassify`.  Like --compact, run it while no scrape
+is writing.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from config import RECLASSIFY_WORKERS, log
+from filters import KEYWORD_FINGERPRINT, classify_batch
+from storage import dataset_fragments, rewrite_fragment
+
+
+def _stale(table: pa.Table) -> pa.Array:
+    """Mask of rows not classified under the current fingerprint."""
+    fingerprints = table.column("keyword_fingerprint").combine_chunks()
+    current = pc.equal(fingerprints, KEYWORD_FINGERPRINT)
+    return pc.invert(pc.fill_null(current, False))
+
+
+def _is_stale(path: Path) -> bool:
+    if "keyword_fingerprint" not in pq.ParquetFile(path).schema_arrow.names:
+        return True
+    fingerprints = pq.read_table(path, columns=["keyword_fingerprint"])
+    return pc.any(_stale(fingerprints)).as_py() or False
+
+
+def _reclassify_batch(table: pa.Table, counts: dict) -> pa.Table:
+    stale = _stale(table)
+    n_stale = pc.sum(stale).as_py() or 0
+    if not n_stale:
+        return table
+
+    labels = classify_batch(table.filter(stale))
+    before = pc.sum(table.filter(stale).column("keyword_match")).as_py() or 0
+    counts["rows"] += n_stale
+    counts["matched"] += (pc.sum(labels["keyword_match"]).as_py() or 0) - before
+
+    for name in ("keyword_match", "matched_keywords"):
+        column = pc.replace_with_mask(table.column(name).combine_chunks(), stale,
+                                      labels[name].combine_chunks())
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+    fingerprint = pa.array([KEYWORD_FINGERPRINT] * table.num_rows, pa.string())
+    return table.set_column(table.schema.get_field_index("keyword_fingerprint"),
+                            "keyword_fingerprint", fingerprint)
+
+
+def _reclassify_fragment(path: Path) -> dict:
+    """Rewrite one fragment with its stale rows re-tagged (process pool task)."""
+    counts = {"rows": 0, "matched": 0}
+    if _is_stale(path):
+        rewrite_fragment(path, lambda table: _reclassify_batch(table, counts))
+    return counts
+
+
+def reclassify_dataset(workers: int = RECLASSIFY_WORKERS) -> dict:
+    """Re-tag every row classified under an older fingerprint.
+
+    Returns counts: fragments (rewritten), rows (re-tagged) and matched
+    (net change in keyword matches).
+    """
+    fragments = dataset_fragments()
+    log.info(f"Reclassifying {len(fragments)} fragments against keyword "
+             f"fingerprint {KEYWORD_FINGERPRINT} ({workers} workers)...")
+    totals = {"fragments": 0, "rows": 0, "matched": 0}
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        for path, counts in zip(fragments, pool.map(_reclassify_fragment, fragments)):
+            if not counts["rows"]:
+                continue
+            totals["fragments"] += 1
+            totals["rows"] += counts["rows"]
+            totals["matched"] += counts["matched"]
+            log.info(f"  {path.parent.name}/{path.name}: {counts['rows']} rows "
+                     f"re-tagged ({counts['matched']:+d} matches)")
+
+    log.info(f"Reclassification finished: {totals['rows']} rows in "
+             f"{totals['fragments']} fragments ({totals['matched']:+d} matches)")
+    return totals
@@ -0,0 +1,284 @@
+"""
+Concurrent source scheduler for the research scraper.
+
+Runs the scrape functions in sources.ALL_SOURCES on a pool of daemon
+threads so that network-bound sources overlap instead of running back to back.  Records are
+streamed back in source-list order regardless of completion order, so a
+run's output does not depend on which source happened to finish first.
+
+Sources may return a list or yield records from a generator.  Each source
+feeds a small bounded queue; a source that gets far ahead of the consumer
+blocks until the pipeline catches up, which keeps peak memory bounded even
+during a HISTORICAL_MODE backfill.
+
+Given a checkpoint directory, each source's progress is saved as it runs
+(see sources.checkpoint): a rerun replays sources that already finished
+and resumes the rest.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from config import SOURCE_WORKERS, SOURCE_TIMEOUT, SOURCE_QUEUE_CHUNKS, log
+from sources import browser, checkpoint
+
+_POLL_INTERVAL = 1.0  # seconds between timeout checks
+_CHUNK_SIZE = 500     # records handed over per queue item
+
+
+class _Abandoned(Exception):
+    """The consumer gave up on a stream while its source was still running."""
+
+
+class _SourceStream:
+    """Bounded hand-off queue between one source's thread and the consumer."""
+
+    def __init__(self, scrape_fn: Callable[[], Iterable[dict]], maxsize: int,
+                 checkpoint_dir: Path | None = None):
+        self.scrape_fn = scrape_fn
+        self.name = scrape_fn.__name__
+        self.checkpoint_dir = checkpoint_dir
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.started: float | None = None
+        self.awaited: float | None = None   # when the consumer began waiting on it
+        self.blocked = 0.0        # seconds spent waiting on a full queue
+        self.thread: int | None = None      # ident of the thread running the source
+        self.slot_base = 0.0      # that thread's browser slot wait before the source
+        self.abandoned = False
+        self.ended = False        # the consumer received the end-of-stream marker
+        self.cp: checkpoint.SourceCheckpoint | None = None
+        self.chunk: list[dict] = []   # records not yet handed to the queue
+        self._lock = threading.Lock()
+
+    def abandon(self) -> list[dict]:
+        """Stop consuming this stream (called from the consumer's thread).
+
+        Returns the records the source produced that the consumer has not
+        received yet: queued chunks and the partly filled one.
+        """
+        with self._lock:
+            self.abandoned = True
+            partial, self.chunk = self.chunk, []
+        if self.cp is not None:
+            self.cp.failed = True   # seen at once by watermark.commit()
+        left: list[dict] = []
+        while True:
+            try:
+                chunk = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk:
+                left.extend(chunk)
+        return left + partial
+
+    def _add(self, rfp: dict) -> list[dict] | None:
+        """Buffer one record; return the chunk once it is full.
+
+        Raises _Abandoned if the consumer has given up on the stream.
+        """
+        with self._lock:
+            if self.abandoned:
+                raise _Abandoned
+            self.chunk.append(rfp)
+            if len(self.chunk) < _CHUNK_SIZE:
+                return None
+            full, self.chunk = self.chunk, []
+            return full
+
+    def _take(self) -> list[dict]:
+        """The partly filled chunk, unless the consumer has already taken it."""
+        with self._lock:
+            partial, self.chunk = self.chunk, []
+            return partial
+
+    def put(self, item) -> bool:
+        """Block until the consumer has room.  False once abandoned."""
+        t0 = time.monotonic()
+        try:
+            while not self.abandoned:
+                try:
+                    self.queue.put(item, timeout=_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.blocked += time.monotonic() - t0
+
+    def idle(self) -> float:
+        """Seconds spent on backpressure or waiting for a free pool browser."""
+        slots = browser.slot_wait(self.thread) - self.slot_base if self.thread else 0.0
+        return self.blocked + slots
+
+    def expired(self, timeout: int) -> bool:
+        """True once the source has been *working* longer than `timeout`.
+
+        Time spent blocked on backpressure or waiting for a shared browser
+        does not count against it.  A source no thread has picked up
+        expires `timeout` seconds after the consumer started waiting on it.
+        """
+        if not timeout:
+            return False
+        now = time.monotonic()
+        if self.started is None:
+            return self.awaited is not None and now - self.awaited > timeout
+        return now - self.started - self.idle() > timeout
+
+    def _records(self, cp: checkpoint.SourceCheckpoint) -> Iterator[dict]:
+        """The source's records: replayed from `cp`, resumed, or fresh."""
+        if cp.done and not cp.external:
+            log.info(f"{self.name}: finished earlier today, replaying {cp.saved} saved records")
+            yield from cp.saved_records()
+            return
+        if cp.saved or cp.cursor:
+            log.info(f"{self.name}: resuming from checkpoint ({cp.saved} records saved)")
+        yield from cp.saved_records()
+        yield from self._scrape(cp)
+
+    def _scrape(self, cp: checkpoint.SourceCheckpoint) -> Iterator[dict]:
+        checkpoint.activate(cp)
+        try:
+            for rfp in self.scrape_fn():
+                if not cp.paged:
+                    cp.log_record(rfp)
+                yield rfp
+            if not self.abandoned:
+                cp.finish()
+        finally:
+            checkpoint.activate(None)
+            cp.close()
+
+    def pump(self):
+        """Thread body: run the source and push its records in chunks."""
+        self.thread = threading.get_ident()
+        self.slot_base = browser.slot_wait(self.thread)
+        with self._lock:
+            if self.abandoned:
+                return   # skipped before a thread got to it
+            self.started = time.monotonic()
+        count = 0
+        records = None
+        try:
+            cp = self.cp = checkpoint.SourceCheckpoint(self.name, self.checkpoint_dir)
+            records = self._records(cp)
+            for rfp in records:
+                chunk = self._add(rfp)
+                if chunk is not None:
+                    if not self.put(chunk):
+                        return
+                    count += len(chunk)
+            chunk = self._take()
+            if chunk:
+                if not self.put(chunk):
+                    return
+                count += len(chunk)
+            if self.abandoned:
+                return   # the consumer already gave up on this stream
+            elapsed = time.monotonic() - self.started - self.idle()
+            log.info(f"{self.name}: {count} records in {elapsed:.0f}s")
+        except _Abandoned:
+            return
+        except Exception as e:
+            log.error(f"{self.name} failed: {e}")
+            chunk = self._take()
+            if chunk:
+                self.put(chunk)  # keep what the source produced before failing
+        finally:
+            if records is not None:
+                records.close()
+            if self.abandoned and self.cp is not None:
+                self.cp.abandon()
+            self.put(None)  # end-of-stream marker
+
+
+def _work(pending: queue.Queue):
+    """Source thread body: pump streams until none are left to start.
+
+    A thread whose source was abandoned exits once the source returns;
+    the consumer has already started a replacement for it.
+    """
+    while True:
+        try:
+            stream = pending.get_nowait()
+        except queue.Empty:
+            return
+        if stream.abandoned:
+            continue
+        stream.pump()
+        if stream.abandoned and stream.started is not None:
+            return
+
+
+def _start_worker(pending: queue.Queue, name: str):
+    threading.Thread(target=_work, args=(pending,), name=name, daemon=True).start()
+
+
+def iter_sources(
+    sources: list[Callable[[], Iterable[dict]]],
+    workers: int = SOURCE_WORKERS,
+    timeout: int = SOURCE_TIMEOUT,
+    checkpoint_dir: Path | None = None,
+) -> Iterator[dict]:
+    """Run every scrape function and yield their records.
+
+    Up to `workers` sources run at once.  Records come out grouped by
+    source, in source-list order; later sources buffer at most
+    SOURCE_QUEUE_CHUNKS chunks ahead before they are paused.  A source that
+    works longer than `timeout` seconds is abandoned: records it already
+    produced are kept, the rest are dropped (Python threads cannot be
+    killed, so the thread stops at its next record or network timeout;
+    a fresh thread takes over its place in the pool, and source threads
+    are daemons, so a stuck one never delays exit).  A source no thread
+    picks up within `timeout` seconds of its turn is skipped.
+    A failing source is logged and simply ends its stream early.
+
+    With `checkpoint_dir`, progress is checkpointed there per source and
+    an earlier attempt's progress in the same directory is picked up.
+    """
+    workers = max(1, workers)
+    streams = [_SourceStream(fn, SOURCE_QUEUE_CHUNKS, checkpoint_dir) for fn in sources]
+
+    log.info(f"Running {len(sources)} sources with {workers} workers")
+    pending: queue.Queue = queue.Queue()
+    for stream in streams:
+        pending.put(stream)
+    threads = min(workers, len(streams))
+    for i in range(threads):
+        _start_worker(pending, f"source-{i}")
+
+    try:
+        for stream in streams:
+            stream.awaited = time.monotonic()
+            while True:
+                try:
+                    chunk = stream.queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if not stream.expired(timeout):
+                        continue
+                    left = stream.abandon()
+                    started = stream.started is not None   # settled once abandoned
+                    if not started:
+                        log.error(f"{stream.name} skipped — no worker free within {timeout}s")
+                        break
+                    log.error(
+                        f"{stream.name} timed out after {timeout}s — "
+                        f"keeping records produced so far ({len(left)} not yet received)"
+                    )
+                    yield from left
+                    # Its thread may never come back; keep the pool at full size
+                    _start_worker(pending, f"source-{threads}")
+                    threads += 1
+                    break
+                if chunk is None:
+                    stream.ended = True
+                    break
+                yield from chunk
+    finally:
+        # Unstarted sources are skipped; running ones stop at their next record
+        for stream in streams:
+            if not stream.ended:
+                stream.abandon()
+
@@ -0,0 +1,173 @@
+"""
+Asyncio HTTP helpers for the federal API sources.
+
+Enabled with ASYNC_FEDERAL=true (requires httpx).  SAM.gov, Grants.gov,
+NIH RePORTER and NSF Awards then fetch their independent keyword queries,
+date chunks and result pages concurrently instead of one at a time.  Each
+host gets at most ASYNC_HOST_CONCURRENCY requests in flight and is paced by
+the same per-host token bucket as the synchronous client (see ratelimit).
+
+The scrapers stay synchronous functions: each one drives its own event
+loop with iter_async()/run(), so the thread-pool scheduler is unchanged.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterable, Iterator
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from config import (ASYNC_FEDERAL, ASYNC_HOST_CONCURRENCY, REQUEST_TIMEOUT,
+                    HTTP_MAX_RETRIES, HTTP_BACKOFF, HTTP_MAX_WAIT, log)
+from sources import ratelimit
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# What a failed async request raises: transport and status errors, plus
+# ValueError from resp.json() on a body that isn't valid JSON (httpx, unlike
+# requests, doesn't wrap that in its own exception type)
+ERRORS: tuple[type[Exception], ...] = (
+    (httpx.HTTPError, ValueError) if httpx is not None else (ValueError,))
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_warned_missing = False
+
+
+def enabled() -> bool:
+    """True if ASYNC_FEDERAL is set and httpx is importable."""
+    global _warned_missing
+    if not ASYNC_FEDERAL:
+        return False
+    if httpx is None:
+        if not _warned_missing:
+            log.warning("ASYNC_FEDERAL is set but httpx is not installed — "
+                        "using the synchronous scrapers. Install with: pip install httpx")
+            _warned_missing = True
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def _retry_delay(resp, attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (Retry-After wins if present).
+
+    Never more than HTTP_MAX_WAIT, as in http_client.
+    """
+    delay = HTTP_BACKOFF * (2 ** attempt) + random.uniform(0, HTTP_BACKOFF)
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            delay = max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                delay = max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    return min(delay, HTTP_MAX_WAIT)
+
+
+class AsyncClient:
+    """httpx.AsyncClient with per-host concurrency caps, pacing and retries.
+
+    Retries 429/5xx responses and transport errors with exponential backoff
+    plus jitter, honoring Retry-After — the same policy as http_client.
+    """
+
+    def __init__(self):
+        self._client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=ASYNC_HOST_CONCURRENCY),
+        )
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(ASYNC_HOST_CONCURRENCY)
+        return self._hosts[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        semaphore = self._semaphore(url)
+        attempt = 0
+        while True:
+            resp = None
+            async with semaphore:
+                await asyncio.sleep(ratelimit.reserve(url))
+                try:
+                    resp = await self._client.request(method, url, **kwargs)
+                except httpx.TransportError:
+                    if attempt >= HTTP_MAX_RETRIES:
+                        raise
+            if resp is not None and (resp.status_code not in _RETRY_STATUSES
+                                     or attempt >= HTTP_MAX_RETRIES):
+                return resp
+            await asyncio.sleep(_retry_delay(resp, attempt))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Scheduling helpers
+# ---------------------------------------------------------------------------
+
+
+async def ordered(awaitables: Iterable[Awaitable], window: int) -> AsyncIterator:
+    """Run up to `window` awaitables at once, yielding results in input order.
+
+    `awaitables` is consumed lazily, so a long list of date chunks never has
+    more than `window` results held in memory.
+    """
+    pending: list[asyncio.Task] = []
+    try:
+        for aw in awaitables:
+            pending.append(asyncio.ensure_future(aw))
+            if len(pending) >= window:
+                yield await pending.pop(0)
+        while pending:
+            yield await pending.pop(0)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def iter_async(agen: AsyncIterator) -> Iterator:
+    """Drive an async generator from synchronous code on a private loop.
+
+    The loop only runs while the caller asks for the next item, so
+    in-flight requests pause when the consumer applies backpressure.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                item = loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+            yield item
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+def run(coro):
+    """Run a coroutine to completion on a private event loop."""
+    return asyncio.run(coro)
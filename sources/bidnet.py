@@ -2,12 +2,12 @@
 BidNet Direct scraper — all 50 US states.
 
 Scrapes local government solicitations from bidnetdirect.com using Playwright.
-Each state has its own URL slug; we iterate all 50 in a single browser session.
+Each state has its own URL slug; states are scraped concurrently on the shared
+browser pool (see browser.py).
 """
 
-import time
-
-from config import BIDNET_MAX_PAGES_PER_STATE, PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from config import BIDNET_MAX_PAGES_PER_STATE, PLAYWRIGHT_TIMEOUT, log
+from sources import browser, checkpoint, pagination, ratelimit
 
 # ---------------------------------------------------------------------------
 # State slug → abbreviation mapping
@@ -66,45 +66,39 @@ STATES = {
     "wyoming": "WY",
 }
 
+# Listing rows, for detecting when the next page has rendered
+_ROWS = ".bid-card, .solicitation-card, table tbody tr, .search-result, .result-item"
+
 
 def scrape_bidnet() -> list[dict]:
     """Scrape BidNet Direct open solicitations for all 50 states."""
     log.info("Scraping BidNet Direct (all 50 states)...")
 
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_bidnet_all_states()
-    except ImportError:
+    if not browser.available():
         log.warning(
             "Playwright not installed — skipping BidNet Direct. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
         return []
+    return _scrape_bidnet_all_states()
 
 
 def _scrape_bidnet_all_states() -> list[dict]:
-    from playwright.sync_api import sync_playwright
-
     all_rfps: list[dict] = []
+    cp = checkpoint.current()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        for slug, abbrev in STATES.items():
-            try:
-                state_rfps = _scrape_bidnet_state(context, slug, abbrev)
-                all_rfps.extend(state_rfps)
-            except Exception as e:
-                log.error(f"  BidNet {abbrev}: failed — {e}")
+    todo = [(slug, abbrev) for slug, abbrev in STATES.items() if not cp.completed(abbrev)]
 
-            time.sleep(POLITE_DELAY)
-
-        browser.close()
+    pool = browser.get_pool()
+    for (slug, abbrev), future in pool.map(_scrape_bidnet_state, todo, source="BidNet Direct"):
+        e = future.exception()
+        if e is not None:
+            log.error(f"  BidNet {abbrev}: failed — {e}")
+            cp.fail(abbrev)
+            continue
+        state_rfps = future.result()
+        cp.page(state_rfps, key=abbrev)
+        all_rfps.extend(state_rfps)
 
     log.info(f"BidNet Direct total: {len(all_rfps)} solicitations across 50 states")
     return all_rfps
@@ -117,6 +111,7 @@ def _scrape_bidnet_state(context, slug: str, abbrev: str) -> list[dict]:
 
     try:
         url = f"https://www.bidnetdirect.com/{slug}/solicitations/open-bids"
+        ratelimit.wait(url)
         page.goto(url, timeout=PLAYWRIGHT_TIMEOUT,
                   wait_until="domcontentloaded")
 
@@ -130,23 +125,34 @@ def _scrape_bidnet_state(context, slug: str, abbrev: str) -> list[dict]:
             log.info(f"  BidNet {abbrev}: page did not load expected selectors")
             return rfps
 
-        time.sleep(2)
+        browser.settle(page)
 
+        seen_pages = pagination.SeenPages(f"BidNet {abbrev}")
         page_num = 1
         while page_num <= BIDNET_MAX_PAGES_PER_STATE:
+            page_start = len(rfps)
             # Try multiple possible listing selectors
-            rows = (
-                page.query_selector_all(".bid-card, .solicitation-card") or
-                page.query_selector_all("table tbody tr") or
-                page.query_selector_all(".search-result, .result-item")
+            rows = browser.extract(
+                page,
+                [".bid-card, .solicitation-card", "table tbody tr",
+                 ".search-result, .result-item"],
+                {
+                    "title": ["h3, h4, .title, .bid-title", "a"],
+                    "href": ("a[href]", "href"),
+                    "agency": ".agency, .organization, .department, .entity-name",
+                    "close_date": ".close-date, .deadline, .due-date, .end-date",
+                    "posted_date": ".post-date, .posted-date, .publish-date",
+                    "amount": ".amount, .value, .budget, .estimate, .price, .cost",
+                },
             )
 
             if not rows:
                 # Fallback: link-based extraction
-                links = page.query_selector_all("a[href*='/solicitations/']")
+                links = browser.extract(page, "a[href*='/solicitations/']",
+                                        {"href": (None, "href")})
                 for link in links:
-                    href = link.get_attribute("href") or ""
-                    text = link.inner_text().strip()
+                    href = link["href"]
+                    text = link["text"]
                     if text and len(text) > 10 and "/open-bids" not in href:
                         parts = href.rstrip("/").split("/")
                         sol_id = parts[-1] if parts else ""
@@ -167,56 +173,29 @@ def _scrape_bidnet_state(context, slug: str, abbrev: str) -> list[dict]:
                 break
 
             for row in rows:
-                try:
-                    title_el = (
-                        row.query_selector("h3, h4, .title, .bid-title") or
-                        row.query_selector("a")
-                    )
-                    title = title_el.inner_text().strip() if title_el else ""
-
-                    link_el = row.query_selector("a[href]")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    agency_el = row.query_selector(
-                        ".agency, .organization, .department, .entity-name"
-                    )
-                    agency = agency_el.inner_text().strip() if agency_el else ""
-
-                    date_el = row.query_selector(
-                        ".close-date, .deadline, .due-date, .end-date"
-                    )
-                    close_date = date_el.inner_text().strip() if date_el else ""
-
-                    posted_el = row.query_selector(
-                        ".post-date, .posted-date, .publish-date"
-                    )
-                    posted_date = posted_el.inner_text().strip() if posted_el else ""
-
-                    amount_el = row.query_selector(
-                        ".amount, .value, .budget, .estimate, .price, .cost"
-                    )
-                    amount = amount_el.inner_text().strip() if amount_el else ""
-
-                    parts = (href or "").rstrip("/").split("/")
-                    sol_id = parts[-1] if parts else ""
-
-                    if title:
-                        rfps.append({
-                            "state": abbrev,
-                            "source": "BidNet Direct",
-                            "id": sol_id,
-                            "title": title,
-                            "agency": agency,
-                            "status": "Open",
-                            "posted_date": posted_date,
-                            "close_date": close_date,
-                            "url": (href if href and href.startswith("http")
-                                    else f"https://www.bidnetdirect.com{href}" if href else ""),
-                            "description": title,
-                            "amount": amount,
-                        })
-                except Exception:
-                    continue
+                title = row["title"]
+                href = row["href"]
+                parts = href.rstrip("/").split("/")
+                sol_id = parts[-1] if parts else ""
+
+                if title:
+                    rfps.append({
+                        "state": abbrev,
+                        "source": "BidNet Direct",
+                        "id": sol_id,
+                        "title": title,
+                        "agency": row["agency"],
+                        "status": "Open",
+                        "posted_date": row["posted_date"],
+                        "close_date": row["close_date"],
+                        "url": (href if href.startswith("http")
+                                else f"https://www.bidnetdirect.com{href}" if href else ""),
+                        "description": title,
+                        "amount": row["amount"],
+                    })
+
+            if seen_pages.stop(rfps[page_start:]):
+                break
 
             # Try next page
             next_btn = (
@@ -226,18 +205,12 @@ def _scrape_bidnet_state(context, slug: str, abbrev: str) -> list[dict]:
 
             if next_btn:
                 try:
+                    ratelimit.wait(page.url)
+                    before = browser.results_signature(page, _ROWS)
                     # Use no_wait_after to prevent hanging on navigation
                     next_btn.click(timeout=10000, no_wait_after=True)
-                    time.sleep(4)
-
-                    for _ in range(10):
-                        new_rows = (
-                            page.query_selector_all(".bid-card, .solicitation-card") or
-                            page.query_selector_all("table tbody tr")
-                        )
-                        if new_rows:
-                            break
-                        time.sleep(1)
+                    if not browser.wait_for_results_change(page, _ROWS, before):
+                        break
 
                     page_num += 1
                 except Exception:
@@ -250,6 +223,7 @@ def _scrape_bidnet_state(context, slug: str, abbrev: str) -> list[dict]:
 
     except Exception as e:
         log.error(f"  BidNet {abbrev}: scrape failed — {e}")
+        checkpoint.current().fail(abbrev)
     finally:
         page.close()
 
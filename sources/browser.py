@@ -0,0 +1,385 @@
+"""
+Shared Playwright browser pool for all browser-based sources.
+
+BROWSER_WORKERS threads each own one headless Chromium (Playwright's sync
+API is bound to the thread that started it).  Sources hand the pool one
+task per state or portal; every task gets a fresh browser context, so up to
+BROWSER_WORKERS pages load at once across BidNet, DemandStar, BuySpeed,
+JAGGAER, NC eVP and the state portals combined, instead of each source
+launching its own browser and walking its pages one at a time.
+
+Every context aborts images, media, fonts and known tracker domains
+(BLOCK_RESOURCES), which the scrapers never look at; the pool logs how many
+requests each source skipped.  Aborted requests are never downloaded, so
+their size is unknown and no byte savings are claimed.
+
+A worker whose browser crashes relaunches it before its next task.  The
+pool starts on first use and shuts down at interpreter exit.  Waits on pool
+tasks are bounded: a task that finds no free browser within
+BROWSER_SLOT_TIMEOUT, or runs longer than BROWSER_TASK_TIMEOUT, fails with
+TimeoutError.  Time a thread spends waiting for a free browser is tallied
+per thread (slot_wait()), so the scheduler does not count it as the
+source's own working time.
+
+settle() and wait_for_results_change() replace fixed sleeps in the page
+scrapers: they return as soon as the network goes quiet or the results
+list re-renders, bounded by a timeout.  extract() reads a whole results
+table or card list in one round trip, so the scrapers' row heuristics run
+on plain dicts in Python.
+"""
+
+import atexit
+import contextvars
+import queue
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from urllib.parse import urlsplit
+
+from config import (BROWSER_WORKERS, BROWSER_SLOT_TIMEOUT, BROWSER_TASK_TIMEOUT,
+                    BLOCK_RESOURCES, BLOCK_RESOURCE_TYPES, BLOCK_TRACKER_DOMAINS,
+                    PAGE_SETTLE_TIMEOUT, PAGE_CHANGE_TIMEOUT, log)
+from sources.http_client import BROWSER_USER_AGENT
+
+_POLL_INTERVAL = 1.0  # seconds between task timeout checks
+
+_slot_waits: dict[int, float] = {}   # thread ident -> seconds waited for a browser
+_slot_lock = threading.Lock()
+
+
+def available() -> bool:
+    """True if Playwright is importable."""
+    try:
+        from playwright.sync_api import sync_playwright  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def slot_wait(ident: int) -> float:
+    """Seconds thread `ident` has spent waiting for a free pool browser."""
+    with _slot_lock:
+        return _slot_waits.get(ident, 0.0)
+
+
+def _add_slot_wait(seconds: float):
+    ident = threading.get_ident()
+    with _slot_lock:
+        _slot_waits[ident] = _slot_waits.get(ident, 0.0) + seconds
+
+
+def _is_tracker(url: str) -> bool:
+    host = urlsplit(url).hostname or ""
+    return any(host == d or host.endswith("." + d) for d in BLOCK_TRACKER_DOMAINS)
+
+
+class _Blocker:
+    """Context route handler: abort unneeded requests and tally them."""
+
+    def __init__(self):
+        self.blocked: Counter = Counter()   # reason -> requests aborted
+
+    def __call__(self, route):
+        request = route.request
+        kind = request.resource_type
+        if kind in BLOCK_RESOURCE_TYPES:
+            reason = kind
+        elif _is_tracker(request.url):
+            reason = "tracker"
+        else:
+            route.continue_()
+            return
+        self.blocked[reason] += 1
+        route.abort()
+
+
+class _Task(Future):
+    """Future for one pool task, stamped when a browser picks it up."""
+
+    started: float | None = None
+
+
+class BrowserPool:
+    """Fixed set of browser threads pulling tasks from one queue."""
+
+    def __init__(self, workers: int = BROWSER_WORKERS):
+        self.workers = max(1, workers)
+        self._tasks: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._blocked: dict[str, Counter] = {}   # source -> reason -> count
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"browser-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            log.info(f"Browser pool: {self.workers} Chromium workers")
+
+    def _work(self):
+        try:
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as p:
+                self._serve(p)
+        except Exception as e:
+            # Playwright itself is unusable: fail tasks instead of hanging them
+            log.error(f"Browser worker failed: {e}")
+            while (task := self._tasks.get()) is not None:
+                future = task[-1]
+                if self._begin(future):
+                    self._resolve(future, error=e)
+
+    def _begin(self, future: _Task) -> bool:
+        """Mark a task running; False if it was cancelled or already failed."""
+        with self._lock:
+            if future.done() or not future.set_running_or_notify_cancel():
+                return False
+            future.started = time.monotonic()
+            return True
+
+    def _resolve(self, future: _Task, result=None, error: BaseException | None = None):
+        """Settle a task unless it was already settled (e.g. timed out)."""
+        with self._lock:
+            if future.done():
+                return
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _serve(self, p):
+        browser = None
+        while (task := self._tasks.get()) is not None:
+            fn, args, ctx, source, future = task
+            if not self._begin(future):
+                continue
+            context = None
+            blocker = _Blocker()
+            result = error = None
+            try:
+                if browser is None or not browser.is_connected():
+                    browser = p.chromium.launch(headless=True)
+                context = browser.new_context(user_agent=BROWSER_USER_AGENT)
+                if BLOCK_RESOURCES:
+                    context.route("**/*", blocker)
+                result = ctx.run(fn, context, *args)
+            except Exception as e:
+                error = e
+            if context is not None:
+                try:
+                    context.close()
+                except Exception:
+                    pass  # the browser itself went away
+            # Tally before resolving, so report() after the last result sees it
+            self._tally(source, blocker)
+            self._resolve(future, result, error)
+        if browser is not None and browser.is_connected():
+            browser.close()
+
+    def submit(self, fn: Callable, *args, source: str = "") -> Future:
+        """Run fn(context, *args) on a pool browser; returns a Future.
+
+        The task runs in a copy of the caller's context variables, so it
+        sees the submitting source's checkpoint.  `source` labels the
+        blocked-request stats.
+        """
+        self._start()
+        future = _Task()
+        self._tasks.put((fn, args, contextvars.copy_context(), source, future))
+        return future
+
+    def map(self, fn: Callable, items: Iterable, source: str = "") -> Iterator[tuple]:
+        """Run fn(context, *item) for every item tuple concurrently.
+
+        Yields (item, future) in input order as each one finishes; check
+        future.exception() / future.result().  Tasks not yet started are
+        cancelled if the caller stops early.
+        """
+        items = list(items)
+        futures = [self.submit(fn, *item, source=source) for item in items]
+        try:
+            for item, future in zip(items, futures):
+                self._wait(future)
+                yield item, future
+        finally:
+            for future in futures:
+                future.cancel()
+            self.report(source)
+
+    def run(self, fn: Callable, *args, source: str = ""):
+        """Run one task on a pool browser and return its result."""
+        try:
+            future = self.submit(fn, *args, source=source)
+            self._wait(future)
+            return future.result()
+        finally:
+            self.report(source)
+
+    def _wait(self, future: _Task):
+        """Wait for a task to settle, failing it once it overruns its timeouts.
+
+        The time until a browser picks the task up is credited to the
+        calling thread's slot_wait().
+        """
+        t0 = time.monotonic()
+        while True:
+            try:
+                future.exception(timeout=_POLL_INTERVAL)
+                break
+            except FutureTimeout:
+                pass
+            now = time.monotonic()
+            if future.started is None:
+                if now - t0 > BROWSER_SLOT_TIMEOUT:
+                    self._resolve(future, error=TimeoutError(
+                        f"no free browser within {BROWSER_SLOT_TIMEOUT}s"))
+            elif now - future.started > BROWSER_TASK_TIMEOUT:
+                self._resolve(future, error=TimeoutError(
+                    f"browser task ran longer than {BROWSER_TASK_TIMEOUT}s"))
+        started = future.started if future.started is not None else time.monotonic()
+        _add_slot_wait(max(0.0, started - t0))
+
+    def _tally(self, source: str, blocker: _Blocker):
+        if not blocker.blocked:
+            return
+        with self._lock:
+            self._blocked.setdefault(source, Counter()).update(blocker.blocked)
+
+    def report(self, source: str):
+        """Log (and reset) the requests blocked for `source`'s pages."""
+        with self._lock:
+            blocked = self._blocked.pop(source, None)
+        if not blocked:
+            return
+        detail = ", ".join(f"{n} {reason}" for reason, n in blocked.most_common())
+        log.info(f"{source or 'Browser'}: blocked {sum(blocked.values())} requests ({detail})")
+
+    def shutdown(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._tasks.put(None)
+        for t in threads:
+            t.join(timeout=30)
+
+
+_pool = BrowserPool()
+atexit.register(_pool.shutdown)
+
+
+def get_pool() -> BrowserPool:
+    """The process-wide browser pool."""
+    return _pool
+
+
+# ---------------------------------------------------------------------------
+# Page waits
+# ---------------------------------------------------------------------------
+
+# Cheap fingerprint of a results list: row count plus first and last row text.
+_SIGNATURE_JS = """(selector) => {
+    const rows = document.querySelectorAll(selector);
+    const text = (el) => el ? el.innerText.trim().slice(0, 200) : "";
+    return rows.length + "|" + text(rows[0]) + "|" + text(rows[rows.length - 1]);
+}"""
+
+
+def settle(page, timeout: int = PAGE_SETTLE_TIMEOUT):
+    """Wait until the page's network goes idle, or `timeout` ms at most.
+
+    Pages that poll or stream never go fully idle; the timeout just caps
+    the wait, it is not an error.
+    """
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+    except Exception:
+        pass
+
+
+def results_signature(page, selector: str) -> str:
+    """Fingerprint of the rows matching `selector`, for wait_for_results_change()."""
+    return page.evaluate(_SIGNATURE_JS, selector)
+
+
+def wait_for_results_change(page, selector: str, before: str,
+                            timeout: int = PAGE_CHANGE_TIMEOUT) -> bool:
+    """Wait until the rows matching `selector` differ from `before`.
+
+    Call results_signature() before clicking "next", then this after.
+    Returns False if nothing non-empty changed within `timeout` ms.
+    """
+    try:
+        page.wait_for_function(
+            f"([selector, before]) => {{"
+            f" const sig = ({_SIGNATURE_JS})(selector);"
+            f" return !sig.startsWith('0|') && sig !== before; }}",
+            arg=[selector, before],
+            timeout=timeout,
+        )
+    except Exception:
+        return False
+    settle(page)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Batch extraction
+# ---------------------------------------------------------------------------
+
+# Runs in the page: serializes every matching row in one round trip, rather
+# than one IPC call per query_selector/inner_text/get_attribute.
+_EXTRACT_JS = """([rowSelectors, fields]) => {
+    const clean = (s) => (s || "").trim();
+    const first = (root, sels) => {
+        for (const s of sels) {
+            const el = root.querySelector(s);
+            if (el) return el;
+        }
+        return null;
+    };
+    let rows = [];
+    for (const s of rowSelectors) {
+        rows = document.querySelectorAll(s);
+        if (rows.length) break;
+    }
+    return Array.from(rows, (row) => {
+        const out = {
+            text: clean(row.innerText),
+            cells: Array.from(row.querySelectorAll("td"), (td) => clean(td.innerText)),
+        };
+        for (const [name, [sels, attr]] of Object.entries(fields)) {
+            const el = sels === null ? row : first(row, sels);
+            out[name] = el ? clean(attr ? el.getAttribute(attr) : el.innerText) : "";
+        }
+        return out;
+    });
+}"""
+
+
+def _alternatives(selector: str | list[str] | None) -> list[str] | None:
+    return [selector] if isinstance(selector, str) else selector
+
+
+def extract(page, rows: str | list[str], fields: dict | None = None) -> list[dict]:
+    """Serialize the rows matching `rows` to plain dicts in one evaluate call.
+
+    `rows` is a CSS selector, or a list tried in order until one matches.
+    Every dict has "text" (the row's inner text) and "cells" (its <td>
+    texts), plus one string per `fields` entry:
+
+        name: selector               inner text of the row's first match
+        name: (selector, attribute)  that attribute of the first match
+
+    A field selector may also be a list of alternatives, or None for the
+    row element itself.  Missing elements and attributes give "".
+    """
+    spec = {}
+    for name, field in (fields or {}).items():
+        selector, attr = field if isinstance(field, tuple) else (field, None)
+        spec[name] = [_alternatives(selector), attr]
+    return page.evaluate(_EXTRACT_JS, [_alternatives(rows), spec])
@@ -9,9 +9,8 @@ Public open-bids URL pattern (current):
     https://{domain}/bso/view/search/external/advancedSearchBid.xhtml?openBids=true
 """
 
-import time
-
-from config import PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from config import PLAYWRIGHT_TIMEOUT, log
+from sources import browser, checkpoint, ratelimit
 
 # ---------------------------------------------------------------------------
 # BuySpeed portal configurations
@@ -52,45 +51,39 @@ BUYSPEED_PORTALS = [
 
 BUYSPEED_MAX_PAGES = 10
 
+# Result rows, for detecting when the next page has rendered
+_ROWS = "table.table tbody tr, #bidSearchResultsTable tbody tr, table tbody tr"
+
 
 def scrape_buyspeed() -> list[dict]:
     """Scrape open solicitations from all BuySpeed/BSO portals."""
     log.info(f"Scraping {len(BUYSPEED_PORTALS)} BuySpeed/BSO state portals...")
 
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_all_portals()
-    except ImportError:
+    if not browser.available():
         log.warning(
             "Playwright not installed — skipping BuySpeed portals. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
         return []
+    return _scrape_all_portals()
 
 
 def _scrape_all_portals() -> list[dict]:
-    from playwright.sync_api import sync_playwright
-
     all_rfps: list[dict] = []
+    cp = checkpoint.current()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        for portal in BUYSPEED_PORTALS:
-            try:
-                rfps = _scrape_one_portal(context, portal)
-                all_rfps.extend(rfps)
-            except Exception as e:
-                log.error(f"  {portal['label']}: failed — {e}")
-
-            time.sleep(POLITE_DELAY)
+    todo = [(portal,) for portal in BUYSPEED_PORTALS if not cp.completed(portal["label"])]
 
-        browser.close()
+    pool = browser.get_pool()
+    for (portal,), future in pool.map(_scrape_one_portal, todo, source="BuySpeed"):
+        e = future.exception()
+        if e is not None:
+            log.error(f"  {portal['label']}: failed — {e}")
+            cp.fail(portal["label"])
+            continue
+        rfps = future.result()
+        cp.page(rfps, key=portal["label"])
+        all_rfps.extend(rfps)
 
     log.info(
         f"BuySpeed total: {len(all_rfps)} solicitations "
@@ -109,12 +102,13 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
     page = context.new_page()
 
     try:
+        ratelimit.wait(url)
         page.goto(url, timeout=PLAYWRIGHT_TIMEOUT,
                   wait_until="domcontentloaded")
 
         # The advancedSearchBid page loads a form; we need to click
         # the "Search" button to get results, or it may auto-populate.
-        time.sleep(3)
+        browser.settle(page)
 
         # Try clicking a search/submit button if present
         search_btn = (
@@ -125,8 +119,9 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
         )
         if search_btn:
             try:
+                ratelimit.wait(page.url)
                 search_btn.click()
-                time.sleep(3)
+                browser.settle(page)
             except Exception:
                 pass
 
@@ -142,26 +137,29 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
             log.info(f"  {label}: page did not load expected selectors")
             return rfps
 
-        time.sleep(2)
+        browser.settle(page)
 
         page_num = 1
         while page_num <= BUYSPEED_MAX_PAGES:
             # BuySpeed tables typically have a results table
-            rows = (
-                page.query_selector_all("table.table tbody tr") or
-                page.query_selector_all("#bidSearchResultsTable tbody tr") or
-                page.query_selector_all("table tbody tr")
+            rows = browser.extract(
+                page,
+                ["table.table tbody tr", "#bidSearchResultsTable tbody tr",
+                 "table tbody tr"],
+                {"link_text": "a[href]", "href": ("a[href]", "href")},
             )
 
             if not rows:
                 # Try link-based fallback
-                links = page.query_selector_all(
+                links = browser.extract(
+                    page,
                     "a[href*='bidDetail'], a[href*='BidDetail'], "
-                    "a[href*='publicBidDetail']"
+                    "a[href*='publicBidDetail']",
+                    {"href": (None, "href")},
                 )
                 for link in links:
-                    href = link.get_attribute("href") or ""
-                    text = link.inner_text().strip()
+                    href = link["href"]
+                    text = link["text"]
                     if text and len(text) > 5:
                         rfps.append({
                             "state": state,
@@ -179,81 +177,65 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
                 break
 
             for row in rows:
-                try:
-                    cells = row.query_selector_all("td")
-                    if not cells or len(cells) < 2:
-                        continue
-
-                    # BuySpeed tables vary, but common patterns:
-                    # Col 0: Bid number/ID  Col 1: Description/Title
-                    # Col 2: Agency/Org  Col 3: Close date
-                    link_el = row.query_selector("a[href]")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    # Try to extract bid ID from first cell or link
-                    bid_id = ""
-                    if cells:
-                        bid_id = cells[0].inner_text().strip()
-                    if not bid_id and href:
-                        bid_id = _extract_bid_id(href)
-
-                    # Title from link text or second cell
-                    title = ""
-                    if link_el:
-                        title = link_el.inner_text().strip()
-                    if not title and len(cells) > 1:
-                        title = cells[1].inner_text().strip()
-                    if not title:
-                        title = bid_id
-
-                    # Agency — typically 3rd or 4th column
-                    agency = ""
-                    for i in range(2, min(len(cells), 5)):
-                        cell_text = cells[i].inner_text().strip()
-                        if cell_text and not _looks_like_date(cell_text):
-                            agency = cell_text
-                            break
-
-                    # Dates — collect all date-like cells; first is typically
-                    # posted/open date, second is close date
-                    date_cells = []
-                    for i in range(2, len(cells)):
-                        cell_text = cells[i].inner_text().strip()
-                        if _looks_like_date(cell_text):
-                            date_cells.append(cell_text)
-
-                    posted_date = date_cells[0] if len(date_cells) > 1 else ""
-                    close_date = date_cells[-1] if date_cells else ""
-
-                    # Amount — look for dollar-like values
-                    amount = ""
-                    for i in range(2, len(cells)):
-                        cell_text = cells[i].inner_text().strip()
-                        if _looks_like_amount(cell_text):
-                            amount = cell_text
-                            break
-
-                    # Skip navigation cruft and header rows
-                    skip_words = {"select category", "bid solicitations",
-                                  "contracts", "purchase orders", "search",
-                                  "filter", "sort by", "category"}
-                    if title and not any(sw in title.lower() for sw in skip_words):
-                        rfps.append({
-                            "state": state,
-                            "source": label,
-                            "id": bid_id,
-                            "title": title,
-                            "agency": agency,
-                            "status": "Open",
-                            "posted_date": posted_date,
-                            "close_date": close_date,
-                            "url": _make_absolute(url, href) if href else "",
-                            "description": title,
-                            "amount": amount,
-                        })
-                except Exception:
+                cells = row["cells"]
+                if len(cells) < 2:
                     continue
 
+                # BuySpeed tables vary, but common patterns:
+                # Col 0: Bid number/ID  Col 1: Description/Title
+                # Col 2: Agency/Org  Col 3: Close date
+                href = row["href"]
+
+                # Try to extract bid ID from first cell or link
+                bid_id = cells[0]
+                if not bid_id and href:
+                    bid_id = _extract_bid_id(href)
+
+                # Title from link text or second cell
+                title = row["link_text"] or cells[1]
+                if not title:
+                    title = bid_id
+
+                # Agency — typically 3rd or 4th column
+                agency = ""
+                for cell_text in cells[2:5]:
+                    if cell_text and not _looks_like_date(cell_text):
+                        agency = cell_text
+                        break
+
+                # Dates — collect all date-like cells; first is typically
+                # posted/open date, second is close date
+                date_cells = [c for c in cells[2:] if _looks_like_date(c)]
+
+                posted_date = date_cells[0] if len(date_cells) > 1 else ""
+                close_date = date_cells[-1] if date_cells else ""
+
+                # Amount — look for dollar-like values
+                amount = ""
+                for cell_text in cells[2:]:
+                    if _looks_like_amount(cell_text):
+                        amount = cell_text
+                        break
+
+                # Skip navigation cruft and header rows
+                skip_words = {"select category", "bid solicitations",
+                              "contracts", "purchase orders", "search",
+                              "filter", "sort by", "category"}
+                if title and not any(sw in title.lower() for sw in skip_words):
+                    rfps.append({
+                        "state": state,
+                        "source": label,
+                        "id": bid_id,
+                        "title": title,
+                        "agency": agency,
+                        "status": "Open",
+                        "posted_date": posted_date,
+                        "close_date": close_date,
+                        "url": _make_absolute(url, href) if href else "",
+                        "description": title,
+                        "amount": amount,
+                    })
+
             # Try next page
             next_btn = (
                 page.query_selector("a.next, .pagination .next a") or
@@ -263,8 +245,11 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
 
             if next_btn and next_btn.is_visible():
                 try:
+                    ratelimit.wait(page.url)
+                    before = browser.results_signature(page, _ROWS)
                     next_btn.click()
-                    time.sleep(3)
+                    if not browser.wait_for_results_change(page, _ROWS, before):
+                        break
                     page_num += 1
                 except Exception:
                     break
@@ -276,6 +261,7 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
 
     except Exception as e:
         log.error(f"  {label}: scrape failed — {e}")
+        checkpoint.current().fail(label)
     finally:
         page.close()
 
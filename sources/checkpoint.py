@@ -0,0 +1,272 @@
+"""
+Resumable per-source progress for an interrupted scrape.
+
+While a scrape runs, each source gets a SourceCheckpoint in
+data/checkpoints/<YYYY-MM-DD>/: a JSON-lines file of the records it has
+produced and a small state file with its resume position.  If the run dies
+(a Playwright crash, a network drop), rerunning the same day replays
+finished sources from disk without touching the network and restarts
+partial ones where they stopped.  Once the run's rows are safely written,
+main.scrape() clears the checkpoints of sources that finished; those of
+failed or timed-out sources stay, so the next run resumes them.
+
+Paginated sources cooperate through current(): they skip pages/units the
+checkpoint already holds and call page() after each one, which saves that
+page's records together with the position to resume from.  Sources that
+don't are checkpointed whole: their records only count once the source
+finishes.
+"""
+
+import json
+import re
+import shutil
+from contextvars import ContextVar
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+
+from config import CHECKPOINT_DIR, log
+
+_DATED_DIR = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_current: ContextVar["SourceCheckpoint | None"] = ContextVar("checkpoint", default=None)
+
+
+class SourceCheckpoint:
+    """On-disk progress of one source within one day's run.
+
+    A checkpoint built without a directory is a no-op, so sources can use
+    current() unconditionally even when run outside the scheduler.
+    """
+
+    def __init__(self, name: str, run_dir: Path | None = None):
+        self.name = name
+        self.cursor: dict = {}        # source-defined resume position
+        self.done = False             # source finished; replay instead of rerun
+        self.paged = False            # the source saves its own pages
+        self.external = False         # the source keeps its own checkpoint files
+        self.own_dir: str | None = None  # ...in this directory, cleared once done
+        self.failed = False           # some unit failed; don't mark done
+        self._completed: set[str] = set()
+        self._failed_keys: set[str] = set()
+        self._count = 0               # records covered by the state file
+        self._pending = 0             # records logged since the last state save
+        self._log = None
+        self._records_path = run_dir / f"{name}.jsonl" if run_dir else None
+        self._state_path = run_dir / f"{name}.json" if run_dir else None
+        if run_dir is not None:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self._state_path is not None
+
+    @property
+    def saved(self) -> int:
+        """Records already saved for this source."""
+        return self._count
+
+    # -- loading ------------------------------------------------------------
+
+    def _load(self):
+        state = None
+        if self._state_path.exists():
+            try:
+                state = json.loads(self._state_path.read_text())
+            except (OSError, ValueError) as e:
+                log.warning(f"{self.name}: unreadable checkpoint, starting over: {e}")
+        if state is None or not self._truncate(state.get("records", 0)):
+            self._reset()
+            return
+
+        self.cursor = state.get("cursor", {})
+        self.done = state.get("done", False)
+        self.external = state.get("external", False)
+        self.own_dir = state.get("own_dir")
+        self._completed = set(state.get("completed", []))
+        self._count = state.get("records", 0)
+
+    def _truncate(self, count: int) -> bool:
+        """Drop record lines written after the last state save.
+
+        False if the records file holds fewer lines than the state claims.
+        """
+        if not self._records_path.exists():
+            return count == 0
+        with open(self._records_path, "rb+") as f:
+            for _ in range(count):
+                if not f.readline():
+                    return False
+            f.truncate(f.tell())
+        return True
+
+    def _reset(self):
+        self._records_path.unlink(missing_ok=True)
+        self._state_path.unlink(missing_ok=True)
+
+    def saved_records(self) -> Iterator[dict]:
+        """Yield the records saved by earlier attempts, in order."""
+        if not self.enabled or not self._count:
+            return
+        with open(self._records_path, encoding="utf-8") as f:
+            for _, line in zip(range(self._count), f):
+                yield json.loads(line)
+
+    # -- saving -------------------------------------------------------------
+
+    def completed(self, key: str) -> bool:
+        """True if the unit `key` (a state, portal, query...) is already saved."""
+        return key in self._completed
+
+    def page(self, records: Iterable[dict], key: str | None = None, **cursor):
+        """Save one page of records and the position to resume after it.
+
+        `key` marks a unit as complete (see completed()); `cursor` entries
+        are merged into self.cursor.  Call this before handing the page's
+        records back, so the scheduler knows they are already saved.  A unit
+        reported to fail() is not saved, so a rerun fetches it again.
+        """
+        self.paged = True
+        if key is not None and key in self._failed_keys:
+            return
+        self.cursor.update(cursor)
+        if key is not None:
+            self._completed.add(key)
+        if not self.enabled:
+            return
+        self._pending += self._append(records)
+        self._save_state()
+
+    def log_record(self, rfp: dict):
+        """Log a record from a source that doesn't save its own pages."""
+        if self.enabled:
+            self._pending += self._append([rfp])
+
+    def fail(self, key: str | None = None):
+        """Note that a unit failed, so a rerun retries the missing units."""
+        self.failed = True
+        if key is not None:
+            self._failed_keys.add(key)
+
+    def keep_own(self, own_dir: Path | None = None):
+        """The source checkpoints itself; always rerun it (it resumes itself).
+
+        `own_dir` is removed by clear() only once the source has finished
+        without failures, so its progress outlives failed runs.
+        """
+        self.paged = self.external = True
+        self.own_dir = str(own_dir) if own_dir is not None else None
+        if self.enabled:
+            self._save_state()
+
+    def finish(self):
+        """The source ran to the end; replay its records on a same-day rerun."""
+        self.done = not self.failed
+        if not self.paged and not self.done:
+            self._pending = 0   # a partial unpaged run can't be resumed
+        if self.enabled:
+            self._save_state()
+
+    def abandon(self):
+        """The scheduler gave up on the source: its later records were dropped.
+
+        Never counts as done, so the source reruns and its watermark stays.
+        """
+        self.failed = True
+        self.done = False
+        if self.enabled:
+            self._save_state()
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _append(self, records: Iterable[dict]) -> int:
+        if self._log is None:
+            self._records_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self._records_path, "a", encoding="utf-8")
+        n = 0
+        for rfp in records:
+            self._log.write(json.dumps(rfp, default=str) + "\n")
+            n += 1
+        return n
+
+    def _save_state(self):
+        """Flush logged records, then atomically replace the state file."""
+        if self._log is not None:
+            self._log.flush()
+        self._count += self._pending
+        self._pending = 0
+        self._state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_path.with_name(f".{self._state_path.name}.tmp")
+        tmp.write_text(json.dumps({
+            "cursor": self.cursor,
+            "completed": sorted(self._completed),
+            "records": self._count,
+            "done": self.done,
+            "external": self.external,
+            "own_dir": self.own_dir,
+        }))
+        tmp.replace(self._state_path)
+
+
+# ---------------------------------------------------------------------------
+# Run-level helpers
+# ---------------------------------------------------------------------------
+
+
+def run_dir(now: datetime | None = None) -> Path:
+    """Checkpoint directory for the run on `now`'s date."""
+    return CHECKPOINT_DIR / (now or datetime.now()).strftime("%Y-%m-%d")
+
+
+def prune_stale(now: datetime | None = None):
+    """Remove dated checkpoint directories from earlier days."""
+    if not CHECKPOINT_DIR.exists():
+        return
+    today = run_dir(now).name
+    for path in CHECKPOINT_DIR.iterdir():
+        if path.is_dir() and _DATED_DIR.match(path.name) and path.name != today:
+            shutil.rmtree(path, ignore_errors=True)
+            log.info(f"Removed stale checkpoints from {path.name}")
+
+
+def clear():
+    """Remove finished sources' checkpoints once a run's rows are safely written.
+
+    Sources that failed or were abandoned keep theirs (including a
+    keep_own() directory), so the next run resumes instead of starting over.
+    """
+    if not CHECKPOINT_DIR.exists():
+        return
+    for run in CHECKPOINT_DIR.iterdir():
+        if not (run.is_dir() and _DATED_DIR.match(run.name)):
+            continue
+        for state_path in run.glob("*.json"):
+            try:
+                state = json.loads(state_path.read_text())
+            except (OSError, ValueError):
+                continue
+            if not state.get("done"):
+                continue
+            if state.get("own_dir"):
+                shutil.rmtree(state["own_dir"], ignore_errors=True)
+            state_path.with_suffix(".jsonl").unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+        if not any(run.iterdir()):
+            run.rmdir()
+
+
+def activate(cp: SourceCheckpoint | None):
+    """Make `cp` the checkpoint current() returns in this context.
+
+    A context variable rather than a thread-local, so work a source hands
+    to the browser pool (which copies the caller's context) still sees it.
+    """
+    _current.set(cp)
+
+
+def current() -> SourceCheckpoint:
+    """The running source's checkpoint (a no-op one outside the scheduler)."""
+    cp = _current.get()
+    return cp if cp is not None else SourceCheckpoint("")
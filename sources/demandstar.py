@@ -5,9 +5,8 @@ Scrapes open bids from demandstar.com/app/browse-bids by state using Playwright.
 DemandStar aggregates bids from 1,400+ local government agencies nationwide.
 """
 
-import time
-
-from config import DEMANDSTAR_MAX_PAGES, PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from config import DEMANDSTAR_MAX_PAGES, PLAYWRIGHT_TIMEOUT, log
+from sources import browser, checkpoint, ratelimit
 
 # ---------------------------------------------------------------------------
 # State slug → abbreviation mapping
@@ -30,45 +29,42 @@ STATES = {
     "west-virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
 }
 
+# Listing rows, for detecting when the next page has rendered
+_ROWS = (
+    "[class*='bid-row'], [class*='bid-card'], [class*='BidRow'], [class*='BidCard'], "
+    "table tbody tr, [class*='result-item'], [class*='listing-item']"
+)
+
 
 def scrape_demandstar() -> list[dict]:
     """Scrape DemandStar open bids for all 50 states."""
     log.info("Scraping DemandStar (all 50 states)...")
 
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_all_states()
-    except ImportError:
+    if not browser.available():
         log.warning(
             "Playwright not installed — skipping DemandStar. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
         return []
+    return _scrape_all_states()
 
 
 def _scrape_all_states() -> list[dict]:
-    from playwright.sync_api import sync_playwright
-
     all_rfps: list[dict] = []
+    cp = checkpoint.current()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        for slug, abbrev in STATES.items():
-            try:
-                state_rfps = _scrape_state(context, slug, abbrev)
-                all_rfps.extend(state_rfps)
-            except Exception as e:
-                log.error(f"  DemandStar {abbrev}: failed — {e}")
+    todo = [(slug, abbrev) for slug, abbrev in STATES.items() if not cp.completed(abbrev)]
 
-            time.sleep(POLITE_DELAY)
-
-        browser.close()
+    pool = browser.get_pool()
+    for (slug, abbrev), future in pool.map(_scrape_state, todo, source="DemandStar"):
+        e = future.exception()
+        if e is not None:
+            log.error(f"  DemandStar {abbrev}: failed — {e}")
+            cp.fail(abbrev)
+            continue
+        state_rfps = future.result()
+        cp.page(state_rfps, key=abbrev)
+        all_rfps.extend(state_rfps)
 
     log.info(f"DemandStar total: {len(all_rfps)} solicitations across 50 states")
     return all_rfps
@@ -81,6 +77,7 @@ def _scrape_state(context, slug: str, abbrev: str) -> list[dict]:
 
     try:
         url = f"https://www.demandstar.com/app/browse-bids/states/{slug}"
+        ratelimit.wait(url)
         page.goto(url, timeout=PLAYWRIGHT_TIMEOUT, wait_until="domcontentloaded")
 
         # DemandStar is a React SPA — wait for bid content to render
@@ -94,26 +91,48 @@ def _scrape_state(context, slug: str, abbrev: str) -> list[dict]:
             log.info(f"  DemandStar {abbrev}: no bid content loaded")
             return rfps
 
-        time.sleep(2)
+        browser.settle(page)
 
         page_num = 1
         while page_num <= DEMANDSTAR_MAX_PAGES:
             # Try multiple selectors for bid rows/cards
-            rows = (
-                page.query_selector_all("[class*='bid-row'], [class*='bid-card']") or
-                page.query_selector_all("[class*='BidRow'], [class*='BidCard']") or
-                page.query_selector_all("table tbody tr") or
-                page.query_selector_all("[class*='result-item'], [class*='listing-item']")
+            rows = browser.extract(
+                page,
+                ["[class*='bid-row'], [class*='bid-card']",
+                 "[class*='BidRow'], [class*='BidCard']",
+                 "table tbody tr",
+                 "[class*='result-item'], [class*='listing-item']"],
+                {
+                    "title": ["h3, h4, [class*='title'], [class*='Title'], "
+                              "[class*='name'], [class*='Name']", "a"],
+                    "href": ("a[href]", "href"),
+                    "agency": "[class*='agency'], [class*='Agency'], "
+                              "[class*='organization'], [class*='Organization'], "
+                              "[class*='entity'], [class*='Entity']",
+                    "close_date": "[class*='close'], [class*='Close'], "
+                                  "[class*='deadline'], [class*='Deadline'], "
+                                  "[class*='due'], [class*='Due'], [class*='end'], [class*='End']",
+                    "posted_date": "[class*='post'], [class*='Post'], "
+                                   "[class*='publish'], [class*='Publish'], "
+                                   "[class*='start'], [class*='Start']",
+                    "amount": "[class*='amount'], [class*='Amount'], "
+                              "[class*='value'], [class*='Value'], "
+                              "[class*='budget'], [class*='Budget'], "
+                              "[class*='price'], [class*='Price'], "
+                              "[class*='cost'], [class*='Cost']",
+                },
             )
 
             if not rows:
                 # Fallback: link-based extraction
-                links = page.query_selector_all(
-                    "a[href*='/bid/'], a[href*='/bids/'], a[href*='/solicitation']"
+                links = browser.extract(
+                    page,
+                    "a[href*='/bid/'], a[href*='/bids/'], a[href*='/solicitation']",
+                    {"href": (None, "href")},
                 )
                 for link in links:
-                    href = link.get_attribute("href") or ""
-                    text = link.inner_text().strip()
+                    href = link["href"]
+                    text = link["text"]
                     if text and len(text) > 10:
                         parts = href.rstrip("/").split("/")
                         sol_id = parts[-1] if parts else ""
@@ -134,69 +153,27 @@ def _scrape_state(context, slug: str, abbrev: str) -> list[dict]:
                 break
 
             for row in rows:
-                try:
-                    title_el = (
-                        row.query_selector(
-                            "h3, h4, [class*='title'], [class*='Title'], "
-                            "[class*='name'], [class*='Name']"
-                        ) or row.query_selector("a")
-                    )
-                    title = title_el.inner_text().strip() if title_el else ""
-
-                    link_el = row.query_selector("a[href]")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    agency_el = row.query_selector(
-                        "[class*='agency'], [class*='Agency'], "
-                        "[class*='organization'], [class*='Organization'], "
-                        "[class*='entity'], [class*='Entity']"
-                    )
-                    agency = agency_el.inner_text().strip() if agency_el else ""
-
-                    date_el = row.query_selector(
-                        "[class*='close'], [class*='Close'], "
-                        "[class*='deadline'], [class*='Deadline'], "
-                        "[class*='due'], [class*='Due'], [class*='end'], [class*='End']"
-                    )
-                    close_date = date_el.inner_text().strip() if date_el else ""
-
-                    posted_el = row.query_selector(
-                        "[class*='post'], [class*='Post'], "
-                        "[class*='publish'], [class*='Publish'], "
-                        "[class*='start'], [class*='Start']"
-                    )
-                    posted_date = posted_el.inner_text().strip() if posted_el else ""
-
-                    amount_el = row.query_selector(
-                        "[class*='amount'], [class*='Amount'], "
-                        "[class*='value'], [class*='Value'], "
-                        "[class*='budget'], [class*='Budget'], "
-                        "[class*='price'], [class*='Price'], "
-                        "[class*='cost'], [class*='Cost']"
-                    )
-                    amount = amount_el.inner_text().strip() if amount_el else ""
-
-                    parts = (href or "").rstrip("/").split("/")
-                    sol_id = parts[-1] if parts else ""
-
-                    if title:
-                        rfps.append({
-                            "state": abbrev,
-                            "source": "DemandStar",
-                            "id": sol_id,
-                            "title": title,
-                            "agency": agency,
-                            "status": "Open",
-                            "posted_date": posted_date,
-                            "close_date": close_date,
-                            "url": (href if href and href.startswith("http")
-                                    else f"https://www.demandstar.com{href}"
-                                    if href else ""),
-                            "description": title,
-                            "amount": amount,
-                        })
-                except Exception:
-                    continue
+                title = row["title"]
+                href = row["href"]
+                parts = href.rstrip("/").split("/")
+                sol_id = parts[-1] if parts else ""
+
+                if title:
+                    rfps.append({
+                        "state": abbrev,
+                        "source": "DemandStar",
+                        "id": sol_id,
+                        "title": title,
+                        "agency": row["agency"],
+                        "status": "Open",
+                        "posted_date": row["posted_date"],
+                        "close_date": row["close_date"],
+                        "url": (href if href.startswith("http")
+                                else f"https://www.demandstar.com{href}"
+                                if href else ""),
+                        "description": title,
+                        "amount": row["amount"],
+                    })
 
             # Try next page
             next_btn = (
@@ -210,8 +187,11 @@ def _scrape_state(context, slug: str, abbrev: str) -> list[dict]:
 
             if next_btn:
                 try:
+                    ratelimit.wait(page.url)
+                    before = browser.results_signature(page, _ROWS)
                     next_btn.click(timeout=10000, no_wait_after=True)
-                    time.sleep(3)
+                    if not browser.wait_for_results_change(page, _ROWS, before):
+                        break
                     page_num += 1
                 except Exception:
                     break
@@ -223,6 +203,7 @@ def _scrape_state(context, slug: str, abbrev: str) -> list[dict]:
 
     except Exception as e:
         log.error(f"  DemandStar {abbrev}: scrape failed — {e}")
+        checkpoint.current().fail(abbrev)
     finally:
         page.close()
 
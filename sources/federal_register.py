@@ -5,12 +5,10 @@ Queries the Federal Register API for recent NOFOs, grant programs, and
 cooperative agreements. No authentication required.
 """
 
-import time
-from datetime import datetime, timedelta
-
 import requests
 
-from config import FED_REGISTER_LOOKBACK_DAYS, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import FED_REGISTER_LOOKBACK_DAYS, log
+from sources import checkpoint, http_client, watermark
 
 _SEARCH_TERMS = [
     "funding opportunity",
@@ -28,7 +26,7 @@ def scrape_federal_register() -> list[dict]:
     rfps: list[dict] = []
     seen_ids: set[str] = set()
 
-    cutoff = (datetime.now() - timedelta(days=FED_REGISTER_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    cutoff = watermark.since("federal_register", FED_REGISTER_LOOKBACK_DAYS).strftime("%Y-%m-%d")
 
     for term in _SEARCH_TERMS:
         try:
@@ -48,10 +46,9 @@ def scrape_federal_register() -> list[dict]:
                 ("fields[]", "html_url"),
                 ("fields[]", "action"),
             ]
-            resp = requests.get(
+            resp = http_client.get(
                 "https://www.federalregister.gov/api/v1/articles.json",
                 params=params,
-                timeout=REQUEST_TIMEOUT,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -78,10 +75,9 @@ def scrape_federal_register() -> list[dict]:
                     "description": (doc.get("abstract", "") or "")[:500],
                     "amount": "",
                 })
-
-            time.sleep(POLITE_DELAY)
         except requests.RequestException as e:
             log.error(f"Federal Register query failed for '{term}': {e}")
+            checkpoint.current().fail()
             continue
 
     log.info(f"Federal Register total: {len(rfps)} funding notices")
@@ -6,13 +6,28 @@ No authentication required.
 
 Unlike the team scraper (which uses 9 keyword clusters), this uses broad
 queries to capture the full population of recent postings for research.
+
+The broad queries overlap heavily, so they run concurrently and share one
+set of claimed opportunity IDs: each ID is parsed (and detailed) only by
+the first query whose page returns it.  Search hits carry only summary
+fields.  With GRANTS_DETAILS=true (off by default) the full synopsis is
+fetched from fetchOpportunity for IDs not already in the seen store, one
+extra request per new ID.  The synopsis replaces the description, so it
+changes which keywords those rows match.
 """
 
-import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from bs4 import BeautifulSoup
+
+from config import GRANTS_ROWS_PER_QUERY, GRANTS_DETAILS, HISTORICAL_MODE, log
+from sources import async_http, checkpoint, http_client, pagination
 
-from config import GRANTS_ROWS_PER_QUERY, HISTORICAL_MODE, REQUEST_TIMEOUT, POLITE_DELAY, log
+_SEARCH_URL = "https://api.grants.gov/v1/api/search2"
+_DETAIL_URL = "https://api.grants.gov/v1/api/fetchOpportunity"
 
 # Broad query terms — designed to pull a wide cross-section of grants
 # without pre-filtering to specific research topics.
@@ -23,85 +38,243 @@ _BROAD_QUERIES = [
 ]
 
 
+def _search_body(query: str, start_record: int) -> dict:
+    return {
+        "keyword": query,
+        "oppStatuses": "posted|closed|archived" if HISTORICAL_MODE else "posted",
+        "rows": GRANTS_ROWS_PER_QUERY,
+        "startRecordNum": start_record,
+    }
+
+
+def _extract_hits(data) -> tuple[list[dict], int]:
+    """Return (hits, total_count) from any of the response shapes we've seen."""
+    hits = []
+    total_count = 0
+    if "data" in data and isinstance(data["data"], dict):
+        hits = data["data"].get("oppHits", [])
+        total_count = data["data"].get("hitCount", data["data"].get("totalCount", 0))
+    elif "oppHits" in data:
+        hits = data["oppHits"]
+    elif isinstance(data, list):
+        hits = data
+    return hits, total_count
+
+
+def _hit_id(hit: dict) -> str:
+    return str(hit.get("id", hit.get("number", hit.get("oppNumber", ""))))
+
+
+def _parse_hit(hit: dict) -> dict:
+    opp_id = _hit_id(hit)
+
+    # Extract funding amount
+    amount = ""
+    for amt_key in ("awardCeiling", "estimatedTotalProgramFunding",
+                    "awardFloor", "totalFundingAmount",
+                    "estimatedFunding", "ceiling", "amount"):
+        val = hit.get(amt_key)
+        if val:
+            amount = str(val)
+            break
+
+    return {
+        "state": "Federal",
+        "source": "Grants.gov",
+        "id": opp_id,
+        "title": hit.get("title", hit.get("oppTitle", "")),
+        "agency": hit.get("agency", hit.get("agencyName", "")),
+        "status": hit.get("oppStatus", "Posted"),
+        "posted_date": hit.get("openDate", hit.get("postDate", "")),
+        "close_date": hit.get("closeDate", hit.get("deadline", "")),
+        "url": f"https://www.grants.gov/search-results-detail/{opp_id}" if opp_id else "",
+        "description": (hit.get("description", hit.get("synopsis", hit.get("title", ""))) or "")[:1000],
+        "amount": amount,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Cross-query dedup and opportunity details
+# ---------------------------------------------------------------------------
+
+
+class _Claims:
+    """Opportunity IDs already taken by some query this run (thread-safe)."""
+
+    def __init__(self):
+        self._ids: set[str] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, hits: list[dict]) -> list[dict]:
+        """The hits whose IDs no query has claimed yet, now claimed."""
+        new = []
+        with self._lock:
+            for hit in hits:
+                opp_id = _hit_id(hit)
+                if opp_id not in self._ids:
+                    self._ids.add(opp_id)
+                    new.append(hit)
+        return new
+
+
+def _fetch_detail(opp_id: str) -> dict | None:
+    """fetchOpportunity's record for `opp_id`, or None if it can't be had."""
+    try:
+        resp = http_client.post(
+            _DETAIL_URL,
+            json={"opportunityId": int(opp_id)},
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        data = resp.json().get("data")
+    except (requests.RequestException, ValueError) as e:
+        log.debug(f"Grants.gov detail for {opp_id} unavailable: {e}")
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _apply_detail(rfp: dict, detail: dict):
+    """Fill `rfp`'s description and amount from a fetchOpportunity record."""
+    synopsis = detail.get("synopsis") or {}
+    desc = synopsis.get("synopsisDesc") or ""
+    if desc:
+        text = BeautifulSoup(desc, "html.parser").get_text(" ", strip=True)
+        rfp["description"] = text[:1000]
+    if not rfp["amount"]:
+        for amt_key in ("awardCeiling", "estimatedFunding", "awardFloor"):
+            val = synopsis.get(amt_key)
+            if val:
+                rfp["amount"] = str(val)
+                break
+
+
+def _records(hits: list[dict]) -> list[dict]:
+    """Parse claimed hits, detailing the ones earlier runs haven't stored."""
+    rfps = []
+    detailed = 0
+    for hit in hits:
+        rfp = _parse_hit(hit)
+        if (GRANTS_DETAILS and rfp["id"].isdigit()
+                and not pagination.already_seen(rfp)):
+            detail = _fetch_detail(rfp["id"])
+            if detail is not None:
+                _apply_detail(rfp, detail)
+                detailed += 1
+        rfps.append(rfp)
+    if detailed:
+        log.info(f"  Grants.gov: fetched details for {detailed} new opportunities")
+    return rfps
+
+
+# ---------------------------------------------------------------------------
+# Search queries
+# ---------------------------------------------------------------------------
+
+
+def _query_records(query: str, claims: _Claims) -> tuple[list[dict], bool]:
+    """Records for one query's unclaimed hits, and whether every page loaded."""
+    rfps: list[dict] = []
+    fetched = 0
+    start_record = 0
+
+    while True:
+        try:
+            resp = http_client.post(
+                _SEARCH_URL,
+                json=_search_body(query, start_record),
+                headers={"Content-Type": "application/json"},
+            )
+            resp.raise_for_status()
+            hits, total_count = _extract_hits(resp.json())
+
+            if not hits:
+                break
+            fetched += len(hits)
+            new = claims.claim(hits)
+            rfps.extend(_records(new))
+
+            log.info(f"  Grants.gov query '{query[:50]}...': {len(hits)} hits, {len(new)} new (total: {total_count}, fetched: {fetched})")
+
+            start_record += GRANTS_ROWS_PER_QUERY
+            if not HISTORICAL_MODE or start_record >= total_count:
+                break
+
+        except requests.RequestException as e:
+            log.error(f"Grants.gov query failed: {e}")
+            return rfps, False
+
+    return rfps, True
+
+
+async def _query_hits_async(client: "async_http.AsyncClient",
+                            query: str) -> tuple[list[dict], bool]:
+    """All hits for one query, with later pages fetched concurrently."""
+
+    async def fetch(start_record: int) -> tuple[list[dict], int]:
+        resp = await client.post(
+            _SEARCH_URL,
+            json=_search_body(query, start_record),
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        return _extract_hits(resp.json())
+
+    try:
+        hits_all, total_count = await fetch(0)
+    except async_http.ERRORS as e:
+        log.error(f"Grants.gov query failed: {e}")
+        return [], False
+
+    complete = True
+    if HISTORICAL_MODE and hits_all:
+        pages = await asyncio.gather(
+            *(fetch(start) for start in range(GRANTS_ROWS_PER_QUERY, total_count,
+                                               GRANTS_ROWS_PER_QUERY)),
+            return_exceptions=True,
+        )
+        for page in pages:
+            if isinstance(page, Exception):
+                log.error(f"Grants.gov query failed: {page}")
+                complete = False
+            else:
+                hits_all.extend(page[0])
+
+    log.info(f"  Grants.gov query '{query[:50]}...': {len(hits_all)} hits (total: {total_count})")
+    return hits_all, complete
+
+
+async def _all_queries_async(queries: list[str]) -> list[tuple[list[dict], bool]]:
+    async with async_http.AsyncClient() as client:
+        return await asyncio.gather(*(_query_hits_async(client, q) for q in queries))
+
+
 def scrape_grants_gov() -> list[dict]:
     log.info("Querying Grants.gov API...")
     rfps: list[dict] = []
-    seen_ids: set[str] = set()
-
-    opp_statuses = "posted|closed|archived" if HISTORICAL_MODE else "posted"
-
-    for query in _BROAD_QUERIES:
-        start_record = 0
-
-        while True:
-            try:
-                resp = requests.post(
-                    "https://api.grants.gov/v1/api/search2",
-                    json={
-                        "keyword": query,
-                        "oppStatuses": opp_statuses,
-                        "rows": GRANTS_ROWS_PER_QUERY,
-                        "startRecordNum": start_record,
-                    },
-                    headers={"Content-Type": "application/json"},
-                    timeout=REQUEST_TIMEOUT,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-
-                hits = []
-                total_count = 0
-                if "data" in data and isinstance(data["data"], dict):
-                    hits = data["data"].get("oppHits", [])
-                    total_count = data["data"].get("hitCount", data["data"].get("totalCount", 0))
-                elif "oppHits" in data:
-                    hits = data["oppHits"]
-                elif isinstance(data, list):
-                    hits = data
-
-                if not hits:
-                    break
-
-                for hit in hits:
-                    opp_id = str(hit.get("id", hit.get("number", hit.get("oppNumber", ""))))
-                    if opp_id in seen_ids:
-                        continue
-                    seen_ids.add(opp_id)
-
-                    # Extract funding amount
-                    amount = ""
-                    for amt_key in ("awardCeiling", "estimatedTotalProgramFunding",
-                                    "awardFloor", "totalFundingAmount",
-                                    "estimatedFunding", "ceiling", "amount"):
-                        val = hit.get(amt_key)
-                        if val:
-                            amount = str(val)
-                            break
-
-                    rfps.append({
-                        "state": "Federal",
-                        "source": "Grants.gov",
-                        "id": opp_id,
-                        "title": hit.get("title", hit.get("oppTitle", "")),
-                        "agency": hit.get("agency", hit.get("agencyName", "")),
-                        "status": hit.get("oppStatus", "Posted"),
-                        "posted_date": hit.get("openDate", hit.get("postDate", "")),
-                        "close_date": hit.get("closeDate", hit.get("deadline", "")),
-                        "url": f"https://www.grants.gov/search-results-detail/{opp_id}" if opp_id else "",
-                        "description": (hit.get("description", hit.get("synopsis", hit.get("title", ""))) or "")[:1000],
-                        "amount": amount,
-                    })
-
-                log.info(f"  Grants.gov query '{query[:50]}...': {len(hits)} hits (total: {total_count}, fetched: {len(rfps)})")
-
-                start_record += GRANTS_ROWS_PER_QUERY
-                if not HISTORICAL_MODE or start_record >= total_count:
-                    break
-                time.sleep(POLITE_DELAY)
-
-            except requests.RequestException as e:
-                log.error(f"Grants.gov query failed: {e}")
-                break
+    cp = checkpoint.current()
+    queries = [q for q in _BROAD_QUERIES if not cp.completed(q)]
+    claims = _Claims()
+
+    pool = None
+    try:
+        if async_http.enabled():
+            per_query = [(_records(claims.claim(hits)), complete) for hits, complete
+                         in async_http.run(_all_queries_async(queries))]
+        else:
+            pool = ThreadPoolExecutor(max_workers=max(1, len(queries)),
+                                      thread_name_prefix="grants")
+            per_query = pool.map(lambda q: _query_records(q, claims), queries)
+
+        # Checkpoint from this thread, in query order
+        for query, (query_rfps, complete) in zip(queries, per_query):
+            rfps.extend(query_rfps)
+            if complete:
+                cp.page(query_rfps, key=query)
+            else:
+                cp.fail()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     log.info(f"Grants.gov: {len(rfps)} federal grant opportunities")
     return rfps
@@ -0,0 +1,141 @@
+"""
+Conditional-GET cache for HTML listing pages.
+
+Pages that rarely change (Texas ESBD and NYSCR listings, static state
+portals) are fetched with If-None-Match / If-Modified-Since built from the
+ETag and Last-Modified the server sent last time.  On a 304 the records
+parsed from that page last time are returned as-is, so an unchanged page
+costs one empty response and no parsing.
+
+Each URL's validators, compressed body and parsed records live in a SQLite
+table at HTTP_CACHE_DB.  Entries not revalidated for HTTP_CACHE_TTL_DAYS
+are pruned.  Set HTTP_CACHE=false to always fetch and parse in full.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import requests
+
+from config import HTTP_CACHE, HTTP_CACHE_DB, HTTP_CACHE_TTL_DAYS, log
+from sources import http_client
+
+
+class _Store:
+    """SQLite table of cached pages, keyed by full request URL."""
+
+    def __init__(self, path=HTTP_CACHE_DB):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " body BLOB,"
+            " version TEXT,"
+            " records TEXT,"
+            " checked TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        cutoff = (datetime.now() - timedelta(days=HTTP_CACHE_TTL_DAYS)).isoformat()
+        self._conn.execute("DELETE FROM pages WHERE checked < ?", (cutoff,))
+
+    def get(self, url: str) -> tuple | None:
+        """(etag, last_modified, body, version, records) for `url`, if cached."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, body, version, records"
+                " FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+
+    def put(self, url: str, etag: str, last_modified: str, body: bytes,
+            version: str, records: list[dict]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, zlib.compress(body), version,
+                 json.dumps(records, default=str), datetime.now().isoformat()),
+            )
+
+    def touch(self, url: str, version: str, records: list[dict] | None = None):
+        """Mark `url` revalidated, replacing its records if re-parsed."""
+        with self._lock:
+            if records is None:
+                self._conn.execute(
+                    "UPDATE pages SET checked = ? WHERE url = ?",
+                    (datetime.now().isoformat(), url),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE pages SET checked = ?, version = ?, records = ?"
+                    " WHERE url = ?",
+                    (datetime.now().isoformat(), version,
+                     json.dumps(records, default=str), url),
+                )
+
+
+_store: _Store | None = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> _Store:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _Store()
+    return _store
+
+
+def get_records(url: str, parse: Callable[[str], list[dict]], *,
+                params: dict | None = None, headers: dict | None = None,
+                version: str = "1") -> list[dict]:
+    """GET `url` conditionally and return parse(page_text).
+
+    On a 304 the records cached for this URL are returned without parsing.
+    Bump `version` when `parse` changes: cached records from another
+    version are re-parsed from the stored body instead of being reused.
+    Errors surface as requests.RequestException, like http_client.get().
+    """
+    if not HTTP_CACHE:
+        resp = http_client.get(url, params=params, headers=headers)
+        resp.raise_for_status()
+        return parse(resp.text)
+
+    key = requests.Request("GET", url, params=params).prepare().url
+    store = _get_store()
+    cached = store.get(key)
+
+    conditional = dict(headers or {})
+    if cached is not None:
+        etag, last_modified = cached[0], cached[1]
+        if etag:
+            conditional["If-None-Match"] = etag
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+
+    resp = http_client.get(url, params=params, headers=conditional)
+    if resp.status_code == 304 and cached is not None:
+        _, _, body, cached_version, records = cached
+        if cached_version == version:
+            store.touch(key, version)
+            log.debug(f"HTTP cache: {key} not modified")
+            return json.loads(records)
+        records = parse(zlib.decompress(body).decode("utf-8"))
+        store.touch(key, version, records)
+        return records
+
+    resp.raise_for_status()
+    records = parse(resp.text)
+    etag = resp.headers.get("ETag", "")
+    last_modified = resp.headers.get("Last-Modified", "")
+    if etag or last_modified:
+        store.put(key, etag, last_modified, resp.text.encode("utf-8"), version, records)
+    return records
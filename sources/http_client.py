@@ -0,0 +1,94 @@
+"""
+Shared HTTP client for all requests-based sources.
+
+One process-wide requests.Session whose adapter keeps a pool of keep-alive
+connections per host, so paginated sources reuse a warm TCP+TLS connection
+instead of opening a new one for every page.  Transient failures (429 and
+5xx, connection resets) are retried by urllib3 with exponential backoff plus
+jitter, and a server's Retry-After header takes precedence over the backoff.
+No single wait exceeds HTTP_MAX_WAIT, so one server cannot stall a source.
+
+Every request is paced by the per-host token bucket in ratelimit, so
+sources no longer sleep between pages themselves.
+
+Sources call http_client.get()/post() exactly like requests.get()/post();
+errors still surface as requests.RequestException after retries run out.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (REQUEST_TIMEOUT, HTTP_POOL_SIZE, HTTP_MAX_RETRIES,
+                    HTTP_BACKOFF, HTTP_MAX_WAIT, log)
+from sources import ratelimit
+
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+class _CappedRetry(Retry):
+    """Retry that waits no longer than HTTP_MAX_WAIT, even for Retry-After."""
+
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_MAX_WAIT)
+
+
+def _build_session() -> requests.Session:
+    retry = _CappedRetry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF,     # first retry at once, then 2s, 4s, ... (urllib3 2.x)
+        backoff_jitter=HTTP_BACKOFF,     # + up to this many random seconds
+        backoff_max=HTTP_MAX_WAIT,       # nor any backoff wait longer than this
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=None,            # the POST endpoints are searches
+        respect_retry_after_header=True,
+        raise_on_status=False,           # hand the last response back
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,  # hosts kept in the pool
+        pool_maxsize=HTTP_POOL_SIZE,      # connections kept per host
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return session
+
+
+def get_session() -> requests.Session:
+    """The shared session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                log.debug("HTTP client: shared session created")
+    return _session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session (default REQUEST_TIMEOUT)."""
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    ratelimit.wait(url)
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -5,9 +5,8 @@ JAGGAER (formerly SciQuest) powers eProcurement for several US states.
 Public bid events are accessible via the /PublicEvent endpoint.
 """
 
-import time
-
-from config import PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from config import PLAYWRIGHT_TIMEOUT, log
+from sources import browser, checkpoint, ratelimit
 
 # ---------------------------------------------------------------------------
 # JAGGAER portal configurations
@@ -54,45 +53,39 @@ JAGGAER_PORTALS = [
 
 JAGGAER_MAX_PAGES = 10
 
+# Event rows, for detecting when the next page has rendered
+_ROWS = "table tbody tr, .event-list-item, .event-row, tr.odd, tr.even"
+
 
 def scrape_jaggaer() -> list[dict]:
     """Scrape open solicitations from all JAGGAER portals."""
     log.info(f"Scraping {len(JAGGAER_PORTALS)} JAGGAER/SciQuest state portals...")
 
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_all_portals()
-    except ImportError:
+    if not browser.available():
         log.warning(
             "Playwright not installed — skipping JAGGAER portals. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
         return []
+    return _scrape_all_portals()
 
 
 def _scrape_all_portals() -> list[dict]:
-    from playwright.sync_api import sync_playwright
-
     all_rfps: list[dict] = []
+    cp = checkpoint.current()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        for portal in JAGGAER_PORTALS:
-            try:
-                rfps = _scrape_one_portal(context, portal)
-                all_rfps.extend(rfps)
-            except Exception as e:
-                log.error(f"  {portal['label']}: failed — {e}")
+    todo = [(portal,) for portal in JAGGAER_PORTALS if not cp.completed(portal["label"])]
 
-            time.sleep(POLITE_DELAY)
-
-        browser.close()
+    pool = browser.get_pool()
+    for (portal,), future in pool.map(_scrape_one_portal, todo, source="JAGGAER"):
+        e = future.exception()
+        if e is not None:
+            log.error(f"  {portal['label']}: failed — {e}")
+            cp.fail(portal["label"])
+            continue
+        rfps = future.result()
+        cp.page(rfps, key=portal["label"])
+        all_rfps.extend(rfps)
 
     log.info(
         f"JAGGAER total: {len(all_rfps)} solicitations "
@@ -111,6 +104,7 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
     page = context.new_page()
 
     try:
+        ratelimit.wait(url)
         page.goto(url, timeout=PLAYWRIGHT_TIMEOUT,
                   wait_until="domcontentloaded")
 
@@ -125,25 +119,27 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
             log.info(f"  {label}: page did not load expected selectors")
             return rfps
 
-        time.sleep(3)
+        browser.settle(page)
 
         page_num = 1
         while page_num <= JAGGAER_MAX_PAGES:
             # JAGGAER public event pages show event tables
-            rows = (
-                page.query_selector_all("table tbody tr") or
-                page.query_selector_all(".event-list-item, .event-row") or
-                page.query_selector_all("tr.odd, tr.even")
+            rows = browser.extract(
+                page,
+                ["table tbody tr", ".event-list-item, .event-row", "tr.odd, tr.even"],
+                {"link_text": "a[href]", "href": ("a[href]", "href")},
             )
 
             if not rows:
                 # Fallback: extract any links that look like events
-                links = page.query_selector_all(
-                    "a[href*='Event'], a[href*='event'], a[href*='PublicEvent']"
+                links = browser.extract(
+                    page,
+                    "a[href*='Event'], a[href*='event'], a[href*='PublicEvent']",
+                    {"href": (None, "href")},
                 )
                 for link in links:
-                    href = link.get_attribute("href") or ""
-                    text = link.inner_text().strip()
+                    href = link["href"]
+                    text = link["text"]
                     if text and len(text) > 10:
                         rfps.append({
                             "state": state,
@@ -162,70 +158,55 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
                 break
 
             for row in rows:
-                try:
-                    cells = row.query_selector_all("td")
-                    if not cells or len(cells) < 2:
-                        continue
-
-                    link_el = row.query_selector("a[href]")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    # Event ID
-                    event_id = cells[0].inner_text().strip() if cells else ""
-                    if not event_id and href:
-                        event_id = _extract_event_id(href)
-
-                    # Title
-                    title = ""
-                    if link_el:
-                        title = link_el.inner_text().strip()
-                    if not title and len(cells) > 1:
-                        title = cells[1].inner_text().strip()
-
-                    # Agency
-                    agency = ""
-                    for i in range(2, min(len(cells), 5)):
-                        ct = cells[i].inner_text().strip()
-                        if ct and not _looks_like_date(ct) and len(ct) > 3:
-                            agency = ct
-                            break
-
-                    # Dates — collect all date-like cells
-                    date_cells = []
-                    for i in range(2, len(cells)):
-                        ct = cells[i].inner_text().strip()
-                        if _looks_like_date(ct):
-                            date_cells.append(ct)
-
-                    posted_date = date_cells[0] if len(date_cells) > 1 else ""
-                    close_date = date_cells[-1] if date_cells else ""
-
-                    # Amount — look for dollar-like values
-                    amount = ""
-                    for i in range(2, len(cells)):
-                        ct = cells[i].inner_text().strip()
-                        if _looks_like_amount(ct):
-                            amount = ct
-                            break
-
-                    if title:
-                        rfps.append({
-                            "state": state,
-                            "source": label,
-                            "id": event_id,
-                            "title": title,
-                            "agency": agency,
-                            "status": "Open",
-                            "posted_date": posted_date,
-                            "close_date": close_date,
-                            "url": href if href and href.startswith("http")
-                                   else "",
-                            "description": title,
-                            "amount": amount,
-                        })
-                except Exception:
+                cells = row["cells"]
+                if len(cells) < 2:
                     continue
 
+                href = row["href"]
+
+                # Event ID
+                event_id = cells[0]
+                if not event_id and href:
+                    event_id = _extract_event_id(href)
+
+                # Title
+                title = row["link_text"] or cells[1]
+
+                # Agency
+                agency = ""
+                for ct in cells[2:5]:
+                    if ct and not _looks_like_date(ct) and len(ct) > 3:
+                        agency = ct
+                        break
+
+                # Dates — collect all date-like cells
+                date_cells = [ct for ct in cells[2:] if _looks_like_date(ct)]
+
+                posted_date = date_cells[0] if len(date_cells) > 1 else ""
+                close_date = date_cells[-1] if date_cells else ""
+
+                # Amount — look for dollar-like values
+                amount = ""
+                for ct in cells[2:]:
+                    if _looks_like_amount(ct):
+                        amount = ct
+                        break
+
+                if title:
+                    rfps.append({
+                        "state": state,
+                        "source": label,
+                        "id": event_id,
+                        "title": title,
+                        "agency": agency,
+                        "status": "Open",
+                        "posted_date": posted_date,
+                        "close_date": close_date,
+                        "url": href if href.startswith("http") else "",
+                        "description": title,
+                        "amount": amount,
+                    })
+
             # Pagination
             next_btn = (
                 page.query_selector("a.next, .next a, a[aria-label='Next']") or
@@ -234,8 +215,11 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
 
             if next_btn and next_btn.is_visible():
                 try:
+                    ratelimit.wait(page.url)
+                    before = browser.results_signature(page, _ROWS)
                     next_btn.click()
-                    time.sleep(3)
+                    if not browser.wait_for_results_change(page, _ROWS, before):
+                        break
                     page_num += 1
                 except Exception:
                     break
@@ -247,6 +231,7 @@ def _scrape_one_portal(context, portal: dict) -> list[dict]:
 
     except Exception as e:
         log.error(f"  {label}: scrape failed — {e}")
+        checkpoint.current().fail(label)
     finally:
         page.close()
 
@@ -6,172 +6,171 @@ grid via client-side JavaScript. Requires Playwright for full data.
 Falls back to a requests-based scraper with limited results.
 """
 
-import time
-
 import requests
 from bs4 import BeautifulSoup
 
-from config import NC_EVP_MAX_PAGES, REQUEST_TIMEOUT, PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from config import NC_EVP_MAX_PAGES, PLAYWRIGHT_TIMEOUT, log
+from sources import browser, checkpoint, http_client, pagination, ratelimit
+
+_ROWS = "table.table tbody tr"
 
 
 def scrape_nc_evp() -> list[dict]:
     log.info("Scraping North Carolina eVP...")
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_nc_evp_playwright()
-    except ImportError:
+    if not browser.available():
         log.warning(
             "Playwright not installed — falling back to requests-based NC scraper. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
         return _scrape_nc_evp_requests()
+    return _scrape_nc_evp_playwright()
 
 
 def _scrape_nc_evp_playwright() -> list[dict]:
-    from playwright.sync_api import sync_playwright
-
-    rfps: list[dict] = []
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = context.new_page()
-
-        try:
-            page.goto("https://evp.nc.gov/solicitations/", timeout=PLAYWRIGHT_TIMEOUT)
-            page.wait_for_selector(
-                "table.table tbody tr, .view-empty.message:not(.hidden)",
-                timeout=30000,
-            )
-            time.sleep(3)
-
-            page_num = 1
-            while page_num <= NC_EVP_MAX_PAGES:
-                rows = page.query_selector_all("table.table tbody tr")
-                if not rows:
-                    log.info(f"  NC eVP page {page_num}: no rows found")
-                    break
-
-                for row in rows:
-                    cells = row.query_selector_all("td")
-                    if not cells:
-                        continue
-
-                    cell_texts = [c.inner_text().strip() for c in cells]
-                    link_el = row.query_selector("a")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    # Columns: 0=Sol Number, 1=Title, 2=Description,
-                    #          3=Opening Date, 4=Posted Date, 5=Status, 6=Department
-                    # Check for amount in extra columns (index 7+)
-                    amount = ""
-                    for i in range(7, len(cell_texts)):
-                        val = cell_texts[i]
-                        if val and ("$" in val or val.replace(",", "").replace(".", "").isdigit()):
-                            amount = val
-                            break
-
-                    rfps.append({
-                        "state": "NC",
-                        "source": "NC eVP",
-                        "id": cell_texts[0] if len(cell_texts) > 0 else "",
-                        "title": cell_texts[1] if len(cell_texts) > 1 else "",
-                        "agency": cell_texts[6] if len(cell_texts) > 6 else "",
-                        "status": cell_texts[5] if len(cell_texts) > 5 else "",
-                        "posted_date": cell_texts[4] if len(cell_texts) > 4 else "",
-                        "close_date": cell_texts[3] if len(cell_texts) > 3 else "",
-                        "url": (f"https://evp.nc.gov{href}" if href and href.startswith("/")
-                                else (href or "")),
-                        "description": cell_texts[2] if len(cell_texts) > 2 else "",
-                        "amount": amount,
-                    })
+    rfps = browser.get_pool().run(_scrape_nc_evp_pages, source="NC eVP")
+    log.info(f"NC eVP total: {len(rfps)} solicitations")
+    return rfps
 
-                log.info(f"  NC eVP page {page_num}: {len(rows)} rows")
 
-                # Paginate via ">" link
-                pag_items = page.query_selector_all(".pagination li")
-                next_btn = None
-                for li in pag_items:
-                    text = li.inner_text().strip()
-                    disabled = li.get_attribute("class") or ""
-                    if text == ">" and "disabled" not in disabled:
-                        next_btn = li.query_selector("a")
-                        break
+def _next_page(page) -> bool:
+    """Click the grid's ">" link; False if there is none or nothing changed."""
+    next_btn = None
+    for li in page.query_selector_all(".pagination li"):
+        text = li.inner_text().strip()
+        disabled = li.get_attribute("class") or ""
+        if text == ">" and "disabled" not in disabled:
+            next_btn = li.query_selector("a")
+            break
+    if not next_btn:
+        return False
+
+    before = browser.results_signature(page, _ROWS)
+    ratelimit.wait(page.url)
+    next_btn.click()
+    if not browser.wait_for_results_change(page, _ROWS, before):
+        log.info("  NC eVP: grid did not refresh, stopping")
+        return False
+    return True
+
+
+def _scrape_nc_evp_pages(context) -> list[dict]:
+    """Walk the eVP solicitation grid in one pooled browser context.
+
+    The grid only pages by clicking, so a resumed run clicks past the pages
+    its checkpoint already holds before extracting again.
+    """
+    rfps: list[dict] = []
+    cp = checkpoint.current()
+    page = context.new_page()
 
-                if next_btn:
-                    old_first = ""
-                    first_row = page.query_selector("table.table tbody tr td")
-                    if first_row:
-                        old_first = first_row.inner_text().strip()
-
-                    next_btn.click()
-                    time.sleep(2)
-
-                    for _ in range(10):
-                        new_first = ""
-                        first_row = page.query_selector("table.table tbody tr td")
-                        if first_row:
-                            new_first = first_row.inner_text().strip()
-                        if new_first and new_first != old_first:
-                            break
-                        time.sleep(1)
-                    else:
-                        log.info("  NC eVP: grid did not refresh, stopping")
+    try:
+        ratelimit.wait("https://evp.nc.gov/solicitations/")
+        page.goto("https://evp.nc.gov/solicitations/", timeout=PLAYWRIGHT_TIMEOUT)
+        page.wait_for_selector(
+            "table.table tbody tr, .view-empty.message:not(.hidden)",
+            timeout=30000,
+        )
+        browser.settle(page)
+
+        seen_pages = pagination.SeenPages("NC eVP")
+        page_num = 1
+        resume = cp.cursor.get("page", 1)
+        while page_num < resume and _next_page(page):
+            page_num += 1
+        if page_num < resume:
+            # Pages past the saved ones are still unscraped; fail so a rerun retries
+            log.warning(f"NC eVP: could not page back to checkpointed page {resume} "
+                        f"(stopped at page {page_num})")
+            cp.fail()
+            return rfps
+        while page_num <= NC_EVP_MAX_PAGES:
+            page_start = len(rfps)
+            rows = browser.extract(page, _ROWS, {"href": ("a", "href")})
+            if not rows:
+                log.info(f"  NC eVP page {page_num}: no rows found")
+                break
+
+            for row in rows:
+                cell_texts = row["cells"]
+                if not cell_texts:
+                    continue
+                href = row["href"]
+
+                # Columns: 0=Sol Number, 1=Title, 2=Description,
+                #          3=Opening Date, 4=Posted Date, 5=Status, 6=Department
+                # Check for amount in extra columns (index 7+)
+                amount = ""
+                for i in range(7, len(cell_texts)):
+                    val = cell_texts[i]
+                    if val and ("$" in val or val.replace(",", "").replace(".", "").isdigit()):
+                        amount = val
                         break
 
-                    time.sleep(1)
-                    page_num += 1
-                else:
-                    break
+                rfps.append({
+                    "state": "NC",
+                    "source": "NC eVP",
+                    "id": cell_texts[0] if len(cell_texts) > 0 else "",
+                    "title": cell_texts[1] if len(cell_texts) > 1 else "",
+                    "agency": cell_texts[6] if len(cell_texts) > 6 else "",
+                    "status": cell_texts[5] if len(cell_texts) > 5 else "",
+                    "posted_date": cell_texts[4] if len(cell_texts) > 4 else "",
+                    "close_date": cell_texts[3] if len(cell_texts) > 3 else "",
+                    "url": (f"https://evp.nc.gov{href}" if href and href.startswith("/")
+                            else (href or "")),
+                    "description": cell_texts[2] if len(cell_texts) > 2 else "",
+                    "amount": amount,
+                })
+
+            log.info(f"  NC eVP page {page_num}: {len(rows)} rows")
+            cp.page(rfps[page_start:], page=page_num + 1)
+            if seen_pages.stop(rfps[page_start:]):
+                break
+            if not _next_page(page):
+                break
+            page_num += 1
+
+    except Exception as e:
+        log.error(f"NC eVP Playwright scrape failed: {e}")
+        cp.fail()
+    finally:
+        page.close()
 
-        except Exception as e:
-            log.error(f"NC eVP Playwright scrape failed: {e}")
-        finally:
-            browser.close()
-
-    log.info(f"NC eVP total: {len(rfps)} solicitations")
     return rfps
 
 
 def _scrape_nc_evp_requests() -> list[dict]:
     """Fallback: scrape NC DOA procurement page for any posted links."""
     rfps: list[dict] = []
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-    })
 
     try:
-        resp = session.get(
+        resp = http_client.get(
             "https://www.doa.nc.gov/divisions/purchase-contract",
-            timeout=REQUEST_TIMEOUT,
+            headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"},
         )
-        if resp.ok:
-            soup = BeautifulSoup(resp.text, "html.parser")
-            for a in soup.find_all("a"):
-                href = a.get("href", "")
-                text = a.get_text(strip=True)
-                if ("solicitation" in href.lower() or "solicitation" in text.lower()
-                        or "rfp" in text.lower() or "bid" in text.lower()):
-                    if len(text) > 10:
-                        rfps.append({
-                            "state": "NC",
-                            "source": "NC DOA",
-                            "id": "",
-                            "title": text,
-                            "agency": "NC Dept. of Administration",
-                            "status": "",
-                            "posted_date": "",
-                            "close_date": "",
-                            "url": href if href.startswith("http") else f"https://www.doa.nc.gov{href}",
-                            "description": "",
-                            "amount": "",
-                        })
+        resp.raise_for_status()
+        soup = BeautifulSoup(resp.text, "html.parser")
+        for a in soup.find_all("a"):
+            href = a.get("href", "")
+            text = a.get_text(strip=True)
+            if ("solicitation" in href.lower() or "solicitation" in text.lower()
+                    or "rfp" in text.lower() or "bid" in text.lower()):
+                if len(text) > 10:
+                    rfps.append({
+                        "state": "NC",
+                        "source": "NC DOA",
+                        "id": "",
+                        "title": text,
+                        "agency": "NC Dept. of Administration",
+                        "status": "",
+                        "posted_date": "",
+                        "close_date": "",
+                        "url": href if href.startswith("http") else f"https://www.doa.nc.gov{href}",
+                        "description": "",
+                        "amount": "",
+                    })
     except requests.RequestException as e:
         log.warning(f"NC DOA fallback failed: {e}")
+        checkpoint.current().fail()
 
     log.info(f"NC requests fallback: {len(rfps)} items")
     return rfps
@@ -5,12 +5,15 @@ Queries the NIH RePORTER v2 API for newly added projects matching
 health-policy-related keywords. No authentication required.
 """
 
-import time
+import asyncio
 from datetime import datetime
 
 import requests
 
-from config import REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import log
+from sources import async_http, checkpoint, http_client
+
+_SEARCH_URL = "https://api.reporter.nih.gov/v2/projects/search"
 
 _HEALTH_KEYWORDS = [
     "health policy", "opioid", "substance abuse", "public health",
@@ -20,95 +23,129 @@ _HEALTH_KEYWORDS = [
 ]
 
 
+def _search_body(kw: str) -> dict:
+    return {
+        "criteria": {
+            "advanced_text_search": {
+                "operator": "and",
+                "search_field": "projecttitle,terms",
+                "search_text": kw,
+            },
+            "fiscal_years": [datetime.now().year],
+            "newly_added_projects_only": True,
+        },
+        "offset": 0,
+        "limit": 50,
+        "sort_field": "project_start_date",
+        "sort_order": "desc",
+    }
+
+
+def _parse_project(proj: dict) -> dict:
+    proj_num = proj.get("project_num", "")
+
+    # Extract agency abbreviation
+    agency_abbr = "NIH"
+    fundings = proj.get("agency_ic_fundings") or []
+    if fundings and isinstance(fundings, list):
+        agency_abbr = fundings[0].get("abbreviation", "NIH")
+
+    # PI name(s)
+    pi_names = []
+    for pi in (proj.get("principal_investigators") or []):
+        name = pi.get("full_name") or ""
+        if not name:
+            first = pi.get("first_name", "")
+            last = pi.get("last_name", "")
+            name = f"{first} {last}".strip()
+        if name:
+            pi_names.append(name)
+    pi_name = "; ".join(pi_names[:3])  # cap at 3
+
+    # Organization / institution
+    org = proj.get("organization") or {}
+    org_name = org.get("org_name", "")
+    org_city = org.get("org_city", "")
+    org_state = org.get("org_state", "")
+    org_loc = f"{org_city}, {org_state}" if org_city else org_state
+
+    # Award amount
+    award_amount = ""
+    total_cost = proj.get("award_amount") or proj.get("total_cost")
+    if total_cost:
+        award_amount = str(total_cost)
+
+    return {
+        "state": "Federal",
+        "source": "NIH RePORTER",
+        "id": proj_num,
+        "title": proj.get("project_title", ""),
+        "agency": f"NIH / {agency_abbr}",
+        "status": "Active",
+        "posted_date": proj.get("project_start_date", ""),
+        "close_date": proj.get("project_end_date", ""),
+        "url": f"https://reporter.nih.gov/project-details/{proj_num}" if proj_num else "",
+        "description": (proj.get("abstract_text", "") or "")[:500],
+        "amount": award_amount,
+        "recipient": org_name,
+        "recipient_state": org_loc,
+        "pi_name": pi_name,
+    }
+
+
+def _query_projects(kw: str) -> list[dict]:
+    try:
+        resp = http_client.post(
+            _SEARCH_URL,
+            json=_search_body(kw),
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        return resp.json().get("results", [])
+    except requests.RequestException as e:
+        log.error(f"NIH RePORTER query failed for '{kw}': {e}")
+        checkpoint.current().fail()
+        return []
+
+
+async def _all_keywords_async() -> list[list[dict]]:
+    async with async_http.AsyncClient() as client:
+
+        async def query(kw: str) -> list[dict]:
+            try:
+                resp = await client.post(
+                    _SEARCH_URL,
+                    json=_search_body(kw),
+                    headers={"Content-Type": "application/json"},
+                )
+                resp.raise_for_status()
+                return resp.json().get("results", [])
+            except async_http.ERRORS as e:
+                log.error(f"NIH RePORTER query failed for '{kw}': {e}")
+                checkpoint.current().fail()
+                return []
+
+        return await asyncio.gather(*(query(kw) for kw in _HEALTH_KEYWORDS))
+
+
 def scrape_nih_reporter() -> list[dict]:
     """Query NIH RePORTER API for recently funded projects."""
     log.info("Querying NIH RePORTER API...")
     rfps: list[dict] = []
     seen_ids: set[str] = set()
 
-    for kw in _HEALTH_KEYWORDS:
-        try:
-            resp = requests.post(
-                "https://api.reporter.nih.gov/v2/projects/search",
-                json={
-                    "criteria": {
-                        "advanced_text_search": {
-                            "operator": "and",
-                            "search_field": "projecttitle,terms",
-                            "search_text": kw,
-                        },
-                        "fiscal_years": [datetime.now().year],
-                        "newly_added_projects_only": True,
-                    },
-                    "offset": 0,
-                    "limit": 50,
-                    "sort_field": "project_start_date",
-                    "sort_order": "desc",
-                },
-                headers={"Content-Type": "application/json"},
-                timeout=REQUEST_TIMEOUT,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            for proj in data.get("results", []):
-                proj_num = proj.get("project_num", "")
-                if proj_num in seen_ids:
-                    continue
-                seen_ids.add(proj_num)
-
-                # Extract agency abbreviation
-                agency_abbr = "NIH"
-                fundings = proj.get("agency_ic_fundings") or []
-                if fundings and isinstance(fundings, list):
-                    agency_abbr = fundings[0].get("abbreviation", "NIH")
-
-                # PI name(s)
-                pi_names = []
-                for pi in (proj.get("principal_investigators") or []):
-                    name = pi.get("full_name") or ""
-                    if not name:
-                        first = pi.get("first_name", "")
-                        last = pi.get("last_name", "")
-                        name = f"{first} {last}".strip()
-                    if name:
-                        pi_names.append(name)
-                pi_name = "; ".join(pi_names[:3])  # cap at 3
-
-                # Organization / institution
-                org = proj.get("organization") or {}
-                org_name = org.get("org_name", "")
-                org_city = org.get("org_city", "")
-                org_state = org.get("org_state", "")
-                org_loc = f"{org_city}, {org_state}" if org_city else org_state
-
-                # Award amount
-                award_amount = ""
-                total_cost = proj.get("award_amount") or proj.get("total_cost")
-                if total_cost:
-                    award_amount = str(total_cost)
-
-                rfps.append({
-                    "state": "Federal",
-                    "source": "NIH RePORTER",
-                    "id": proj_num,
-                    "title": proj.get("project_title", ""),
-                    "agency": f"NIH / {agency_abbr}",
-                    "status": "Active",
-                    "posted_date": proj.get("project_start_date", ""),
-                    "close_date": proj.get("project_end_date", ""),
-                    "url": f"https://reporter.nih.gov/project-details/{proj_num}" if proj_num else "",
-                    "description": (proj.get("abstract_text", "") or "")[:500],
-                    "amount": award_amount,
-                    "recipient": org_name,
-                    "recipient_state": org_loc,
-                    "pi_name": pi_name,
-                })
-
-            time.sleep(POLITE_DELAY)
-        except requests.RequestException as e:
-            log.error(f"NIH RePORTER query failed for '{kw}': {e}")
-            continue
+    if async_http.enabled():
+        per_keyword = async_http.run(_all_keywords_async())
+    else:
+        per_keyword = (_query_projects(kw) for kw in _HEALTH_KEYWORDS)
+
+    for projects in per_keyword:
+        for proj in projects:
+            proj_num = proj.get("project_num", "")
+            if proj_num in seen_ids:
+                continue
+            seen_ids.add(proj_num)
+            rfps.append(_parse_project(proj))
 
     log.info(f"NIH RePORTER total: {len(rfps)} active projects")
     return rfps
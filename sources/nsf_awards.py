@@ -5,12 +5,15 @@ Queries the NSF Awards API for recent awards matching policy-related
 keywords. No authentication required.
 """
 
-import time
+import asyncio
 from datetime import datetime, timedelta
 
 import requests
 
-from config import NSF_LOOKBACK_DAYS, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import NSF_LOOKBACK_DAYS, log
+from sources import async_http, checkpoint, http_client
+
+_AWARDS_URL = "https://api.nsf.gov/services/v1/awards.json"
 
 _POLICY_KEYWORDS = [
     "public policy", "public administration", "economic development",
@@ -20,68 +23,96 @@ _POLICY_KEYWORDS = [
 ]
 
 
+def _search_params(kw: str, cutoff: str) -> dict:
+    return {
+        "keyword": kw,
+        "dateStart": cutoff,
+        "printFields": "id,title,agency,startDate,expDate,estimatedTotalAmt,abstractText,piFirstName,piLastName,awardeeName,awardeeCity,awardeeStateCode",
+        "offset": 1,
+        "rpp": 100,
+    }
+
+
+def _parse_award(award: dict) -> dict:
+    award_id = award.get("id", "")
+    amount = str(award.get("estimatedTotalAmt", "")) if award.get("estimatedTotalAmt") else ""
+
+    # PI name
+    pi_first = award.get("piFirstName", "")
+    pi_last = award.get("piLastName", "")
+    pi_name = f"{pi_first} {pi_last}".strip() if (pi_first or pi_last) else ""
+
+    # Awardee location
+    awardee_city = award.get("awardeeCity", "")
+    awardee_state = award.get("awardeeStateCode", "")
+
+    return {
+        "state": "Federal",
+        "source": "NSF Awards",
+        "id": award_id,
+        "title": award.get("title", ""),
+        "agency": f"NSF — {award.get('agency', 'NSF')}",
+        "status": "Awarded",
+        "posted_date": award.get("startDate", ""),
+        "close_date": award.get("expDate", ""),
+        "url": f"https://www.nsf.gov/awardsearch/showAward?AWD_ID={award_id}" if award_id else "",
+        "description": (award.get("abstractText", "") or "")[:500],
+        "amount": amount,
+        "recipient": award.get("awardeeName", ""),
+        "recipient_state": f"{awardee_city}, {awardee_state}" if awardee_city else awardee_state,
+        "pi_name": pi_name,
+    }
+
+
+def _query_awards(kw: str, cutoff: str) -> list[dict]:
+    try:
+        resp = http_client.get(_AWARDS_URL, params=_search_params(kw, cutoff))
+        resp.raise_for_status()
+        return resp.json().get("response", {}).get("award", [])
+    except requests.RequestException as e:
+        log.error(f"NSF Awards query failed for '{kw}': {e}")
+        checkpoint.current().fail()
+        return []
+
+
+async def _all_keywords_async(cutoff: str) -> list[list[dict]]:
+    async with async_http.AsyncClient() as client:
+
+        async def query(kw: str) -> list[dict]:
+            try:
+                resp = await client.get(_AWARDS_URL, params=_search_params(kw, cutoff))
+                resp.raise_for_status()
+                return resp.json().get("response", {}).get("award", [])
+            except async_http.ERRORS as e:
+                log.error(f"NSF Awards query failed for '{kw}': {e}")
+                checkpoint.current().fail()
+                return []
+
+        return await asyncio.gather(*(query(kw) for kw in _POLICY_KEYWORDS))
+
+
 def scrape_nsf_awards() -> list[dict]:
     """Query NSF Awards API for recently started awards."""
     log.info("Querying NSF Awards API...")
     rfps: list[dict] = []
     seen_ids: set[str] = set()
 
+    # Not narrowed by a watermark: start dates are published weeks late, so
+    # the whole lookback is the reporting lag
     cutoff = (datetime.now() - timedelta(days=NSF_LOOKBACK_DAYS)).strftime("%m/%d/%Y")
 
-    for kw in _POLICY_KEYWORDS:
-        try:
-            resp = requests.get(
-                "https://api.nsf.gov/services/v1/awards.json",
-                params={
-                    "keyword": kw,
-                    "dateStart": cutoff,
-                    "printFields": "id,title,agency,startDate,expDate,estimatedTotalAmt,abstractText,piFirstName,piLastName,awardeeName,awardeeCity,awardeeStateCode",
-                    "offset": 1,
-                    "rpp": 100,
-                },
-                timeout=REQUEST_TIMEOUT,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            for award in data.get("response", {}).get("award", []):
-                award_id = award.get("id", "")
-                if award_id in seen_ids:
-                    continue
-                seen_ids.add(award_id)
-
-                amount = str(award.get("estimatedTotalAmt", "")) if award.get("estimatedTotalAmt") else ""
-
-                # PI name
-                pi_first = award.get("piFirstName", "")
-                pi_last = award.get("piLastName", "")
-                pi_name = f"{pi_first} {pi_last}".strip() if (pi_first or pi_last) else ""
-
-                # Awardee location
-                awardee_city = award.get("awardeeCity", "")
-                awardee_state = award.get("awardeeStateCode", "")
-
-                rfps.append({
-                    "state": "Federal",
-                    "source": "NSF Awards",
-                    "id": award_id,
-                    "title": award.get("title", ""),
-                    "agency": f"NSF — {award.get('agency', 'NSF')}",
-                    "status": "Awarded",
-                    "posted_date": award.get("startDate", ""),
-                    "close_date": award.get("expDate", ""),
-                    "url": f"https://www.nsf.gov/awardsearch/showAward?AWD_ID={award_id}" if award_id else "",
-                    "description": (award.get("abstractText", "") or "")[:500],
-                    "amount": amount,
-                    "recipient": award.get("awardeeName", ""),
-                    "recipient_state": f"{awardee_city}, {awardee_state}" if awardee_city else awardee_state,
-                    "pi_name": pi_name,
-                })
-
-            time.sleep(POLITE_DELAY)
-        except requests.RequestException as e:
-            log.error(f"NSF Awards query failed for '{kw}': {e}")
-            continue
+    if async_http.enabled():
+        per_keyword = async_http.run(_all_keywords_async(cutoff))
+    else:
+        per_keyword = (_query_awards(kw, cutoff) for kw in _POLICY_KEYWORDS)
+
+    for awards in per_keyword:
+        for award in awards:
+            award_id = award.get("id", "")
+            if award_id in seen_ids:
+                continue
+            seen_ids.add(award_id)
+            rfps.append(_parse_award(award))
 
     log.info(f"NSF Awards total: {len(rfps)} recent awards")
     return rfps
@@ -0,0 +1,53 @@
+"""
+Early pagination stop for newest-first listing scrapers.
+
+Listings sorted newest-first stop yielding anything new once the scraper
+reaches what earlier runs already stored.  main.scrape() hands the run's
+SeenStore to use_seen(); a paginated source keeps a SeenPages tracker and
+asks it after each page whether to stop.  After SEEN_PAGES_STOP
+consecutive pages made up only of known records, the remaining pages are
+skipped.
+
+Never stops early without a store, with SEEN_PAGES_STOP=0, or in
+HISTORICAL_MODE (a backfill is after the older pages).  already_seen()
+lets a source skip follow-up requests (detail pages) for stored records.
+"""
+
+from config import HISTORICAL_MODE, SEEN_PAGES_STOP, log
+from storage import SeenStore, rfp_hash
+
+_seen: SeenStore | None = None
+
+
+def use_seen(store: SeenStore | None):
+    """Check pages against `store` (None turns early stopping off)."""
+    global _seen
+    _seen = store
+
+
+def already_seen(rfp: dict) -> bool:
+    """True if an earlier run already stored `rfp` (False without a store)."""
+    return _seen is not None and rfp_hash(rfp) in _seen
+
+
+class SeenPages:
+    """Counts consecutive already-seen pages for one paginated listing."""
+
+    def __init__(self, label: str, limit: int = SEEN_PAGES_STOP):
+        self.label = label
+        self.limit = limit
+        self.streak = 0
+
+    def stop(self, page_rfps: list[dict]) -> bool:
+        """Record one page's records; True once pagination should stop."""
+        if _seen is None or not self.limit or HISTORICAL_MODE:
+            return False
+        if page_rfps and all(already_seen(rfp) for rfp in page_rfps):
+            self.streak += 1
+        else:
+            self.streak = 0
+        if self.streak < self.limit:
+            return False
+        log.info(f"  {self.label}: {self.streak} consecutive pages already seen, "
+                 f"stopping pagination")
+        return True
@@ -5,11 +5,10 @@ Queries the ProPublica Nonprofit Explorer for organizations matching
 research-related terms. No authentication required.
 """
 
-import time
-
 import requests
 
-from config import REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import log
+from sources import checkpoint, http_client
 
 _SEARCH_TERMS = [
     "public policy research", "education research",
@@ -27,10 +26,9 @@ def scrape_propublica() -> list[dict]:
 
     for term in _SEARCH_TERMS:
         try:
-            resp = requests.get(
+            resp = http_client.get(
                 "https://projects.propublica.org/nonprofits/api/v2/search.json",
                 params={"q": term, "page": 0},
-                timeout=REQUEST_TIMEOUT,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -59,10 +57,9 @@ def scrape_propublica() -> list[dict]:
                     "description": f"NTEE: {ntee} | Score: {org.get('score', '')}",
                     "amount": "",
                 })
-
-            time.sleep(POLITE_DELAY)
         except requests.RequestException as e:
             log.error(f"ProPublica query failed for '{term}': {e}")
+            checkpoint.current().fail()
             continue
 
     log.info(f"ProPublica Nonprofits total: {len(rfps)} organizations")
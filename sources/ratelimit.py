@@ -0,0 +1,76 @@
+"""
+Per-host request pacing shared by every source.
+
+Each hostname gets its own token bucket that refills at RATE_LIMIT_PER_SEC
+and holds up to RATE_LIMIT_BURST tokens.  A request to a host waits only
+for that host's bucket, so sources (and BidNet's states, Socrata's cities)
+that talk to different sites never wait on each other, while each site
+still sees polite pacing no matter how many threads are scraping it.
+
+http_client and async_http pace every request automatically; Playwright
+sources call wait() before each navigation or pagination click.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config import RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it.
+
+        The token is claimed immediately (the balance may go negative), so
+        concurrent callers queue up in order without holding the lock while
+        they sleep.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for(url: str) -> TokenBucket:
+    """The shared bucket for `url`'s hostname, created on first use."""
+    host = (urlsplit(url).hostname or url).lower()
+    bucket = _buckets.get(host)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(
+                host, TokenBucket(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST))
+    return bucket
+
+
+def reserve(url: str) -> float:
+    """Claim a request slot for `url`'s host; returns the seconds to wait."""
+    return bucket_for(url).reserve()
+
+
+def wait(url: str):
+    """Block until a request to `url`'s host is allowed."""
+    bucket_for(url).acquire()
@@ -8,13 +8,20 @@ API keys expire every 90 days. Regenerate at:
   https://sam.gov → Account Details → Public API Key
 """
 
-import time
+import asyncio
+import json
+import shutil
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import requests
 
 from config import (SAM_GOV_API_KEY, SAM_LOOKBACK_DAYS, SAM_CHUNK_DAYS,
-                    HISTORICAL_MODE, REQUEST_TIMEOUT, POLITE_DELAY, log)
+                    SAM_CHUNK_WORKERS, HISTORICAL_MODE, CHECKPOINT_DIR, log)
+from sources import async_http, checkpoint, http_client, watermark
 
 # SAM.gov has used multiple URL patterns; try both
 _API_URLS = [
@@ -22,10 +29,14 @@ _API_URLS = [
     "https://api.sam.gov/prod/opportunities/v2/search",
 ]
 
+_PAGE_LIMIT = 1000
+_CHECKPOINT_DIR = CHECKPOINT_DIR / "sam_gov"
 
-def _date_chunks(total_days: int, chunk_days: int) -> list[tuple[str, str]]:
-    """Generate (from_date, to_date) pairs in MM/DD/YYYY going backwards."""
-    now = datetime.now()
+
+def _date_chunks(total_days: int, chunk_days: int,
+                 now: datetime | None = None) -> list[tuple[str, str]]:
+    """Generate (from_date, to_date) pairs in MM/DD/YYYY going backwards from `now`."""
+    now = now or datetime.now()
     chunks = []
     for start_offset in range(0, total_days, chunk_days):
         end_offset = start_offset
@@ -47,7 +58,7 @@ def _find_working_url() -> str | None:
     }
     for url in _API_URLS:
         try:
-            resp = requests.get(url, params=test_params, timeout=30)
+            resp = http_client.get(url, params=test_params, timeout=30)
             if resp.status_code == 200:
                 log.info(f"SAM.gov: using endpoint {url}")
                 return url
@@ -57,10 +68,228 @@ def _find_working_url() -> str | None:
     return None
 
 
-def scrape_sam_gov() -> list[dict]:
+def _search_params(posted_from: str, posted_to: str, offset: int) -> dict:
+    return {
+        "api_key": SAM_GOV_API_KEY,
+        "postedFrom": posted_from,
+        "postedTo": posted_to,
+        "ptype": "o,k,p,r",
+        "limit": _PAGE_LIMIT,
+        "offset": offset,
+    }
+
+
+def _parse_opp(opp: dict) -> dict:
+    """Normalize one opportunitiesData entry into an RFP dict."""
+    # Extract dollar amount from award or estimate fields
+    amount = ""
+    award = opp.get("award") or {}
+    if isinstance(award, dict):
+        amount = str(award.get("amount", "")) if award.get("amount") else ""
+    if not amount:
+        for amt_key in ("estimatedValue", "baseAndAllOptionsValue",
+                        "totalEstimatedContractValue", "amount"):
+            val = opp.get(amt_key)
+            if val:
+                amount = str(val)
+                break
+
+    return {
+        "state": "Federal",
+        "source": "SAM.gov",
+        "id": opp.get("noticeId", ""),
+        "title": opp.get("title", ""),
+        "agency": opp.get("fullParentPathName", opp.get("department", "")),
+        "status": opp.get("type", ""),
+        "posted_date": opp.get("postedDate", ""),
+        "close_date": opp.get("responseDeadLine", ""),
+        "url": opp.get("uiLink", ""),
+        "description": (opp.get("description", "") or "")[:1000],
+        "amount": amount,
+    }
+
+
+def _fetch_chunk(base_url: str, posted_from: str,
+                 posted_to: str) -> tuple[list[dict], bool]:
+    """All opportunities posted in one date range, page by page.
+
+    Returns (rfps, complete); complete is False if a page request failed.
+    """
+    rfps: list[dict] = []
+    offset = 0
+    while True:
+        try:
+            resp = http_client.get(
+                base_url,
+                params=_search_params(posted_from, posted_to, offset),
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except requests.RequestException as e:
+            log.error(f"SAM.gov API query failed: {e}")
+            return rfps, False
+
+        opps = data.get("opportunitiesData", [])
+        rfps.extend(_parse_opp(opp) for opp in opps)
+        offset += _PAGE_LIMIT
+        if not opps or offset >= data.get("totalRecords", 0):
+            return rfps, True
+
+
+async def _fetch_chunk_async(client: "async_http.AsyncClient", base_url: str,
+                             posted_from: str, posted_to: str) -> tuple[list[dict], bool]:
+    """Like _fetch_chunk, but pages after the first are fetched concurrently."""
+
+    async def fetch_page(offset: int) -> dict:
+        resp = await client.get(base_url,
+                                params=_search_params(posted_from, posted_to, offset))
+        resp.raise_for_status()
+        return resp.json()
+
+    try:
+        first = await fetch_page(0)
+    except async_http.ERRORS as e:
+        log.error(f"SAM.gov API query failed: {e}")
+        return [], False
+
+    pages = [first]
+    complete = True
+    rest = await asyncio.gather(
+        *(fetch_page(offset)
+          for offset in range(_PAGE_LIMIT, first.get("totalRecords", 0), _PAGE_LIMIT)),
+        return_exceptions=True,
+    )
+    for page in rest:
+        if isinstance(page, Exception):
+            log.error(f"SAM.gov API query failed: {page}")
+            complete = False
+        else:
+            pages.append(page)
+    rfps = [_parse_opp(opp) for page in pages for opp in page.get("opportunitiesData", [])]
+    return rfps, complete
+
+
+# ---------------------------------------------------------------------------
+# Historical checkpoints
+# ---------------------------------------------------------------------------
+
+
+class _ChunkCheckpoint:
+    """Completed backfill chunks saved to disk so a rerun can resume.
+
+    The chunk list is anchored in a manifest: a backfill interrupted today
+    and resumed tomorrow keeps today's date ranges, so saved chunks still
+    line up.  A manifest for a different lookback/chunk size is discarded.
+    """
+
+    def __init__(self, lookback_days: int, chunk_days: int):
+        self.dir = _CHECKPOINT_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        params = {"lookback_days": lookback_days, "chunk_days": chunk_days}
+
+        manifest = self._load_manifest()
+        if manifest and all(manifest.get(k) == v for k, v in params.items()):
+            self.chunks = [tuple(c) for c in manifest["chunks"]]
+            done = sum(self.done(i) for i in range(len(self.chunks)))
+            log.info(
+                f"SAM.gov: resuming backfill anchored {manifest['anchor']} "
+                f"({done}/{len(self.chunks)} chunks already saved)"
+            )
+            return
+
+        self.clear()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        now = datetime.now()
+        self.chunks = _date_chunks(lookback_days, chunk_days, now)
+        self._write_json(self.dir / "manifest.json", {
+            "anchor": now.strftime("%Y-%m-%d"), **params, "chunks": self.chunks,
+        })
+
+    def _load_manifest(self) -> dict | None:
+        path = self.dir / "manifest.json"
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            log.warning(f"SAM.gov: unreadable checkpoint manifest, starting over: {e}")
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        """Write atomically so a crash mid-write never leaves a torn file."""
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(path)
+
+    def _path(self, idx: int) -> Path:
+        return self.dir / f"chunk-{idx:03d}.json"
+
+    def done(self, idx: int) -> bool:
+        return self._path(idx).exists()
+
+    def load(self, idx: int) -> list[dict]:
+        return json.loads(self._path(idx).read_text())
+
+    def save(self, idx: int, rfps: list[dict]):
+        if not self.done(idx):
+            self._write_json(self._path(idx), rfps)
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------------
+# Chunk scheduling
+# ---------------------------------------------------------------------------
+
+
+def _chunk_results(
+    base_url: str, chunks: list[tuple[str, str]], chunk_checkpoint: _ChunkCheckpoint | None,
+) -> Iterator[tuple[list[dict], bool]]:
+    """Fetch up to SAM_CHUNK_WORKERS chunks at once, yielding in chunk order."""
+
+    def work(idx: int, posted_from: str, posted_to: str) -> tuple[list[dict], bool]:
+        if chunk_checkpoint is not None and chunk_checkpoint.done(idx):
+            return chunk_checkpoint.load(idx), True
+        return _fetch_chunk(base_url, posted_from, posted_to)
+
+    pool = ThreadPoolExecutor(max_workers=SAM_CHUNK_WORKERS, thread_name_prefix="sam")
+    pending: deque[Future] = deque()
+    try:
+        for idx, (posted_from, posted_to) in enumerate(chunks):
+            pending.append(pool.submit(work, idx, posted_from, posted_to))
+            if len(pending) >= SAM_CHUNK_WORKERS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _chunk_results_async(
+    base_url: str, chunks: list[tuple[str, str]], chunk_checkpoint: _ChunkCheckpoint | None,
+) -> AsyncIterator[tuple[list[dict], bool]]:
+    """Async counterpart of _chunk_results."""
+    async with async_http.AsyncClient() as client:
+
+        async def work(idx: int, posted_from: str, posted_to: str) -> tuple[list[dict], bool]:
+            if chunk_checkpoint is not None and chunk_checkpoint.done(idx):
+                return chunk_checkpoint.load(idx), True
+            return await _fetch_chunk_async(client, base_url, posted_from, posted_to)
+
+        async for result in async_http.ordered(
+            (work(idx, f, t) for idx, (f, t) in enumerate(chunks)),
+            window=SAM_CHUNK_WORKERS,
+        ):
+            yield result
+
+
+def scrape_sam_gov() -> Iterator[dict]:
+    """Yield SAM.gov opportunities chunk by chunk (a 10-year backfill is large)."""
     if not SAM_GOV_API_KEY:
         log.warning("SAM_GOV_API_KEY not set — skipping SAM.gov")
-        return []
+        return
 
     log.info("Querying SAM.gov Opportunities API...")
 
@@ -71,85 +300,41 @@ def scrape_sam_gov() -> list[dict]:
             "Your API key may have expired (keys expire every 90 days). "
             "Regenerate at: https://sam.gov → Account Details → Public API Key"
         )
-        return []
-
-    rfps: list[dict] = []
+        return
 
+    chunk_checkpoint = None
     if HISTORICAL_MODE:
-        chunks = _date_chunks(SAM_LOOKBACK_DAYS, SAM_CHUNK_DAYS)
+        # Saved chunks outlive a single day's run; they are only cleared
+        # once every chunk has completed and the run's rows are written.
+        checkpoint.current().keep_own(_CHECKPOINT_DIR)
+        chunk_checkpoint = _ChunkCheckpoint(SAM_LOOKBACK_DAYS, SAM_CHUNK_DAYS)
+        chunks = chunk_checkpoint.chunks
     else:
-        posted_from = (datetime.now() - timedelta(days=SAM_LOOKBACK_DAYS)).strftime("%m/%d/%Y")
-        posted_to = datetime.now().strftime("%m/%d/%Y")
+        now = datetime.now()
+        posted_from = watermark.since("sam_gov", SAM_LOOKBACK_DAYS, now).strftime("%m/%d/%Y")
+        posted_to = now.strftime("%m/%d/%Y")
         chunks = [(posted_from, posted_to)]
 
-    limit = 1000
+    if async_http.enabled():
+        results = async_http.iter_async(
+            _chunk_results_async(base_url, chunks, chunk_checkpoint))
+    else:
+        results = _chunk_results(base_url, chunks, chunk_checkpoint)
 
-    for chunk_idx, (posted_from, posted_to) in enumerate(chunks):
+    count = 0
+    for idx, (rfps, complete) in enumerate(results):
         if HISTORICAL_MODE:
-            log.info(f"  SAM.gov chunk {chunk_idx + 1}/{len(chunks)}: {posted_from} to {posted_to}")
-        offset = 0
-
-        while True:
-            try:
-                params = {
-                    "api_key": SAM_GOV_API_KEY,
-                    "postedFrom": posted_from,
-                    "postedTo": posted_to,
-                    "ptype": "o,k,p,r",
-                    "limit": limit,
-                    "offset": offset,
-                }
-                resp = requests.get(
-                    base_url,
-                    params=params,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-
-                opps = data.get("opportunitiesData", [])
-                if not opps:
-                    break
-
-                for opp in opps:
-                    # Extract dollar amount from award or estimate fields
-                    amount = ""
-                    award = opp.get("award") or {}
-                    if isinstance(award, dict):
-                        amount = str(award.get("amount", "")) if award.get("amount") else ""
-                    if not amount:
-                        for amt_key in ("estimatedValue", "baseAndAllOptionsValue",
-                                        "totalEstimatedContractValue", "amount"):
-                            val = opp.get(amt_key)
-                            if val:
-                                amount = str(val)
-                                break
-
-                    rfps.append({
-                        "state": "Federal",
-                        "source": "SAM.gov",
-                        "id": opp.get("noticeId", ""),
-                        "title": opp.get("title", ""),
-                        "agency": opp.get("fullParentPathName", opp.get("department", "")),
-                        "status": opp.get("type", ""),
-                        "posted_date": opp.get("postedDate", ""),
-                        "close_date": opp.get("responseDeadLine", ""),
-                        "url": opp.get("uiLink", ""),
-                        "description": (opp.get("description", "") or "")[:1000],
-                        "amount": amount,
-                    })
-
-                total = data.get("totalRecords", 0)
-                offset += limit
-                if offset >= total:
-                    break
-                time.sleep(POLITE_DELAY)
-
-            except requests.RequestException as e:
-                log.error(f"SAM.gov API query failed: {e}")
-                break
-
-        time.sleep(POLITE_DELAY)
+            posted_from, posted_to = chunks[idx]
+            log.info(
+                f"  SAM.gov chunk {idx + 1}/{len(chunks)}: {posted_from} to {posted_to} "
+                f"— {len(rfps)} records{'' if complete else ' (incomplete)'}"
+            )
+        if not complete:
+            checkpoint.current().fail()
+        elif chunk_checkpoint is not None:
+            chunk_checkpoint.save(idx, rfps)
+        for rfp in rfps:
+            count += 1
+            yield rfp
 
-    log.info(f"SAM.gov: {len(rfps)} federal opportunities")
-    return rfps
+    log.info(f"SAM.gov: {count} federal opportunities")
@@ -5,51 +5,38 @@ Queries the SBIR.gov public API for open SBIR/STTR solicitations across
 all 11 federal agencies. No authentication required.
 """
 
-import time
-
 import requests
 
-from config import SBIR_MAX_PAGES, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import SBIR_MAX_PAGES, log
+from sources import checkpoint, http_client
 
 
 def scrape_sbir() -> list[dict]:
     """Query SBIR.gov API for open solicitations."""
     log.info("Querying SBIR.gov API...")
     rfps: list[dict] = []
+    cp = checkpoint.current()
 
     try:
-        page = 0
+        page = cp.cursor.get("page", 0)
         while True:
-            # SBIR API is aggressive with rate limiting; retry with backoff
-            resp = None
-            for attempt in range(3):
-                try:
-                    resp = requests.get(
-                        "https://api.www.sbir.gov/public/api/solicitations",
-                        params={"keyword": "", "open": 1, "rows": 50, "start": page * 50},
-                        timeout=REQUEST_TIMEOUT,
-                    )
-                    if resp.status_code == 429:
-                        wait = 5 * (attempt + 1)
-                        log.warning(f"SBIR.gov 429 rate limit, waiting {wait}s (attempt {attempt + 1}/3)")
-                        time.sleep(wait)
-                        continue
-                    resp.raise_for_status()
-                    break
-                except requests.RequestException:
-                    if attempt == 2:
-                        raise
-                    time.sleep(3)
-
-            if resp is None or resp.status_code == 429:
+            # SBIR API is aggressive with rate limiting; the shared client
+            # backs off and retries 429s (honoring Retry-After)
+            resp = http_client.get(
+                "https://api.www.sbir.gov/public/api/solicitations",
+                params={"keyword": "", "open": 1, "rows": 50, "start": page * 50},
+            )
+            if resp.status_code == 429:
                 log.warning("SBIR.gov rate limit persists after retries, skipping")
                 break
+            resp.raise_for_status()
 
             data = resp.json()
             items = data if isinstance(data, list) else data.get("results", data.get("data", []))
             if not items:
                 break
 
+            page_rfps: list[dict] = []
             for item in items:
                 sol_id = str(
                     item.get("solicitation_number",
@@ -66,7 +53,7 @@ def scrape_sbir() -> list[dict]:
                     link = f"https://www.sbir.gov/node/{sol_id}"
                 status = item.get("current_status", item.get("status", "Open"))
 
-                rfps.append({
+                page_rfps.append({
                     "state": "Federal",
                     "source": "SBIR.gov",
                     "id": sol_id,
@@ -80,15 +67,18 @@ def scrape_sbir() -> list[dict]:
                     "amount": "",
                 })
 
+            cp.page(page_rfps, page=page + 1)
+            rfps.extend(page_rfps)
+
             if len(items) < 50:
                 break
             page += 1
             if page >= SBIR_MAX_PAGES:
                 break
-            time.sleep(POLITE_DELAY)
 
     except requests.RequestException as e:
         log.error(f"SBIR.gov API failed: {e}")
+        cp.fail()
 
     log.info(f"SBIR.gov total: {len(rfps)} open solicitations")
     return rfps
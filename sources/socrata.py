@@ -3,14 +3,29 @@ Socrata SODA API scraper for state open data portals.
 
 Queries Socrata-powered open data sites for procurement/contract data.
 Each state is a config entry — adding a new state requires no code changes.
+
+Requests select only the columns named in a dataset's candidate lists and
+page by row id.  In HISTORICAL_MODE pages come from the CSV form of the
+same query (SOCRATA_CSV), which is considerably smaller than JSON; a
+dataset whose CSV export lacks the :id column falls back to JSON.
+Datasets are fetched concurrently, and each one's columns are probed at
+most once every SOCRATA_SCHEMA_TTL_DAYS (see SOCRATA_SCHEMA_CACHE).
 """
 
-import time
+import csv
+import io
+import json
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
 
-from config import SOCRATA_LOOKBACK_DAYS, HISTORICAL_MODE, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import (SOCRATA_LOOKBACK_DAYS, SOCRATA_CSV, SOCRATA_WORKERS,
+                    SOCRATA_SCHEMA_CACHE, SOCRATA_SCHEMA_TTL_DAYS, HISTORICAL_MODE, log)
+from sources import checkpoint, http_client, watermark
 
 # ---------------------------------------------------------------------------
 # State dataset configurations
@@ -92,90 +107,269 @@ def _first_match(record: dict, candidates: list[str]) -> str:
     return ""
 
 
-def _scrape_one_dataset(ds: dict) -> list[dict]:
-    """Query a single Socrata dataset and return normalized RFP dicts."""
+_QUEUE_PAGES = 4  # pages a dataset may fetch ahead of the consumer
+_CANDIDATE_KEYS = ("date_candidates", "title_candidates", "id_candidates",
+                   "agency_candidates", "end_date_candidates", "amount_candidates")
+
+
+# ---------------------------------------------------------------------------
+# Column discovery, cached for SOCRATA_SCHEMA_TTL_DAYS
+# ---------------------------------------------------------------------------
+
+
+class _SchemaCache:
+    """Discovered dataset columns on disk, keyed by resource URL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas: dict[str, dict] = {}
+        if SOCRATA_SCHEMA_CACHE.exists():
+            try:
+                self._schemas = json.loads(SOCRATA_SCHEMA_CACHE.read_text())
+            except (OSError, ValueError) as e:
+                log.warning(f"Socrata: unreadable schema cache, re-probing: {e}")
+
+    def get(self, url: str, refresh: bool = False) -> tuple[list[str], bool]:
+        """(field names, has rows) for `url`, probing only if stale."""
+        with self._lock:
+            entry = self._schemas.get(url)
+        if entry and not refresh:
+            age = datetime.now() - datetime.fromisoformat(entry["checked"])
+            if age <= timedelta(days=SOCRATA_SCHEMA_TTL_DAYS):
+                return entry["columns"], entry["has_rows"]
+
+        columns, has_rows = _discover_columns(url)
+        with self._lock:
+            self._schemas[url] = {"columns": columns, "has_rows": has_rows,
+                                  "checked": datetime.now().isoformat()}
+            tmp = SOCRATA_SCHEMA_CACHE.with_name(f".{SOCRATA_SCHEMA_CACHE.name}.tmp")
+            tmp.write_text(json.dumps(self._schemas, indent=1, sort_keys=True))
+            tmp.replace(SOCRATA_SCHEMA_CACHE)
+        return columns, has_rows
+
+
+def _discover_columns(url: str) -> tuple[list[str], bool]:
+    """(field names, has rows) for a dataset, from a one-row sample.
+
+    SODA leaves null fields out of JSON rows, so the X-SODA2-Fields header
+    (every column of the response) is the authoritative list.
+    """
+    resp = http_client.get(url, params={"$limit": 1})
+    resp.raise_for_status()
+    sample = resp.json()
+    columns = set(sample[0]) if sample else set()
+    try:
+        columns.update(json.loads(resp.headers.get("X-SODA2-Fields", "[]")))
+    except ValueError:
+        pass
+    return sorted(columns), bool(sample)
+
+
+# ---------------------------------------------------------------------------
+# Dataset queries
+# ---------------------------------------------------------------------------
+
+
+def _fetch_json(url: str, params: dict) -> list[dict]:
+    """One page of rows from the JSON endpoint."""
+    resp = http_client.get(url, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _fetch_csv(url: str, params: dict) -> list[dict] | None:
+    """One page from the leaner CSV export, or None if it has no :id column."""
+    resp = http_client.get(url.removesuffix(".json") + ".csv", params=params)
+    resp.raise_for_status()
+    reader = csv.DictReader(io.StringIO(resp.text))
+    if reader.fieldnames and ":id" not in reader.fieldnames:
+        return None
+    return list(reader)
+
+
+def _query_plan(ds: dict, columns: list[str]) -> tuple[str | None, list[str]]:
+    """(date column, columns to $select) for a dataset with these columns."""
+    date_col = next((c for c in ds["date_candidates"] if c in columns), None)
+    selected = sorted({col for key in _CANDIDATE_KEYS
+                       for col in ds.get(key, []) if col in columns})
+    return date_col, selected
+
+
+def _dataset_pages(ds: dict, schemas: _SchemaCache, after: str | None,
+                   since: datetime | None, updated_since: datetime | None = None
+                   ) -> Iterator[tuple[list[dict], str | None, bool]]:
+    """Yield (rfps, last row id, last page) for one Socrata dataset.
+
+    Only the mapped candidate columns are requested ($select), and pages
+    are walked by keyset on the row id (:id > `after`) rather than a
+    growing $offset.  Only records dated on or after `since` are fetched
+    (all of them if None or no date column is found), and only rows
+    updated on or after `updated_since` (:updated_at), so award dates
+    published late are not missed.  If a cached schema
+    names a column the dataset has since dropped, the schema is re-probed
+    once.
+    """
     state = ds["state"]
     label = ds["label"]
     url = ds["url"]
-    rfps: list[dict] = []
 
-    try:
-        # Discover columns from a small sample
-        resp = requests.get(url, params={"$limit": 5}, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        sample = resp.json()
-        if not sample:
-            log.info(f"  {label}: empty dataset")
-            return rfps
-
-        columns = list(sample[0].keys())
-
-        # Find best date column
-        date_col = None
-        for candidate in ds["date_candidates"]:
-            if candidate in columns:
-                date_col = candidate
-                break
-
-        # Build query — paginate to get all records
-        page_limit = 50000 if HISTORICAL_MODE else 1000
-        offset = 0
-
-        while True:
-            params: dict = {"$limit": page_limit, "$offset": offset}
-            if SOCRATA_LOOKBACK_DAYS > 0 and date_col:
-                cutoff = (datetime.now() - timedelta(days=SOCRATA_LOOKBACK_DAYS)).strftime(
-                    "%Y-%m-%dT00:00:00"
-                )
-                params["$where"] = f"{date_col} >= '{cutoff}'"
-            if date_col:
-                params["$order"] = f"{date_col} DESC"
-
-            resp = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            data = resp.json()
-
-            if not data:
-                break
-
-            for item in data:
-                title = _first_match(item, ds["title_candidates"])
-                rfps.append({
-                    "state": state,
-                    "source": f"{label} (Awarded)",
-                    "id": _first_match(item, ds["id_candidates"]),
-                    "title": title,
-                    "agency": _first_match(item, ds["agency_candidates"]),
-                    "status": "Awarded",
-                    "posted_date": item.get(date_col, "") if date_col else "",
-                    "close_date": _first_match(item, ds["end_date_candidates"]),
-                    "url": "",
-                    "description": title[:1000],
-                    "amount": _first_match(item, ds.get("amount_candidates", [])),
-                })
-
-            if len(data) < page_limit:
-                break  # last page
-            offset += page_limit
-            log.info(f"    {label}: fetched {len(rfps)} records so far...")
-            time.sleep(POLITE_DELAY)
-
-    except requests.RequestException as e:
-        log.error(f"  {label} query failed: {e}")
-
-    log.info(f"  {label}: {len(rfps)} records")
-    return rfps
-
-
-def scrape_socrata() -> list[dict]:
-    """Query all configured Socrata open data portals."""
+    columns, has_rows = schemas.get(url)
+    if not has_rows:
+        log.info(f"  {label}: empty dataset")
+        yield [], after, True
+        return
+    date_col, selected = _query_plan(ds, columns)
+    refreshed = False
+    use_csv = SOCRATA_CSV
+
+    # Build query — page through all matching records by row id
+    page_limit = 50000 if HISTORICAL_MODE else 1000
+    while True:
+        conditions = []
+        if since is not None and date_col:
+            cutoff = since.strftime("%Y-%m-%dT00:00:00")
+            conditions.append(f"{date_col} >= '{cutoff}'")
+        if updated_since is not None:
+            conditions.append(f":updated_at >= '{updated_since:%Y-%m-%dT00:00:00}'")
+        if after:
+            conditions.append(f":id > '{after}'")
+        params: dict = {
+            "$select": ", ".join([":id", *selected]),
+            "$order": ":id",
+            "$limit": page_limit,
+        }
+        if conditions:
+            params["$where"] = " AND ".join(conditions)
+
+        try:
+            data = None
+            if use_csv:
+                try:
+                    data = _fetch_csv(url, params)
+                    if data is None:
+                        log.info(f"  {label}: CSV export has no :id column, using JSON")
+                except csv.Error as e:
+                    log.info(f"  {label}: unreadable CSV export ({e}), using JSON")
+                use_csv = data is not None
+            if data is None:
+                data = _fetch_json(url, params)
+        except requests.HTTPError as e:
+            if refreshed or e.response is None or e.response.status_code != 400:
+                raise
+            log.info(f"  {label}: query rejected, refreshing cached columns")
+            date_col, selected = _query_plan(ds, schemas.get(url, refresh=True)[0])
+            refreshed = True
+            continue
+
+        last_page = len(data) < page_limit
+        page_rfps: list[dict] = []
+        for item in data:
+            title = _first_match(item, ds["title_candidates"])
+            page_rfps.append({
+                "state": state,
+                "source": f"{label} (Awarded)",
+                "id": _first_match(item, ds["id_candidates"]),
+                "title": title,
+                "agency": _first_match(item, ds["agency_candidates"]),
+                "status": "Awarded",
+                "posted_date": item.get(date_col, "") if date_col else "",
+                "close_date": _first_match(item, ds["end_date_candidates"]),
+                "url": "",
+                "description": title[:1000],
+                "amount": _first_match(item, ds.get("amount_candidates", [])),
+            })
+
+        if data:
+            if ":id" not in data[-1]:
+                raise ValueError("rows have no :id column")
+            after = data[-1][":id"]
+        yield page_rfps, after, last_page
+        if last_page:
+            return
+
+
+class _DatasetFeed:
+    """Fetches one dataset's pages on a worker thread into a bounded queue.
+
+    Pages are handed back rather than checkpointed here, so only the
+    consuming thread touches the source's checkpoint.
+    """
+
+    def __init__(self, ds: dict, schemas: _SchemaCache, after: str | None,
+                 since: datetime | None, updated_since: datetime | None,
+                 stop: threading.Event):
+        self.ds = ds
+        self.pages = _dataset_pages(ds, schemas, after, since, updated_since)
+        self.queue: queue.Queue = queue.Queue(maxsize=_QUEUE_PAGES)
+        self.stop = stop
+
+    def _put(self, item) -> bool:
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            for page in self.pages:
+                if not self._put(page):
+                    return
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+
+
+def scrape_socrata() -> Iterator[dict]:
+    """Query all configured Socrata open data portals, yielding records.
+
+    Up to SOCRATA_WORKERS datasets are fetched at once; records still come
+    out one dataset at a time, in SOCRATA_DATASETS order.
+    """
     log.info(f"Querying {len(SOCRATA_DATASETS)} Socrata open data portals...")
-    all_rfps: list[dict] = []
+    total = 0
+    cp = checkpoint.current()
+    since = updated_since = None
+    if SOCRATA_LOOKBACK_DAYS > 0:
+        now = datetime.now()
+        since = now - timedelta(days=SOCRATA_LOOKBACK_DAYS)
+        updated_since = watermark.last_run("socrata", now)
+        if updated_since is not None:
+            log.info(f"socrata: fetching rows updated since last run "
+                     f"({updated_since:%Y-%m-%d})")
+    schemas = _SchemaCache()
+
+    stop = threading.Event()
+    feeds = [_DatasetFeed(ds, schemas, cp.cursor.get(ds["label"]), since,
+                          updated_since, stop)
+             for ds in SOCRATA_DATASETS if not cp.completed(ds["label"])]
+    pool = ThreadPoolExecutor(max_workers=SOCRATA_WORKERS, thread_name_prefix="socrata")
+    try:
+        for feed in feeds:
+            pool.submit(feed.run)
 
-    for ds in SOCRATA_DATASETS:
-        results = _scrape_one_dataset(ds)
-        all_rfps.extend(results)
-        time.sleep(POLITE_DELAY)
+        for feed in feeds:
+            label = feed.ds["label"]
+            count = 0
+            while (item := feed.queue.get()) is not None:
+                if isinstance(item, (requests.RequestException, ValueError)):
+                    log.error(f"  {label} query failed: {item}")
+                    cp.fail()
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                page_rfps, after, last_page = item
+                cp.page(page_rfps, key=label if last_page else None, **{label: after})
+                count += len(page_rfps)
+                total += len(page_rfps)
+                yield from page_rfps
+                if not last_page:
+                    log.info(f"    {label}: fetched {count} records so far...")
+            log.info(f"  {label}: {count} records")
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    log.info(f"Socrata total: {len(all_rfps)} records across {len(SOCRATA_DATASETS)} states")
-    return all_rfps
+    log.info(f"Socrata total: {total} records across {len(SOCRATA_DATASETS)} states")
@@ -3,12 +3,35 @@ Individual state procurement portal scrapers.
 
 Covers states with unique or less-common eProcurement platforms that don't
 fit into the BuySpeed or JAGGAER shared scrapers.  Each portal is scraped
-via Playwright using a common framework with per-state URL and selectors.
+with a common framework of table/link/card heuristics.
+
+Many portals are plain server-rendered HTML, so each one is first fetched
+with requests and parsed with BeautifulSoup; portals where that finds no
+table or card rows are rendered in Playwright, concurrently on the shared
+browser pool.  A static hit is also rendered once, and the portal is only
+treated as static if its HTML had every rendered solicitation.  Detected
+modes are remembered in PORTAL_RENDER_CACHE for PORTAL_RENDER_TTL_DAYS, so
+later runs skip the attempt that doesn't work.
+
+Rendered text is stored verbatim, as it always has been.  Static text only
+approximates innerText (line breaks, tabs), so the two are compared with
+whitespace collapsed, and a confirmed static portal's records take the id
+and title text of the rendered listing they match.  Their dedup hashes
+then don't change when the portal stops needing a browser.
 """
 
-import time
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
-from config import PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
+from bs4 import BeautifulSoup, Comment, Tag
+
+from config import (PLAYWRIGHT_TIMEOUT, PORTAL_FETCH_WORKERS, PORTAL_RENDER_CACHE,
+                    PORTAL_RENDER_TTL_DAYS, log)
+from sources import browser, checkpoint, http_cache, http_client, ratelimit
+
+_HEADERS = {"User-Agent": http_client.BROWSER_USER_AGENT}
 
 # ---------------------------------------------------------------------------
 # State portal configurations
@@ -17,7 +40,9 @@ from config import PLAYWRIGHT_TIMEOUT, POLITE_DELAY, log
 #   state     — 2-letter abbreviation
 #   label     — human-readable name
 #   url       — public solicitation search page (no login required)
-#   selectors — CSS selectors to find table rows, links, etc.
+#   render    — optional: "browser" for pages that only render in JavaScript
+#               (skips the static attempt); default "auto" tries static HTML
+#               first and falls back to Playwright
 # ---------------------------------------------------------------------------
 
 STATE_PORTALS = [
@@ -26,6 +51,7 @@ STATE_PORTALS = [
         "state": "CA",
         "label": "California Cal eProcure",
         "url": "https://caleprocure.ca.gov/pages/Events-BS3/event-search.aspx",
+        "render": "browser",
     },
     {
         "state": "CT",
@@ -88,6 +114,7 @@ STATE_PORTALS = [
         "state": "FL",
         "label": "Florida MFMP",
         "url": "https://vendor.myfloridamarketplace.com/search/bids/posted",
+        "render": "browser",
     },
     {
         "state": "LA",
@@ -109,16 +136,19 @@ STATE_PORTALS = [
         "state": "AZ",
         "label": "Arizona APP",
         "url": "https://app.az.gov/page.aspx/en/rfx/rfx_browse/open",
+        "render": "browser",
     },
     {
         "state": "MD",
         "label": "Maryland eMMa",
         "url": "https://emma.maryland.gov/page.aspx/en/rfx/rfx_browse/open",
+        "render": "browser",
     },
     {
         "state": "OH",
         "label": "Ohio OhioBuys",
         "url": "https://ohiobuys.ohio.gov/page.aspx/en/rfx/rfx_browse/open",
+        "render": "browser",
     },
     {
         "state": "VT",
@@ -150,6 +180,7 @@ STATE_PORTALS = [
         "state": "MO",
         "label": "Missouri MissouriBUYS",
         "url": "https://missouribuys.mo.gov/search/publicSolicitation",
+        "render": "browser",
     },
     {
         "state": "NE",
@@ -180,6 +211,7 @@ STATE_PORTALS = [
         "state": "VA",
         "label": "Virginia eVA",
         "url": "https://mvendor.cgieva.com/Vendor/public/AllOpportunities/",
+        "render": "browser",
     },
     {
         "state": "WA",
@@ -220,63 +252,325 @@ def scrape_state_portals() -> list[dict]:
     log.info(
         f"Scraping {len(STATE_PORTALS)} individual state procurement portals..."
     )
+    return _scrape_all_state_portals()
 
-    try:
-        from playwright.sync_api import sync_playwright  # noqa: F401
-        return _scrape_all_state_portals()
-    except ImportError:
+
+def _scrape_all_state_portals() -> list[dict]:
+    all_rfps: list[dict] = []
+    cp = checkpoint.current()
+    modes = _RenderModes()
+
+    todo = [portal for portal in STATE_PORTALS if not cp.completed(portal["label"])]
+
+    # Static HTML first, for every portal not known to need a browser.  A
+    # static hit (table or card rows) from a portal not yet known to be
+    # static is also rendered once, to confirm the HTML holds everything.
+    static = [p for p in todo if _render_mode(p, modes) != "browser"]
+    needs_browser = [p for p in todo if _render_mode(p, modes) == "browser"]
+    static_found: dict[str, tuple[list[dict], str]] = {}   # label -> (records, strategy)
+    static_hits = 0
+    with ThreadPoolExecutor(max_workers=PORTAL_FETCH_WORKERS) as pool:
+        for portal, (rfps, strategy) in zip(static, pool.map(_scrape_static_portal, static)):
+            label = portal["label"]
+            hit = strategy in _STATIC_HIT_STRATEGIES
+            if hit and modes.get(label) == "static":
+                static_hits += 1
+                rfps = _apply_identities(rfps, modes.identities(label))
+                cp.page(rfps, key=label)
+                all_rfps.extend(rfps)
+                continue
+            if not hit:
+                modes.forget(label)   # no longer (or never) a static portal
+            if rfps:
+                static_found[label] = (rfps, strategy)
+            needs_browser.append(portal)
+
+    if needs_browser and not browser.available():
         log.warning(
-            "Playwright not installed — skipping state portals. "
+            f"Playwright not installed — skipping {len(needs_browser)} "
+            "JavaScript-rendered state portals. "
             "Install with: pip install playwright && python -m playwright install chromium"
         )
-        return []
+        # Keep whatever static HTML found, without caching a mode for it
+        for portal in needs_browser:
+            rfps, _ = static_found.get(portal["label"], ([], ""))
+            if rfps:
+                cp.page(rfps, key=portal["label"])
+                all_rfps.extend(rfps)
+        needs_browser = []
+
+    todo = [(portal,) for portal in needs_browser]
+    pool = browser.get_pool()
+    for (portal,), future in pool.map(_scrape_generic_portal, todo, source="State portals"):
+        label = portal["label"]
+        static_rfps, static_strategy = static_found.get(label, ([], ""))
+        static_hit = static_strategy in _STATIC_HIT_STRATEGIES
+        e = future.exception()
+        if e is not None:
+            log.error(f"  {label}: scrape failed — {e}")
+            cp.fail(label)
+            if static_hit:
+                all_rfps.extend(static_rfps)   # unconfirmed, so not cached
+            continue
+        rfps, _ = future.result()
+        if static_hit and _static_confirmed(static_rfps, rfps):
+            log.info(f"  {label}: static HTML has every rendered solicitation, "
+                     f"skipping the browser for {PORTAL_RENDER_TTL_DAYS} days")
+            identities = _listing_identities(rfps)
+            modes.set(label, "static", identities)
+            rfps = _apply_identities(static_rfps, identities)
+        elif rfps:
+            modes.set(label, "browser")
+        cp.page(rfps, key=label)
+        all_rfps.extend(rfps)
+
+    modes.save()
+    log.info(
+        f"State portals total: {len(all_rfps)} solicitations "
+        f"across {len(STATE_PORTALS)} portals "
+        f"({static_hits} from static HTML, {len(needs_browser)} rendered)"
+    )
+    return all_rfps
 
 
-def _scrape_all_state_portals() -> list[dict]:
-    from playwright.sync_api import sync_playwright
+def _listing_key(rfp: dict) -> str:
+    """A listing's id and title with whitespace collapsed.
 
-    all_rfps: list[dict] = []
+    Static text only approximates the rendered innerText, so the two paths
+    agree on a listing up to whitespace.
+    """
+    return " ".join(rfp["id"].split()) + "\n" + " ".join(rfp["title"].split())
+
+
+def _static_confirmed(static_rfps: list[dict], rendered_rfps: list[dict]) -> bool:
+    """True if a static hit found every solicitation the browser render did."""
+    static_keys = {_listing_key(rfp) for rfp in static_rfps}
+    return all(_listing_key(rfp) in static_keys for rfp in rendered_rfps)
+
+
+def _listing_identities(rendered_rfps: list[dict]) -> dict[str, list[str]]:
+    """Rendered [id, title, description] of each listing, by _listing_key()."""
+    return {_listing_key(rfp): [rfp["id"], rfp["title"], rfp["description"]]
+            for rfp in rendered_rfps}
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36"
-        )
 
-        for portal in STATE_PORTALS:
+def _apply_identities(static_rfps: list[dict], identities: dict[str, list[str]]) -> list[dict]:
+    """Give static records the exact text of the rendered listings they match.
+
+    Titles and ids feed rfp_hash(), so a portal confirmed static keeps the
+    hashes its rendered records were stored under.  Listings first seen
+    after the render keep their static text.
+    """
+    out = []
+    for rfp in static_rfps:
+        identity = identities.get(_listing_key(rfp))
+        if identity is not None:
+            rfp = {**rfp, "id": identity[0], "title": identity[1],
+                   "description": identity[2]}
+        out.append(rfp)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Render mode detection
+# ---------------------------------------------------------------------------
+
+
+class _RenderModes:
+    """Cached static/browser detection results, keyed by portal label."""
+
+    def __init__(self):
+        self._modes: dict[str, dict] = {}
+        self._dirty = False
+        if PORTAL_RENDER_CACHE.exists():
             try:
-                rfps = _scrape_generic_portal(context, portal)
-                all_rfps.extend(rfps)
-            except Exception as e:
-                log.error(f"  {portal['label']}: failed — {e}")
+                self._modes = json.loads(PORTAL_RENDER_CACHE.read_text())
+            except (OSError, ValueError) as e:
+                log.warning(f"State portals: unreadable render cache, re-detecting: {e}")
+
+    def get(self, label: str) -> str | None:
+        """The detected mode for `label`, unless it has expired."""
+        entry = self._modes.get(label)
+        if not entry:
+            return None
+        checked = datetime.fromisoformat(entry["checked"])
+        if datetime.now() - checked > timedelta(days=PORTAL_RENDER_TTL_DAYS):
+            return None
+        if entry["mode"] == "static" and "identities" not in entry:
+            return None   # cached before static records took the rendered text
+        return entry["mode"]
+
+    def identities(self, label: str) -> dict[str, list[str]]:
+        """The rendered listings a static portal was confirmed against."""
+        return self._modes.get(label, {}).get("identities", {})
+
+    def set(self, label: str, mode: str, identities: dict[str, list[str]] | None = None):
+        if self.get(label) != mode or identities is not None:
+            entry = {"mode": mode, "checked": datetime.now().isoformat()}
+            if identities is not None:
+                entry["identities"] = identities
+            self._modes[label] = entry
+            self._dirty = True
+
+    def forget(self, label: str):
+        if self._modes.pop(label, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp = PORTAL_RENDER_CACHE.with_name(f".{PORTAL_RENDER_CACHE.name}.tmp")
+        tmp.write_text(json.dumps(self._modes, indent=1, sort_keys=True))
+        tmp.replace(PORTAL_RENDER_CACHE)
+        self._dirty = False
+
+
+def _render_mode(portal: dict, modes: _RenderModes) -> str:
+    """"browser" if the portal is configured or known to need Playwright."""
+    if portal.get("render") == "browser":
+        return "browser"
+    return modes.get(portal["label"]) or "auto"
 
-            time.sleep(POLITE_DELAY)
 
-        browser.close()
+# ---------------------------------------------------------------------------
+# Static HTML path
+# ---------------------------------------------------------------------------
 
-    log.info(
-        f"State portals total: {len(all_rfps)} solicitations "
-        f"across {len(STATE_PORTALS)} portals"
-    )
-    return all_rfps
+
+# Strategies whose rows are solicitation listings.  The link strategy also
+# matches navigation and footer links, so it never counts as a static hit.
+_STATIC_HIT_STRATEGIES = ("table", "card")
+
+
+def _scrape_static_portal(portal: dict) -> tuple[list[dict], str]:
+    """Fetch a portal without a browser: (records, strategy that found them)."""
+    label = portal["label"]
+    try:
+        rfps = http_cache.get_records(
+            portal["url"], lambda html: _parse_static(portal, html),
+            headers=_HEADERS, version="5")
+    except Exception as e:
+        log.info(f"  {label}: static fetch failed ({e}), trying browser")
+        return [], ""
+
+    strategy = rfps[0]["_strategy"] if rfps else ""
+    for rfp in rfps:
+        del rfp["_strategy"]
+    if strategy in _STATIC_HIT_STRATEGIES:
+        log.info(f"  {label}: {len(rfps)} solicitations (static HTML)")
+    return rfps, strategy
+
+
+def _parse_static(portal: dict, html: str) -> list[dict]:
+    """Records parsed from static HTML, each tagged with its "_strategy".
+
+    The tag rides along in the HTTP cache's stored records, so a 304 still
+    says which strategy matched; _scrape_static_portal() strips it.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    _add_tbody(soup)
+    rfps, strategy = _portal_rfps(
+        portal, lambda rows, fields: _soup_extract(soup, rows, fields))
+    return [{**rfp, "_strategy": strategy} for rfp in rfps]
+
+
+def _add_tbody(soup):
+    """Wrap bare <tr> children in <tbody>, as browsers do, so selectors match."""
+    for table in soup.find_all("table"):
+        bare = table.find_all("tr", recursive=False)
+        if bare:
+            tbody = soup.new_tag("tbody")
+            bare[0].insert_before(tbody)
+            for tr in bare:
+                tbody.append(tr.extract())
+
+
+# Elements innerText separates from their neighbours, and ones it never shows
+_BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt fieldset figcaption figure "
+    "footer form h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre section table "
+    "tbody td tfoot th thead tr ul".split()
+)
+_HIDDEN_TAGS = frozenset(("script", "style", "noscript", "template", "head"))
+
+
+def _soup_text(el) -> str:
+    """Approximate innerText, trimmed as browser.extract() does.
+
+    Whitespace inside text collapses to one space, as the page renders it;
+    lines break only at block elements, and hidden elements are skipped.
+    """
+    parts = []
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, Tag):
+                if child.name in _HIDDEN_TAGS:
+                    continue
+                block = child.name in _BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                walk(child)
+                if block:
+                    parts.append("\n")
+            elif not isinstance(child, Comment):
+                parts.append(re.sub(r"\s+", " ", str(child)))
+
+    walk(el)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _soup_extract(soup, rows: str | list[str], fields: dict | None = None) -> list[dict]:
+    """BeautifulSoup counterpart of browser.extract(), same arguments and dicts."""
+    matches = []
+    for selector in [rows] if isinstance(rows, str) else rows:
+        matches = soup.select(selector)
+        if matches:
+            break
+
+    out = []
+    for el in matches:
+        row = {"text": _soup_text(el), "cells": [_soup_text(td) for td in el.select("td")]}
+        for name, field in (fields or {}).items():
+            selector, attr = field if isinstance(field, tuple) else (field, None)
+            if selector is None:
+                target = el
+            else:
+                alternatives = [selector] if isinstance(selector, str) else selector
+                target = next((t for sel in alternatives if (t := el.select_one(sel))), None)
+            if target is None:
+                row[name] = ""
+            elif attr:
+                value = target.get(attr) or ""
+                if isinstance(value, list):   # multi-valued, e.g. class
+                    value = " ".join(value)
+                row[name] = value.strip()
+            else:
+                row[name] = _soup_text(target)
+        out.append(row)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Browser path
+# ---------------------------------------------------------------------------
 
 
-def _scrape_generic_portal(context, portal: dict) -> list[dict]:
-    """Generic scraper for a single state portal.
+def _scrape_generic_portal(context, portal: dict) -> tuple[list[dict], str]:
+    """Render a single state portal in a pooled browser context.
 
     Uses a broad strategy: load the page, find tables and/or links
-    that contain solicitation data, extract title + metadata.
+    that contain solicitation data, extract title + metadata.  Returns
+    the records and the strategy that found them.
     """
-    state = portal["state"]
     label = portal["label"]
     url = portal["url"]
-    rfps: list[dict] = []
 
     page = context.new_page()
 
     try:
+        ratelimit.wait(url)
         page.goto(url, timeout=PLAYWRIGHT_TIMEOUT,
                   wait_until="domcontentloaded")
 
@@ -290,130 +584,133 @@ def _scrape_generic_portal(context, portal: dict) -> list[dict]:
         except Exception:
             pass
 
-        time.sleep(3)
-
-        # --- Strategy 1: Table-based extraction ---
-        rows = page.query_selector_all("table tbody tr")
-        if rows:
-            for row in rows:
-                try:
-                    rfp = _extract_from_table_row(row, state, label, url)
-                    if rfp:
-                        rfps.append(rfp)
-                except Exception:
-                    continue
+        browser.settle(page)
 
-        # --- Strategy 2: Link-based extraction (non-table pages) ---
-        if not rfps:
-            links = page.query_selector_all(
-                "a[href*='solicitation'], a[href*='bid'], a[href*='opportunity'], "
-                "a[href*='Solicitation'], a[href*='Bid'], a[href*='rfp'], "
-                "a[href*='procurement'], a[href*='contract']"
-            )
-
-            seen_hrefs: set[str] = set()
-            for link in links:
-                try:
-                    href = link.get_attribute("href") or ""
-                    text = link.inner_text().strip()
-
-                    # Filter out navigation/menu links
-                    if not text or len(text) < 10:
-                        continue
-                    if href in seen_hrefs:
-                        continue
-                    seen_hrefs.add(href)
-
-                    # Skip links that are clearly navigation
-                    skip_words = {"home", "login", "register", "about", "contact",
-                                  "faq", "help", "search", "back", "menu"}
-                    if text.lower() in skip_words:
-                        continue
-
-                    rfps.append({
-                        "state": state,
-                        "source": label,
-                        "id": _extract_id_from_url(href),
-                        "title": text,
-                        "agency": "",
-                        "status": "Open",
-                        "posted_date": "",
-                        "close_date": "",
-                        "url": _make_absolute(url, href),
-                        "description": text,
-                        "amount": "",
-                    })
-                except Exception:
-                    continue
-
-        # --- Strategy 3: Card/div-based extraction ---
-        if not rfps:
-            cards = page.query_selector_all(
-                ".card, .list-item, .solicitation-item, .bid-item, "
-                ".opportunity-card, .result-item, article"
-            )
-            for card in cards:
-                try:
-                    title_el = (
-                        card.query_selector("h2, h3, h4, .title, a") or
-                        card.query_selector("strong, b")
-                    )
-                    if not title_el:
-                        continue
-                    title = title_el.inner_text().strip()
-                    if not title or len(title) < 10:
-                        continue
-
-                    link_el = card.query_selector("a[href]")
-                    href = link_el.get_attribute("href") if link_el else ""
-
-                    rfps.append({
-                        "state": state,
-                        "source": label,
-                        "id": _extract_id_from_url(href) if href else "",
-                        "title": title,
-                        "agency": "",
-                        "status": "Open",
-                        "posted_date": "",
-                        "close_date": "",
-                        "url": _make_absolute(url, href) if href else "",
-                        "description": title,
-                        "amount": "",
-                    })
-                except Exception:
-                    continue
+        rfps, strategy = _portal_rfps(
+            portal,
+            lambda rows, fields: browser.extract(page, rows, fields))
 
         if rfps:
             log.info(f"  {label}: {len(rfps)} solicitations")
         else:
             log.info(f"  {label}: no solicitations found")
-
-    except Exception as e:
-        log.error(f"  {label}: scrape failed — {e}")
     finally:
         page.close()
 
-    return rfps
+    return rfps, strategy
 
 
-def _extract_from_table_row(row, state: str, label: str, base_url: str) -> dict | None:
-    """Extract an RFP from a table row."""
+def _portal_rfps(portal: dict, extract) -> tuple[list[dict], str]:
+    """Apply the table, link and card strategies to one loaded portal page.
+
+    `extract(rows, fields)` is browser.extract() bound to a page, or
+    _soup_extract() bound to parsed static HTML.  Returns the records and
+    the strategy that found them ("table", "link", "card", or "").
+    """
+    state = portal["state"]
+    label = portal["label"]
+    url = portal["url"]
+    rfps: list[dict] = []
+
+    # --- Strategy 1: Table-based extraction ---
+    rows = extract("table tbody tr", {
+        "link_text": "a[href]",
+        "href": ("a[href]", "href"),
+    })
+    for row in rows:
+        rfp = _extract_from_table_row(row, state, label, url)
+        if rfp:
+            rfps.append(rfp)
+    if rfps:
+        return rfps, "table"
+
+    # --- Strategy 2: Link-based extraction (non-table pages) ---
+    links = extract(
+        "a[href*='solicitation'], a[href*='bid'], a[href*='opportunity'], "
+        "a[href*='Solicitation'], a[href*='Bid'], a[href*='rfp'], "
+        "a[href*='procurement'], a[href*='contract']",
+        {"href": (None, "href")},
+    )
+
+    seen_hrefs: set[str] = set()
+    for link in links:
+        href = link["href"]
+        text = link["text"]
+
+        # Filter out navigation/menu links
+        if not text or len(text) < 10:
+            continue
+        if href in seen_hrefs:
+            continue
+        seen_hrefs.add(href)
+
+        # Skip links that are clearly navigation
+        skip_words = {"home", "login", "register", "about", "contact",
+                      "faq", "help", "search", "back", "menu"}
+        if text.lower() in skip_words:
+            continue
+
+        rfps.append({
+            "state": state,
+            "source": label,
+            "id": _extract_id_from_url(href),
+            "title": text,
+            "agency": "",
+            "status": "Open",
+            "posted_date": "",
+            "close_date": "",
+            "url": _make_absolute(url, href),
+            "description": text,
+            "amount": "",
+        })
+    if rfps:
+        return rfps, "link"
+
+    # --- Strategy 3: Card/div-based extraction ---
+    cards = extract(
+        ".card, .list-item, .solicitation-item, .bid-item, "
+        ".opportunity-card, .result-item, article",
+        {
+            "title": ["h2, h3, h4, .title, a", "strong, b"],
+            "href": ("a[href]", "href"),
+        },
+    )
+    for card in cards:
+        title = card["title"]
+        if not title or len(title) < 10:
+            continue
+
+        href = card["href"]
+
+        rfps.append({
+            "state": state,
+            "source": label,
+            "id": _extract_id_from_url(href) if href else "",
+            "title": title,
+            "agency": "",
+            "status": "Open",
+            "posted_date": "",
+            "close_date": "",
+            "url": _make_absolute(url, href) if href else "",
+            "description": title,
+            "amount": "",
+        })
+
+    return rfps, "card" if rfps else ""
+
+
+def _extract_from_table_row(row: dict, state: str, label: str, base_url: str) -> dict | None:
+    """Extract an RFP from a table row serialized by an extract() function."""
     import re
 
-    cells = row.query_selector_all("td")
-    if not cells or len(cells) < 2:
+    cell_texts = row["cells"]
+    if len(cell_texts) < 2:
         return None
 
-    link_el = row.query_selector("a[href]")
-    href = link_el.get_attribute("href") if link_el else ""
-
-    # Gather all cell text
-    cell_texts = [c.inner_text().strip() for c in cells]
+    href = row["href"]
 
     # Title: prefer link text, then longest cell
-    title = ""
-    if link_el:
-        title = link_el.inner_text().strip()
+    title = row["link_text"]
     if not title:
         title = max(cell_texts, key=len) if cell_texts else ""
 
@@ -5,12 +5,13 @@ Scrapes open solicitations from txsmartbuy.gov/esbd via HTML parsing.
 Paginated, 24 results per page.
 """
 
-import time
-
 import requests
 from bs4 import BeautifulSoup
 
-from config import ESBD_MAX_PAGES, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import ESBD_MAX_PAGES, log
+from sources import checkpoint, http_cache, http_client, pagination
+
+_HEADERS = {"User-Agent": http_client.BROWSER_USER_AGENT}
 
 
 def _esbd_field(container, label: str) -> str:
@@ -27,76 +28,78 @@ def _esbd_field(container, label: str) -> str:
     return ""
 
 
+def _parse_page(html: str) -> list[dict]:
+    """Solicitations on one ESBD results page."""
+    soup = BeautifulSoup(html, "html.parser")
+    page_rfps: list[dict] = []
+    for row in soup.select(".esbd-result-row"):
+        title_div = row.select_one(".esbd-result-title a")
+        if not title_div:
+            continue
+
+        title = title_div.get_text(strip=True)
+        href = title_div.get("href", "")
+        sol_id = _esbd_field(row, "Solicitation ID")
+        due_date = _esbd_field(row, "Due Date")
+        due_time = _esbd_field(row, "Due Time")
+        agency_num = _esbd_field(row, "Agency/Texas SmartBuy Member Number")
+        status = _esbd_field(row, "Status")
+        posting_date = _esbd_field(row, "Posting Date")
+
+        close_str = f"{due_date} {due_time}".strip() if due_date else ""
+
+        # Try to extract estimated amount
+        amount = (
+            _esbd_field(row, "Estimated Amount") or
+            _esbd_field(row, "Estimated Value") or
+            _esbd_field(row, "Amount") or
+            _esbd_field(row, "Value") or
+            _esbd_field(row, "Budget") or
+            ""
+        )
+
+        page_rfps.append({
+            "state": "TX",
+            "source": "TX ESBD",
+            "id": sol_id or href.replace("/esbd/", ""),
+            "title": title,
+            "agency": f"Agency #{agency_num}" if agency_num else "",
+            "status": status,
+            "posted_date": posting_date,
+            "close_date": close_str,
+            "url": f"https://www.txsmartbuy.gov{href}" if href else "",
+            "description": "",
+            "amount": amount,
+        })
+
+    return page_rfps
+
+
 def scrape_texas_esbd() -> list[dict]:
     log.info("Scraping Texas ESBD...")
     rfps: list[dict] = []
+    cp = checkpoint.current()
 
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0.0.0 Safari/537.36",
-    })
-
-    page = 1
+    seen_pages = pagination.SeenPages("Texas ESBD")
+    page = cp.cursor.get("page", 1)
     while page <= ESBD_MAX_PAGES:
         try:
             url = f"https://www.txsmartbuy.gov/esbd?page={page}"
-            resp = session.get(url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            rows = soup.select(".esbd-result-row")
-            if not rows:
+            page_rfps = http_cache.get_records(url, _parse_page, headers=_HEADERS)
+            if not page_rfps:
                 log.info(f"  Page {page}: no results, stopping pagination")
                 break
 
-            for row in rows:
-                title_div = row.select_one(".esbd-result-title a")
-                if not title_div:
-                    continue
-
-                title = title_div.get_text(strip=True)
-                href = title_div.get("href", "")
-                sol_id = _esbd_field(row, "Solicitation ID")
-                due_date = _esbd_field(row, "Due Date")
-                due_time = _esbd_field(row, "Due Time")
-                agency_num = _esbd_field(row, "Agency/Texas SmartBuy Member Number")
-                status = _esbd_field(row, "Status")
-                posting_date = _esbd_field(row, "Posting Date")
-
-                close_str = f"{due_date} {due_time}".strip() if due_date else ""
-
-                # Try to extract estimated amount
-                amount = (
-                    _esbd_field(row, "Estimated Amount") or
-                    _esbd_field(row, "Estimated Value") or
-                    _esbd_field(row, "Amount") or
-                    _esbd_field(row, "Value") or
-                    _esbd_field(row, "Budget") or
-                    ""
-                )
-
-                rfps.append({
-                    "state": "TX",
-                    "source": "TX ESBD",
-                    "id": sol_id or href.replace("/esbd/", ""),
-                    "title": title,
-                    "agency": f"Agency #{agency_num}" if agency_num else "",
-                    "status": status,
-                    "posted_date": posting_date,
-                    "close_date": close_str,
-                    "url": f"https://www.txsmartbuy.gov{href}" if href else "",
-                    "description": "",
-                    "amount": amount,
-                })
-
-            log.info(f"  Page {page}: {len(rows)} results")
+            log.info(f"  Page {page}: {len(page_rfps)} results")
+            cp.page(page_rfps, page=page + 1)
+            rfps.extend(page_rfps)
             page += 1
-            time.sleep(POLITE_DELAY)
+            if seen_pages.stop(page_rfps):
+                break
 
         except requests.RequestException as e:
             log.error(f"ESBD page {page} failed: {e}")
+            cp.fail()
             break
 
     log.info(f"Texas ESBD total: {len(rfps)} solicitations")
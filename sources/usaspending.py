@@ -5,12 +5,12 @@ Queries the USAspending.gov spending-by-award API for recent contracts
 and grants matching research keywords. No authentication required.
 """
 
-import time
 from datetime import datetime, timedelta
 
 import requests
 
-from config import USASPENDING_LOOKBACK_DAYS, REQUEST_TIMEOUT, POLITE_DELAY, log
+from config import USASPENDING_LOOKBACK_DAYS, log
+from sources import checkpoint, http_client
 from filters import KEYWORDS
 
 # Use the first 30 keywords for broad coverage without hitting API limits
@@ -22,14 +22,17 @@ def scrape_usaspending() -> list[dict]:
     log.info("Querying USAspending.gov API...")
     rfps: list[dict] = []
 
-    cutoff = (datetime.now() - timedelta(days=USASPENDING_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
-    today = datetime.now().strftime("%Y-%m-%d")
+    # Not narrowed by a watermark: action dates are reported weeks late, so
+    # the whole lookback is the reporting lag
+    now = datetime.now()
+    cutoff = (now - timedelta(days=USASPENDING_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    today = now.strftime("%Y-%m-%d")
 
     for award_type in [["A", "B", "C", "D"], ["02", "03", "04", "05"]]:
         # First group = contracts; Second group = grants
         label = "Contracts" if "A" in award_type else "Grants"
         try:
-            resp = requests.post(
+            resp = http_client.post(
                 "https://api.usaspending.gov/api/v2/search/spending_by_award/",
                 json={
                     "filters": {
@@ -50,7 +53,6 @@ def scrape_usaspending() -> list[dict]:
                     "order": "desc",
                 },
                 headers={"Content-Type": "application/json"},
-                timeout=REQUEST_TIMEOUT,
             )
             resp.raise_for_status()
             data = resp.json()
@@ -80,10 +82,9 @@ def scrape_usaspending() -> list[dict]:
                     "recipient_state": recip_loc,
                     "pi_name": "",
                 })
-
-            time.sleep(POLITE_DELAY)
         except requests.RequestException as e:
             log.error(f"USAspending {label} query failed: {e}")
+            checkpoint.current().fail()
             continue
 
     log.info(f"USAspending total: {len(rfps)} recent awards")
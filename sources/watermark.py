@@ -0,0 +1,91 @@
+"""
+Per-source "since last run" watermarks.
+
+Date-filtered sources (SAM.gov, Socrata, Federal Register) used to
+re-query their whole fixed lookback every night, and seen_hashes then
+discarded almost all of it.  since() narrows a source's query window to
+start at its last successful run, minus WATERMARK_OVERLAP_DAYS to catch
+records that are indexed late, and never further back than the lookback.
+Socrata applies the watermark to the row's :updated_at instead of its
+award date.  NSF and USAspending can only filter on event dates published
+weeks late, and their lookbacks are no longer than that lag, so they are
+not incremental and always query their full lookback.
+
+A source's new watermark is the time its query started.  It is only
+written by commit() — which main.scrape() calls once the run's rows are
+persisted — and only if the source finished without failures (its
+checkpoint is done and not failed), so a failed, interrupted or timed-out
+run never skips data.
+Set INCREMENTAL=false to always use the full lookback.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+
+from config import INCREMENTAL, WATERMARK_FILE, WATERMARK_OVERLAP_DAYS, log
+from sources import checkpoint
+
+_pending: dict[str, tuple[datetime, checkpoint.SourceCheckpoint]] = {}
+_lock = threading.Lock()
+
+
+def _load() -> dict[str, str]:
+    if not WATERMARK_FILE.exists():
+        return {}
+    try:
+        return json.loads(WATERMARK_FILE.read_text())
+    except (OSError, ValueError) as e:
+        log.warning(f"Unreadable watermarks, using full lookbacks: {e}")
+        return {}
+
+
+def last_run(name: str, now: datetime | None = None) -> datetime | None:
+    """`name`'s last successful run minus the overlap, or None if unknown.
+
+    Call once per run, when the source builds its query; the run's start
+    (`now`) becomes the source's next watermark if the source succeeds.
+    Sources that can filter on an ingestion date (when a record was
+    published, not when its event happened) use this directly.
+    """
+    now = now or datetime.now()
+    with _lock:
+        _pending[name] = (now, checkpoint.current())
+    if not INCREMENTAL:
+        return None
+    mark = _load().get(name)
+    if not mark:
+        return None
+    return datetime.fromisoformat(mark) - timedelta(days=WATERMARK_OVERLAP_DAYS)
+
+
+def since(name: str, lookback_days: int, now: datetime | None = None) -> datetime:
+    """Start of `name`'s query window for a run starting at `now`.
+
+    The window starts at the last run (see last_run()), but never further
+    back than `lookback_days`.
+    """
+    now = now or datetime.now()
+    start = now - timedelta(days=lookback_days)
+    resume = last_run(name, now)
+    if resume is not None and resume > start:
+        log.info(f"{name}: fetching since last run ({resume:%Y-%m-%d}) "
+                 f"instead of {lookback_days} days")
+        start = resume
+    return start
+
+
+def commit():
+    """Advance the watermark of every source that finished cleanly this run."""
+    with _lock:
+        finished = {name: started for name, (started, cp) in _pending.items()
+                    if cp.done and not cp.failed}
+        _pending.clear()
+    if not finished:
+        return
+    marks = _load()
+    marks.update({name: started.isoformat() for name, started in finished.items()})
+    tmp = WATERMARK_FILE.with_name(f".{WATERMARK_FILE.name}.tmp")
+    tmp.write_text(json.dumps(marks, indent=1, sort_keys=True))
+    tmp.replace(WATERMARK_FILE)
+    log.info(f"Advanced watermarks for {len(finished)} sources")
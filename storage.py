@@ -4,12 +4,20 @@ Parquet storage and deduplication for the research scraper.
 
 import json
 import hashlib
+import sqlite3
+import threading
+import uuid
+from collections.abc import Callable
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
-from config import PARQUET_FILE, SEEN_FILE, DATA_DIR, HISTORICAL_MODE, log
+from config import (RFP_DATASET_DIR, PARQUET_FILE, SEEN_DB, SEEN_FILE, DATA_DIR,
+                    HISTORICAL_MODE, WRITE_BATCH_ROWS, STALE_FRAGMENT_HOURS, log)
 
 # ---------------------------------------------------------------------------
 # Parquet schema
@@ -33,6 +41,7 @@ RFP_SCHEMA = pa.schema([
     ("pi_name", pa.string()),
     ("keyword_match", pa.bool_()),
     ("matched_keywords", pa.string()),
+    ("keyword_fingerprint", pa.string()),   # filters.KEYWORD_FINGERPRINT at classification
     ("key_terms", pa.string()),
     ("scrape_date", pa.string()),
     ("scrape_timestamp", pa.timestamp("us")),
@@ -56,51 +65,370 @@ def rfp_hash(rfp: dict) -> str:
 SEEN_TTL_DAYS = 36500 if HISTORICAL_MODE else 90
 
 
-def load_seen() -> dict:
-    if SEEN_FILE.exists():
-        with open(SEEN_FILE, "r") as f:
-            return json.load(f)
-    return {}
+SEEN_BATCH_SIZE = 1000  # hashes buffered before an INSERT round-trip
 
 
-def save_seen(seen: dict):
-    with open(SEEN_FILE, "w") as f:
-        json.dump(seen, f, indent=2)
+class SeenStore:
+    """Persistent set of seen RFP hashes, backed by SQLite.
 
+    Membership checks are primary-key lookups, so startup cost no longer
+    grows with the history.  New hashes are inserted in batches inside one
+    transaction that is only committed by commit() — call it after the
+    rows are safely written, so a crashed run does not mark RFPs as seen
+    that never reached the dataset.  first_seen is indexed, making TTL
+    pruning a range delete.
 
-def prune_seen(seen: dict) -> dict:
-    """Remove entries older than SEEN_TTL_DAYS."""
-    cutoff = (datetime.now() - timedelta(days=SEEN_TTL_DAYS)).isoformat()
-    pruned = {k: v for k, v in seen.items() if v.get("first_seen", "") >= cutoff}
-    removed = len(seen) - len(pruned)
-    if removed:
-        log.info(f"Pruned {removed} stale entries from seen hashes (>{SEEN_TTL_DAYS} days)")
-    return pruned
+    Safe to share between threads.
+    """
+
+    def __init__(self, path=SEEN_DB, batch_size: int = SEEN_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pending: dict[str, tuple[str, str, str]] = {}
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " hash TEXT PRIMARY KEY,"
+            " first_seen TEXT NOT NULL,"
+            " title TEXT,"
+            " state TEXT"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS seen_first_seen ON seen (first_seen)"
+        )
+        self._conn.commit()
+        self._migrate_json()
+
+    def __enter__(self) -> "SeenStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, h: str) -> bool:
+        with self._lock:
+            if h in self._pending:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE hash = ?", (h,)
+            ).fetchone()
+            return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def add(self, h: str, first_seen: str, title: str = "", state: str = ""):
+        """Mark a hash as seen (uncommitted until commit())."""
+        with self._lock:
+            self._pending[h] = (first_seen, title, state)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO seen (hash, first_seen, title, state) "
+            "VALUES (?, ?, ?, ?)",
+            [(h, *v) for h, v in self._pending.items()],
+        )
+        self._pending = {}
+
+    def prune(self, ttl_days: int = SEEN_TTL_DAYS) -> int:
+        """Remove entries older than ttl_days.  Returns count removed."""
+        cutoff = (datetime.now() - timedelta(days=ttl_days)).isoformat()
+        with self._lock:
+            self._flush()
+            removed = self._conn.execute(
+                "DELETE FROM seen WHERE first_seen < ?", (cutoff,)
+            ).rowcount
+        if removed:
+            log.info(f"Pruned {removed} stale entries from seen hashes (>{ttl_days} days)")
+        return removed
+
+    def commit(self):
+        """Make every hash added so far durable."""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+
+    def rollback(self):
+        """Forget hashes added since the last commit()."""
+        with self._lock:
+            self._pending = {}
+            self._conn.rollback()
+
+    def close(self):
+        """Close the database.  Uncommitted hashes are discarded."""
+        with self._lock:
+            self._conn.rollback()
+            self._conn.close()
+
+    def _migrate_json(self):
+        """Import a legacy seen_hashes.json once, keeping it as .json.bak."""
+        if not SEEN_FILE.exists():
+            return
+        with open(SEEN_FILE, "r") as f:
+            legacy = json.load(f)
+        for h, v in legacy.items():
+            self.add(h, v.get("first_seen", ""), v.get("title", ""), v.get("state", ""))
+        self.commit()
+        SEEN_FILE.replace(SEEN_FILE.with_suffix(".json.bak"))
+        log.info(f"Migrated {len(legacy)} hashes from {SEEN_FILE.name} to {SEEN_DB.name}")
 
 
 # ---------------------------------------------------------------------------
-# Parquet I/O
+# Parquet dataset — Hive-partitioned by scrape month:
+#
+#   data/rfps/scrape_month=2026-03/part-20260301T000104123456-1a2b3c4d.parquet
+#
+# Every run adds new fragment files and never rewrites existing ones, so the
+# nightly write cost tracks the size of the new rows, not of the history.
+# compact_dataset() merges each partition's fragments back into one file.
 # ---------------------------------------------------------------------------
 
+PARTITION_KEY = "scrape_month"
+_PARTITIONING = ds.partitioning(pa.schema([(PARTITION_KEY, pa.string())]),
+                                flavor="hive")
+_DATASET_SCHEMA = RFP_SCHEMA.append(pa.field(PARTITION_KEY, pa.string()))
+
+
+def _conform(table: pa.Table) -> pa.Table:
+    """Cast a table to RFP_SCHEMA, adding any missing columns as nulls."""
+    columns = []
+    for field in RFP_SCHEMA:
+        if field.name in table.column_names:
+            columns.append(table.column(field.name).cast(field.type))
+        else:
+            columns.append(pa.nulls(table.num_rows, type=field.type))
+    return pa.Table.from_arrays(columns, schema=RFP_SCHEMA)
+
+
+def _new_fragment_path(month: str) -> Path:
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    part_dir = RFP_DATASET_DIR / f"{PARTITION_KEY}={month}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    return part_dir / f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def _in_progress(path: Path) -> Path:
+    """Hidden sibling used while a fragment is being written.
+
+    Dataset discovery skips dot-files, so readers never see partial files.
+    """
+    return path.with_name(f".{path.name}.tmp")
+
+
+def remove_stale_fragments(max_age_hours: float = STALE_FRAGMENT_HOURS) -> int:
+    """Delete in-progress fragments left behind by a writer that died.
+
+    Only files not modified for `max_age_hours` are removed, so a writer
+    still running in another process keeps its fragments.  Returns the
+    number of files deleted.
+    """
+    cutoff = datetime.now().timestamp() - max_age_hours * 3600
+    removed = 0
+    for tmp in RFP_DATASET_DIR.glob(f"{PARTITION_KEY}=*/.*.parquet.tmp"):
+        try:
+            if tmp.stat().st_mtime < cutoff:
+                tmp.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass   # published or discarded meanwhile
+    if removed:
+        log.info(f"Removed {removed} unpublished fragments left by an interrupted write")
+    return removed
+
+
+def _fragments(part_dir: Path) -> list[Path]:
+    """A partition's fragment files, oldest first."""
+    return sorted(part_dir.glob("*.parquet"))
+
+
+def dataset_fragments() -> list[Path]:
+    """Every published fragment file, partition by partition."""
+    migrate_legacy_file()
+    return [frag for part_dir in sorted(RFP_DATASET_DIR.glob(f"{PARTITION_KEY}=*"))
+            for frag in _fragments(part_dir)]
+
+
+def rewrite_fragment(path: Path, transform: Callable[[pa.Table], pa.Table]) -> int:
+    """Replace a fragment with transform() applied to each of its row groups.
+
+    Streams one row group at a time and swaps the new file in atomically,
+    so readers see either the old fragment or the new one.  Returns the
+    number of rows written.
+    """
+    rows = 0
+    try:
+        with pq.ParquetWriter(_in_progress(path), RFP_SCHEMA,
+                              compression="snappy") as out:
+            for batch in pq.ParquetFile(path).iter_batches():
+                table = transform(_conform(pa.Table.from_batches([batch])))
+                out.write_table(_conform(table))
+                rows += table.num_rows
+    except BaseException:
+        _in_progress(path).unlink(missing_ok=True)
+        raise
+    _in_progress(path).replace(path)
+    return rows
+
+
+def dataset_exists() -> bool:
+    """True if any RFP rows have been written."""
+    return PARQUET_FILE.exists() or any(RFP_DATASET_DIR.glob("*/*.parquet"))
+
+
+class RfpWriter:
+    """Buffered writer that adds new RFP rows as fresh dataset fragments.
+
+    Rows are collected in memory only until WRITE_BATCH_ROWS accumulate,
+    then flushed as a row group into one in-progress fragment per scrape
+    month.  close() publishes the fragments; existing files are never read
+    or rewritten.
+
+    Used as a context manager; if the block raises, the in-progress
+    fragments are discarded and the dataset is left untouched.  Fragments
+    orphaned by a process that died before close() are removed when the
+    next writer opens.
+    """
+
+    def __init__(self, batch_rows: int = WRITE_BATCH_ROWS):
+        remove_stale_fragments()
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._buffer: list[dict] = []
+        self._writers: dict[str, tuple[pq.ParquetWriter, Path]] = {}
+
+    def __enter__(self) -> "RfpWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row: dict):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_rows:
+            self._flush()
+
+    def write_table(self, table: pa.Table):
+        """Write a table of RFP_SCHEMA rows (may span several months)."""
+        table = _conform(table)
+        months = pc.utf8_slice_codeunits(
+            pc.fill_null(table.column("scrape_date"), ""), 0, 7)
+        for month in pc.unique(months).to_pylist():
+            part = table.filter(pc.equal(months, month))
+            self._writer_for(month or "unknown").write_table(part)
+        self.rows_written += table.num_rows
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        self.write_table(pa.Table.from_pylist(self._buffer, schema=RFP_SCHEMA))
+        self._buffer = []
+
+    def _writer_for(self, month: str) -> pq.ParquetWriter:
+        if month not in self._writers:
+            path = _new_fragment_path(month)
+            writer = pq.ParquetWriter(_in_progress(path), RFP_SCHEMA,
+                                      compression="snappy")
+            self._writers[month] = (writer, path)
+        return self._writers[month][0]
+
+    def abort(self):
+        """Discard everything written so far."""
+        self._buffer = []
+        for writer, path in self._writers.values():
+            writer.close()
+            _in_progress(path).unlink(missing_ok=True)
+        self._writers = {}
+
+    def close(self) -> int:
+        """Flush and publish the new fragments.  Returns count written."""
+        self._flush()
+        for writer, path in self._writers.values():
+            writer.close()
+            _in_progress(path).replace(path)
+            log.info(f"Wrote fragment {path.parent.name}/{path.name}")
+        if self._writers:
+            log.info(f"Wrote {self.rows_written} new rows to {RFP_DATASET_DIR.name}/")
+        self._writers = {}
+        return self.rows_written
+
+
+def migrate_legacy_file():
+    """Split a pre-partitioning data/rfps.parquet into dataset fragments.
+
+    The old file is kept as rfps.parquet.bak once its rows are migrated.
+    """
+    if not PARQUET_FILE.exists():
+        return
+    log.info(f"Migrating {PARQUET_FILE.name} into partitioned dataset {RFP_DATASET_DIR.name}/")
+    with RfpWriter() as writer:
+        for batch in pq.ParquetFile(PARQUET_FILE).iter_batches():
+            writer.write_table(pa.Table.from_batches([batch]))
+    PARQUET_FILE.replace(PARQUET_FILE.with_suffix(".parquet.bak"))
+    log.info(f"Migrated {writer.rows_written} rows")
+
+
+def read_rfps(columns: list[str] | None = None, since: str | None = None) -> pa.Table:
+    """Read RFP rows from the dataset.
+
+    `since` (YYYY-MM-DD) keeps only rows scraped on or after that date;
+    partitions for earlier months are skipped without being opened.
+    """
+    migrate_legacy_file()
+    columns = columns or RFP_SCHEMA.names
+    if not dataset_exists():
+        return RFP_SCHEMA.empty_table().select(columns)
+
+    dataset = ds.dataset(RFP_DATASET_DIR, format="parquet",
+                         schema=_DATASET_SCHEMA, partitioning=_PARTITIONING)
+    row_filter = None
+    if since:
+        row_filter = ((ds.field(PARTITION_KEY) >= since[:7]) &
+                      (ds.field("scrape_date") >= since))
+    return dataset.to_table(columns=columns, filter=row_filter)
 
-def append_rfps(rows: list[dict]) -> int:
-    """Append new RFP rows to the Parquet file.  Returns count written."""
-    if not rows:
-        return 0
 
-    new_table = pa.Table.from_pylist(rows, schema=RFP_SCHEMA)
+def compact_dataset() -> int:
+    """Merge each partition's fragments into a single file.
 
-    if PARQUET_FILE.exists():
-        existing = pq.read_table(PARQUET_FILE)
-        combined = pa.concat_tables([existing, new_table], promote_options="default")
-    else:
-        combined = new_table
+    Streams row groups, so memory use is bounded by one batch.  Returns
+    the number of partitions compacted.
+    """
+    migrate_legacy_file()
+    remove_stale_fragments()
+    compacted = 0
+    for part_dir in sorted(RFP_DATASET_DIR.glob(f"{PARTITION_KEY}=*")):
+        fragments = _fragments(part_dir)
+        if len(fragments) < 2:
+            continue
 
-    pq.write_table(combined, PARQUET_FILE, compression="snappy")
+        path = _new_fragment_path(part_dir.name.split("=", 1)[1])
+        rows = 0
+        with pq.ParquetWriter(_in_progress(path), RFP_SCHEMA,
+                              compression="snappy") as out:
+            for frag in fragments:
+                for batch in pq.ParquetFile(frag).iter_batches():
+                    out.write_table(_conform(pa.Table.from_batches([batch])))
+                    rows += batch.num_rows
+        _in_progress(path).replace(path)
+        for frag in fragments:
+            frag.unlink()
 
-    size_mb = PARQUET_FILE.stat().st_size / (1024 * 1024)
-    if size_mb > 500:
-        log.warning(f"Parquet file is {size_mb:.1f} MB — consider partitioning")
+        size_mb = path.stat().st_size / (1024 * 1024)
+        log.info(f"Compacted {part_dir.name}: {len(fragments)} fragments → "
+                 f"1 file ({rows} rows, {size_mb:.1f} MB)")
+        compacted += 1
 
-    log.info(f"Wrote {len(rows)} new rows to {PARQUET_FILE.name} ({size_mb:.1f} MB total)")
-    return len(rows)
+    log.info(f"Compaction finished: {compacted} partitions rewritten")
+    return compacted
@@ -0,0 +1,57 @@
+from sources import state_portals
+from storage import rfp_hash
+
+PORTAL = {"state": "XX", "label": "Test portal", "url": "https://procurement.example.gov/bids"}
+
+HTML = """<html><body><table>
+<tr><th>Number</th><th>Title</th><th>Agency</th><th>Posted</th><th>Closes</th></tr>
+<tr>
+  <td>RFP-101</td>
+  <td><a href="/bids/detail?id=101">Road Repair<br>Services
+      for 2026</a></td>
+  <td>Dept. of Transportation</td>
+  <td>01/05/2026</td>
+  <td>02/05/2026</td>
+</tr>
+</table></body></html>"""
+
+RENDERED_TITLE = "Road Repair\nServices\tfor 2026"
+
+# What browser.extract() returns for the same listing: innerText keeps the
+# <br> as a newline, and this portal styles the cell so a tab survives.
+RENDERED_ROWS = [
+    {"text": "Number\tTitle\tAgency\tPosted\tCloses", "cells": [],
+     "link_text": "", "href": ""},
+    {"text": f"RFP-101\t{RENDERED_TITLE}\tDept. of Transportation\t01/05/2026\t02/05/2026",
+     "cells": ["RFP-101", RENDERED_TITLE, "Dept. of Transportation",
+               "01/05/2026", "02/05/2026"],
+     "link_text": RENDERED_TITLE, "href": "/bids/detail?id=101"},
+]
+
+# The hash the browser path has always stored this listing under
+STORED_HASH = rfp_hash({"state": "XX", "id": "RFP-101", "title": RENDERED_TITLE})
+
+
+def _rendered_extract(rows, fields):
+    return RENDERED_ROWS if rows == "table tbody tr" else []
+
+
+def test_rendered_portal_keeps_its_hashes():
+    rendered, strategy = state_portals._portal_rfps(PORTAL, _rendered_extract)
+
+    assert strategy == "table"
+    assert [rfp["title"] for rfp in rendered] == [RENDERED_TITLE]
+    assert [rfp_hash(rfp) for rfp in rendered] == [STORED_HASH]
+
+
+def test_confirmed_static_portal_keeps_rendered_hashes():
+    static = state_portals._parse_static(PORTAL, HTML)
+    rendered, _ = state_portals._portal_rfps(PORTAL, _rendered_extract)
+    assert static[0]["title"] != RENDERED_TITLE   # static text only approximates it
+    assert state_portals._static_confirmed(static, rendered)
+
+    identities = state_portals._listing_identities(rendered)
+    mapped = state_portals._apply_identities(static, identities)
+
+    assert [rfp_hash(rfp) for rfp in mapped] == [STORED_HASH]
+    assert mapped[0]["url"] == static[0]["url"]
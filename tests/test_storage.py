@@ -0,0 +1,38 @@
+import os
+import time
+
+import storage
+
+
+def _touch(path, age_hours=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"partial")
+    stamp = time.time() - age_hours * 3600
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_writer_removes_stale_unpublished_fragments(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "RFP_DATASET_DIR", tmp_path)
+    monkeypatch.setattr(storage, "PARQUET_FILE", tmp_path / "rfps.parquet")
+    part = tmp_path / f"{storage.PARTITION_KEY}=2026-01"
+    stale = _touch(part / ".part-old.parquet.tmp", age_hours=storage.STALE_FRAGMENT_HOURS + 1)
+    fresh = _touch(part / ".part-live.parquet.tmp")
+
+    with storage.RfpWriter() as writer:
+        writer.write({"rfp_id": "1", "hash": "h1", "scrape_date": "2026-01-05"})
+
+    assert not stale.exists()
+    assert fresh.exists()   # may belong to a writer still running elsewhere
+    assert storage.read_rfps(["hash"]).column("hash").to_pylist() == ["h1"]
+
+
+def test_compact_removes_stale_unpublished_fragments(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "RFP_DATASET_DIR", tmp_path)
+    monkeypatch.setattr(storage, "PARQUET_FILE", tmp_path / "rfps.parquet")
+    stale = _touch(tmp_path / f"{storage.PARTITION_KEY}=2026-02" / ".part-old.parquet.tmp",
+                   age_hours=storage.STALE_FRAGMENT_HOURS + 1)
+
+    storage.compact_dataset()
+
+    assert not stale.exists()